@@ -0,0 +1,31 @@
+"""Add user timezone and expense date range index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(64), nullable=False, server_default="UTC"),
+    )
+    # Spending series scan one pot's expenses over a date range
+    op.create_index("ix_expenses_pot_id_date", "expenses", ["pot_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_pot_id_date", table_name="expenses")
+    op.drop_column("users", "timezone")
@@ -0,0 +1,57 @@
+"""Add goal contribution ledger
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "goal_contributions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "goal_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("goals.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_goal_contributions_goal_id_created_at",
+        "goal_contributions",
+        ["goal_id", "created_at"],
+    )
+
+    # Record existing balances as one contribution made when the goal was created
+    op.execute(
+        """
+        INSERT INTO goal_contributions (id, goal_id, amount, created_at)
+        SELECT gen_random_uuid(), id, current_amount, created_at
+        FROM goals
+        WHERE current_amount > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("goal_contributions")
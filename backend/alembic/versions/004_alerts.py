@@ -0,0 +1,111 @@
+"""Add alert state table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    alert_rule = postgresql.ENUM(
+        "low_balance", "goal_near_completion",
+        name="alert_rule",
+        create_type=True,
+    )
+    alert_rule.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "alerts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "pot_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("pots.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "goal_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("goals.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column(
+            "rule",
+            postgresql.ENUM(name="alert_rule", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("active", sa.Boolean, nullable=False, default=True),
+        sa.Column("triggered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "uq_alerts_rule_pot_id",
+        "alerts",
+        ["rule", "pot_id"],
+        unique=True,
+        postgresql_where=sa.text("goal_id IS NULL"),
+    )
+    op.create_index(
+        "uq_alerts_rule_goal_id",
+        "alerts",
+        ["rule", "goal_id"],
+        unique=True,
+        postgresql_where=sa.text("goal_id IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_alerts_pot_id_active",
+        "alerts",
+        ["pot_id"],
+        postgresql_where=sa.text("active"),
+    )
+
+    # Raise alerts for pots and goals that already meet a rule
+    op.execute(
+        """
+        INSERT INTO alerts (id, pot_id, goal_id, rule, active, triggered_at)
+        SELECT gen_random_uuid(), id, NULL, 'low_balance', true, now()
+        FROM pots
+        WHERE target_amount > 0 AND current_amount < target_amount * 0.2
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO alerts (id, pot_id, goal_id, rule, active, triggered_at)
+        SELECT gen_random_uuid(), pot_id, id, 'goal_near_completion', true, now()
+        FROM goals
+        WHERE status = 'active'
+          AND target_amount > 0
+          AND current_amount >= target_amount * 0.8
+          AND current_amount < target_amount
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("alerts")
+    op.execute("DROP TYPE IF EXISTS alert_rule")
@@ -0,0 +1,59 @@
+"""Add precomputed insights table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    insight_type = postgresql.ENUM(
+        "tip", "warning", "achievement",
+        name="insight_type",
+        create_type=True,
+    )
+    insight_type.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "insights",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM(name="insight_type", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_insights_user_id_position", "insights", ["user_id", "position"])
+
+
+def downgrade() -> None:
+    op.drop_table("insights")
+    op.execute("DROP TYPE IF EXISTS insight_type")
@@ -0,0 +1,54 @@
+"""Index chat sessions by last activity
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sessions now record their last activity in updated_at
+    op.execute(
+        """
+        UPDATE chat_sessions s
+        SET updated_at = m.last_message_at
+        FROM (
+            SELECT session_id, max(created_at) AS last_message_at
+            FROM chat_messages
+            GROUP BY session_id
+        ) m
+        WHERE m.session_id = s.id AND m.last_message_at > s.updated_at
+        """
+    )
+
+    op.create_index(
+        "ix_chat_sessions_user_id_updated_at",
+        "chat_sessions",
+        ["user_id", sa.text("updated_at DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_chat_sessions_user_id", table_name="chat_sessions")
+
+    op.create_index(
+        "ix_chat_messages_session_id_created_at",
+        "chat_messages",
+        ["session_id", "created_at"],
+    )
+    op.drop_index("ix_chat_messages_session_id", table_name="chat_messages")
+
+
+def downgrade() -> None:
+    op.create_index("ix_chat_messages_session_id", "chat_messages", ["session_id"])
+    op.drop_index("ix_chat_messages_session_id_created_at", table_name="chat_messages")
+    op.create_index("ix_chat_sessions_user_id", "chat_sessions", ["user_id"])
+    op.drop_index("ix_chat_sessions_user_id_updated_at", table_name="chat_sessions")
@@ -0,0 +1,35 @@
+"""Index chat messages for keyset pagination
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Message pages are keyed on (created_at, id) within a session
+    op.create_index(
+        "ix_chat_messages_session_id_created_at_id",
+        "chat_messages",
+        ["session_id", "created_at", "id"],
+    )
+    op.drop_index("ix_chat_messages_session_id_created_at", table_name="chat_messages")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_chat_messages_session_id_created_at",
+        "chat_messages",
+        ["session_id", "created_at"],
+    )
+    op.drop_index("ix_chat_messages_session_id_created_at_id", table_name="chat_messages")
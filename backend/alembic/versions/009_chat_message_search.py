@@ -0,0 +1,38 @@
+"""Add full-text search over chat messages
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites chat_messages
+    op.execute(
+        """
+        ALTER TABLE chat_messages
+        ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+        """
+    )
+    op.create_index(
+        "ix_chat_messages_search_vector",
+        "chat_messages",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_search_vector", table_name="chat_messages")
+    op.drop_column("chat_messages", "search_vector")
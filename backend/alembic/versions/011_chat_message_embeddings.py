@@ -0,0 +1,55 @@
+"""Add chat message embeddings table
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_message_embeddings",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column(
+            "message_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("chat_messages.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("embedder", sa.String(64), nullable=False),
+        sa.Column("tokens", sa.Integer, nullable=False),
+        sa.Column("vector", sa.LargeBinary, nullable=False),
+        sa.UniqueConstraint(
+            "message_id",
+            "embedder",
+            name="uq_chat_message_embeddings_message_id_embedder",
+        ),
+    )
+    op.create_index(
+        "ix_chat_message_embeddings_user_id_embedder_id",
+        "chat_message_embeddings",
+        ["user_id", "embedder", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_message_embeddings")
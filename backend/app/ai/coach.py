@@ -1,27 +1,99 @@
 """AI Coach for financial guidance."""
 
-import json
+import asyncio
 import logging
+import time
 import uuid
-from collections.abc import AsyncGenerator
-from typing import Any
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, TypeVar
 
+from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.ai.client import get_openai_client
+from app.ai.extractors import extract_purchase_intent
+from app.ai.json_stream import IncrementalJSONParser, PartialValue
 from app.ai.prompts import SYSTEM_PROMPT, build_context_prompt
+from app.ai.retrieval import ChatMemory, format_recalled_messages
+from app.ai.tools import COACH_TOOLS, CoachToolExecutor
 from app.config import get_settings
+from app.db.fanout import fan_out, scalar, scalars
+from app.db.instrumentation import add_phase_time
+from app.models.alert import AlertRule
 from app.models.chat import ChatMessage, ChatSession, MessageRole, MessageType
 from app.models.expense import Expense
-from app.models.goal import Goal
 from app.models.pot import Pot
 from app.models.user import User
+from app.schemas.chat import ImpactAnalysis
+from app.services.alerts import AlertEngine
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+OutputT = TypeVar("OutputT", bound=BaseModel)
+
+# Maximum number of model turns that may request tool calls per response
+MAX_TOOL_ROUNDS = 2
+
+
+@dataclass
+class CoachEvent:
+    """An event emitted while the coach streams a response.
+
+    Text chunks use `MessageType.TEXT` with a `str` payload; tool results use
+    the tool's message type with the resulting schema as payload.
+    """
+
+    type: MessageType
+    data: Any
+
+
+async def _with_prefetched_impact(
+    events: AsyncGenerator[CoachEvent, None],
+    prefetch: asyncio.Task[ImpactAnalysis | None],
+) -> AsyncIterator[CoachEvent]:
+    """Interleave a prefetched impact analysis into a stream of coach events.
+
+    The analysis is yielded as soon as it resolves, even while the model is
+    still thinking. If the model later requests the same analysis through a
+    tool call, the duplicate event is dropped.
+    """
+    next_event = asyncio.ensure_future(anext(events))
+    prefetched: ImpactAnalysis | None = None
+    waiting_for_prefetch = True
+
+    try:
+        while True:
+            waiting = {next_event, prefetch} if waiting_for_prefetch else {next_event}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if waiting_for_prefetch and prefetch in done:
+                waiting_for_prefetch = False
+                prefetched = prefetch.result()
+                if prefetched is not None:
+                    yield CoachEvent(type=MessageType.IMPACT_ANALYSIS, data=prefetched)
+
+            if next_event in done:
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    break
+                if prefetched is None or event.data is not prefetched:
+                    yield event
+                next_event = asyncio.ensure_future(anext(events))
+    finally:
+        if not next_event.done():
+            next_event.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_event
+        if not prefetch.done():
+            prefetch.cancel()
+        await events.aclose()
+
 
 class AICoach:
     """AI Financial Health Coach."""
@@ -30,32 +102,57 @@ class AICoach:
         self.db = db
         self.client = get_openai_client()
         self.model = settings.openai_model
+        self.memory = ChatMemory(db) if settings.chat_memory_enabled else None
+
+    async def _stream_completion(self, **kwargs: Any) -> AsyncIterator[Any]:
+        """Stream a chat completion, recording time spent waiting on the model.
+
+        Only time awaiting the API counts towards the `llm` phase, not time
+        the caller spends handling each chunk.
+        """
+        start = time.perf_counter()
+        stream = await self.client.chat.completions.create(stream=True, **kwargs)
+        waited = time.perf_counter() - start
+        iterator = aiter(stream)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    waited += time.perf_counter() - start
+                yield chunk
+        finally:
+            add_phase_time("llm", waited)
 
     async def _get_user_context(self, user_id: uuid.UUID) -> dict[str, Any]:
-        """Get user's financial context for the AI."""
-        # Get user
-        user_result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = user_result.scalar_one()
-
-        # Get pots with goals
-        pots_result = await self.db.execute(
-            select(Pot)
-            .where(Pot.user_id == user_id)
-            .options(selectinload(Pot.goals))
+        """Get user's financial context for the AI.
+
+        The reads run concurrently. The chat flow has usually written the
+        new message by now, but none of these queries read chat rows.
+        """
+        user, pots, expenses = await fan_out(
+            self.db,
+            # User
+            scalar(select(User).where(User.id == user_id)),
+            # Pots with goals
+            scalars(
+                select(Pot)
+                .where(Pot.user_id == user_id)
+                .options(selectinload(Pot.goals))
+            ),
+            # Recent expenses
+            scalars(
+                select(Expense)
+                .join(Pot)
+                .where(Pot.user_id == user_id)
+                .order_by(Expense.date.desc())
+                .limit(10)
+            ),
+            reads_own_writes=False,
         )
-        pots = list(pots_result.scalars().all())
-
-        # Get recent expenses
-        expenses_result = await self.db.execute(
-            select(Expense)
-            .join(Pot)
-            .where(Pot.user_id == user_id)
-            .order_by(Expense.date.desc())
-            .limit(10)
-        )
-        expenses = list(expenses_result.scalars().all())
 
         return {
             "user": user,
@@ -64,18 +161,10 @@ class AICoach:
             "expenses": expenses,
         }
 
-    async def _build_messages(
-        self,
-        user_id: uuid.UUID,
-        session_id: uuid.UUID,
-        new_message: str,
-    ) -> list[dict[str, str]]:
-        """Build message list for OpenAI API."""
-        # Get user context
-        context = await self._get_user_context(user_id)
+    def _build_system_prompt(self, context: dict[str, Any]) -> str:
+        """Build the system prompt with the user's financial context."""
         user = context["user"]
 
-        # Build context prompt
         context_prompt = build_context_prompt(
             user_name=user.name,
             monthly_income=float(user.monthly_income),
@@ -109,10 +198,36 @@ class AICoach:
             ],
         )
 
+        return SYSTEM_PROMPT + "\n\n" + context_prompt
+
+    async def _build_messages(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        new_message: str,
+    ) -> list[dict[str, Any]]:
+        """Build message list for OpenAI API."""
+        context = await self._get_user_context(user_id)
+
         messages = [
-            {"role": "system", "content": SYSTEM_PROMPT + "\n\n" + context_prompt}
+            {"role": "system", "content": self._build_system_prompt(context)}
         ]
 
+        # Add relevant turns from the user's other sessions
+        if self.memory is not None:
+            try:
+                recalled = await self.memory.recall(
+                    user_id, new_message, exclude_session_id=session_id
+                )
+            except Exception as e:
+                logger.warning(f"Failed to recall past conversations: {e}")
+                recalled = []
+            if recalled:
+                messages.append({
+                    "role": "system",
+                    "content": format_recalled_messages(recalled),
+                })
+
         # Get conversation history
         history_result = await self.db.execute(
             select(ChatMessage)
@@ -137,56 +252,166 @@ class AICoach:
         user_id: uuid.UUID,
         session_id: uuid.UUID,
         message: str,
-    ) -> AsyncGenerator[str, None]:
-        """Generate a streaming response from the AI coach."""
+    ) -> AsyncGenerator[CoachEvent, None]:
+        """Generate a streaming response from the AI coach.
+
+        Tool calls requested by the model are executed in-process and their
+        results are yielded as typed events before the model continues. When
+        the message mentions a purchase amount, its impact analysis starts
+        immediately and is emitted alongside the text stream.
+        """
+        executor = CoachToolExecutor(user_id)
+        events = self._stream_response(user_id, session_id, message, executor)
+
+        intent = extract_purchase_intent(message)
+        if intent is not None:
+            prefetch = executor.prefetch_impact(intent.amount, intent.description)
+            events = _with_prefetched_impact(events, prefetch)
+
+        async for event in events:
+            yield event
+
+    async def _stream_response(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        message: str,
+        executor: CoachToolExecutor,
+    ) -> AsyncGenerator[CoachEvent, None]:
+        """Stream model output, executing tool calls between model turns."""
         messages = await self._build_messages(user_id, session_id, message)
 
         try:
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                stream=True,
-                temperature=0.7,
-                max_tokens=1000,
-            )
+            for round_index in range(MAX_TOOL_ROUNDS + 1):
+                stream = self._stream_completion(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=1000,
+                    tools=COACH_TOOLS,
+                    tool_choice="auto" if round_index < MAX_TOOL_ROUNDS else "none",
+                    parallel_tool_calls=True,
+                )
+
+                content: list[str] = []
+                tool_calls: dict[int, dict[str, Any]] = {}
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content.append(delta.content)
+                        yield CoachEvent(type=MessageType.TEXT, data=delta.content)
+                    for call_delta in delta.tool_calls or []:
+                        call = tool_calls.setdefault(
+                            call_delta.index,
+                            {
+                                "id": "",
+                                "type": "function",
+                                "function": {"name": "", "arguments": ""},
+                            },
+                        )
+                        if call_delta.id:
+                            call["id"] = call_delta.id
+                        if call_delta.function:
+                            call["function"]["name"] += call_delta.function.name or ""
+                            call["function"]["arguments"] += call_delta.function.arguments or ""
+
+                if not tool_calls:
+                    return
+
+                calls = [tool_calls[index] for index in sorted(tool_calls)]
+                messages.append({
+                    "role": "assistant",
+                    "content": "".join(content) or None,
+                    "tool_calls": calls,
+                })
 
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                for result in await executor.execute_all(calls):
+                    if result.message_type is not None:
+                        yield CoachEvent(type=result.message_type, data=result.result)
+                    messages.append(result.to_tool_message())
 
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
-            yield f"I apologize, but I encountered an error. Please try again."
+            yield CoachEvent(
+                type=MessageType.TEXT,
+                data="I apologize, but I encountered an error. Please try again.",
+            )
+
+    async def generate_structured(
+        self,
+        user_id: uuid.UUID,
+        output_model: type[OutputT],
+        prompt_template: str,
+        **prompt_args: Any,
+    ) -> AsyncGenerator[PartialValue | OutputT, None]:
+        """Generate a structured output, streaming fields as they complete.
+
+        The model is asked for JSON matching `output_model`. Completed fields
+        and array items are yielded as `PartialValue`s while the response
+        streams; the last item is the full output validated by `output_model`.
+        """
+        context = await self._get_user_context(user_id)
+        prompt = prompt_template.format(currency=context["user"].currency, **prompt_args)
+
+        stream = self._stream_completion(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._build_system_prompt(context)},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.7,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": output_model.__name__,
+                    "schema": output_model.model_json_schema(),
+                },
+            },
+        )
+
+        parser = IncrementalJSONParser()
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                for partial in parser.feed(chunk.choices[0].delta.content):
+                    yield partial
+
+        yield output_model.model_validate_json(parser.text)
+
+    async def remember(self, user_id: uuid.UUID, messages: list[ChatMessage]) -> None:
+        """Add messages to the user's long-term chat memory."""
+        if self.memory is None:
+            return
+        try:
+            await self.memory.remember(user_id, messages)
+        except Exception as e:
+            logger.warning(f"Failed to index chat messages: {e}")
 
     async def generate_quick_actions(
         self,
         user_id: uuid.UUID,
     ) -> list[dict[str, str]]:
         """Generate context-aware quick actions."""
-        context = await self._get_user_context(user_id)
+        alerts = await AlertEngine(self.db).active_for_user(user_id)
 
         actions = []
 
-        # Check for low pot balances
-        for pot in context["pots"]:
-            if float(pot.current_amount) < float(pot.target_amount) * 0.2:
+        # Low pot balances, then goals near completion
+        for alert in alerts:
+            if alert.rule == AlertRule.LOW_BALANCE:
                 actions.append({
-                    "id": f"low_pot_{pot.id}",
-                    "label": f"Top up {pot.name}",
+                    "id": f"low_pot_{alert.pot_id}",
+                    "label": f"Top up {alert.pot_name}",
                     "icon": "plus-circle",
-                    "action": f"transfer_to_pot:{pot.id}",
+                    "action": f"transfer_to_pot:{alert.pot_id}",
                 })
-
-        # Check for goals near completion
-        for goal in context["goals"]:
-            progress = float(goal.current_amount) / float(goal.target_amount)
-            if 0.8 <= progress < 1.0:
-                remaining = float(goal.target_amount) - float(goal.current_amount)
+            elif alert.rule == AlertRule.GOAL_NEAR_COMPLETION:
                 actions.append({
-                    "id": f"complete_goal_{goal.id}",
-                    "label": f"Complete {goal.title}",
+                    "id": f"complete_goal_{alert.goal_id}",
+                    "label": f"Complete {alert.goal_title}",
                     "icon": "target",
-                    "action": f"contribute_to_goal:{goal.id}:{remaining}",
+                    "action": f"contribute_to_goal:{alert.goal_id}:{alert.goal_remaining}",
                 })
 
         # Add general actions
@@ -206,57 +431,3 @@ class AICoach:
         ])
 
         return actions[:4]  # Return max 4 quick actions
-
-    async def generate_insights(
-        self,
-        user_id: uuid.UUID,
-    ) -> list[dict[str, Any]]:
-        """Generate AI-powered financial insights."""
-        context = await self._get_user_context(user_id)
-        user = context["user"]
-        insights = []
-
-        # Spending pattern insight
-        total_expenses = sum(float(e.amount) for e in context["expenses"])
-        if context["expenses"]:
-            avg_expense = total_expenses / len(context["expenses"])
-            insights.append({
-                "id": f"insight_{uuid.uuid4().hex[:8]}",
-                "title": "Spending Pattern",
-                "description": f"Your average expense is {user.currency}{avg_expense:.2f}. "
-                              "Consider if each purchase aligns with your goals.",
-                "type": "tip",
-                "createdAt": context["expenses"][0].created_at.isoformat(),
-            })
-
-        # Goal progress insight
-        active_goals = [g for g in context["goals"] if g.status.value == "active"]
-        if active_goals:
-            closest_goal = min(
-                active_goals,
-                key=lambda g: float(g.target_amount) - float(g.current_amount),
-            )
-            remaining = float(closest_goal.target_amount) - float(closest_goal.current_amount)
-            insights.append({
-                "id": f"insight_{uuid.uuid4().hex[:8]}",
-                "title": "Almost There!",
-                "description": f"You're {user.currency}{remaining:.2f} away from "
-                              f"completing '{closest_goal.title}'. Keep going!",
-                "type": "achievement",
-                "createdAt": closest_goal.created_at.isoformat(),
-            })
-
-        # Low balance warning
-        for pot in context["pots"]:
-            balance_ratio = float(pot.current_amount) / float(pot.target_amount) if pot.target_amount else 1
-            if balance_ratio < 0.2 and pot.category.value == "necessities":
-                insights.append({
-                    "id": f"insight_{uuid.uuid4().hex[:8]}",
-                    "title": "Low Balance Alert",
-                    "description": f"Your {pot.name} pot is running low. "
-                                  "Consider transferring funds or reducing spending.",
-                    "type": "warning",
-                    "createdAt": pot.updated_at.isoformat(),
-                })
-
-        return insights[:5]  # Return max 5 insights
@@ -0,0 +1,86 @@
+"""Lightweight extractors for user chat messages."""
+
+import re
+from dataclasses import dataclass
+
+# Verbs that signal the user is weighing a purchase rather than stating income etc.
+_INTENT_PATTERN = re.compile(
+    r"\b(buy|buying|purchase|purchasing|get|getting|afford|spend|spending|order|ordering|"
+    r"pay for|paying for|splurge|treat myself|thinking of|considering)\b",
+    re.IGNORECASE,
+)
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_AMOUNT_PATTERN = re.compile(
+    rf"[$€£¥₫]\s?(?P<prefixed>{_NUMBER})\s?(?P<prefixed_k>k\b)?"
+    rf"|(?P<suffixed>{_NUMBER})\s?(?P<suffixed_k>k\b)?\s?"
+    r"(?:dollars|usd|bucks|euros?|eur|gbp|pounds)\b",
+    re.IGNORECASE,
+)
+
+_STOP_WORDS = (
+    r"for|this|that|next|today|tonight|tomorrow|now|and|but|or|because|so|if|with|from|"
+    r"on|in|at|to|is|was|would|will|should|could|can|right|soon"
+)
+_ARTICLES = r"(?:(?:a|an|the|some|new|my)\s+)*"
+
+# "$1200 laptop", "$1,200 on a new laptop"
+_DESCRIPTION_AFTER = re.compile(
+    rf"^\s*(?:on\s+|for\s+)?{_ARTICLES}"
+    rf"(?P<description>(?:(?!(?:{_STOP_WORDS})\b)[a-z][\w\-']*\s*){{1,4}})",
+    re.IGNORECASE,
+)
+# "buy a new laptop for $1200"
+_DESCRIPTION_BEFORE = re.compile(
+    rf"\b(?:buy|buying|purchase|purchasing|get|getting|afford|order|ordering)\s+{_ARTICLES}"
+    rf"(?P<description>(?:(?!(?:{_STOP_WORDS})\b)[a-z][\w\-']*\s*){{1,4}})"
+    r"\s*(?:for|at|costing|that costs)\s*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class PurchaseIntent:
+    """A purchase the user appears to be considering."""
+
+    amount: float
+    description: str
+
+
+def _parse_amount(match: re.Match[str]) -> float:
+    """Convert an amount match to a float, expanding a `k` suffix."""
+    number = match.group("prefixed") or match.group("suffixed")
+    value = float(number.replace(",", ""))
+    if match.group("prefixed_k") or match.group("suffixed_k"):
+        value *= 1000
+    return value
+
+
+def extract_purchase_intent(text: str) -> PurchaseIntent | None:
+    """Detect a purchase amount and description in a chat message.
+
+    This is a cheap regex pass that runs before the model is called, so it
+    favours precision: messages without a purchase verb are ignored.
+    """
+    if not _INTENT_PATTERN.search(text):
+        return None
+
+    match = _AMOUNT_PATTERN.search(text)
+    if not match:
+        return None
+
+    amount = _parse_amount(match)
+    if amount <= 0:
+        return None
+
+    description = None
+    after = _DESCRIPTION_AFTER.match(text[match.end():])
+    if after:
+        description = after.group("description")
+    else:
+        before = _DESCRIPTION_BEFORE.search(text[: match.start()])
+        if before:
+            description = before.group("description")
+
+    description = (description or "").strip(" -'")
+    return PurchaseIntent(amount=amount, description=description or "Purchase")
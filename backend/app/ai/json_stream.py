@@ -0,0 +1,121 @@
+"""Incremental parsing of JSON objects streamed by the model."""
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class PartialValue:
+    """A top-level field, or one item of a top-level array, that has completed.
+
+    `index` is the item position for array fields and `None` for other fields.
+    """
+
+    field: str
+    index: int | None
+    value: Any
+
+
+class IncrementalJSONParser:
+    """Scan a streamed JSON object and report values as soon as they complete.
+
+    Only the structure one and two levels below the root object is tracked:
+    scalar and object fields are reported when their value ends, and array
+    fields are reported item by item. Each completed slice is decoded with
+    `json.loads`, so the full text never has to be re-parsed.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._key: str | None = None
+        self._expect_key = True
+        self._value_start: int | None = None
+        self._item_start: int | None = None
+        self._index = 0
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[PartialValue]:
+        """Consume a chunk of text and return the values it completed."""
+        completed: list[PartialValue] = []
+        offset = len(self._text)
+        self._text += chunk
+
+        for position, char in enumerate(chunk, start=offset):
+            self._feed_char(position, char, completed)
+
+        return completed
+
+    def _feed_char(self, position: int, char: str, completed: list[PartialValue]) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                self._last_string = self._text[self._string_start : position + 1]
+            return
+
+        if char.isspace():
+            return
+
+        depth = len(self._stack)
+        in_root_array = depth == 2 and self._stack[-1] == "["
+
+        if depth == 1 and not self._expect_key and self._value_start is None:
+            if char not in ",}":
+                self._value_start = position
+        if in_root_array and self._item_start is None and char not in ",]":
+            self._item_start = position
+
+        if char == '"':
+            self._in_string = True
+            self._string_start = position
+        elif char in "{[":
+            self._stack.append(char)
+        elif char in "}]":
+            if depth == 1:
+                self._close_field(position, completed)
+            elif in_root_array:
+                self._close_item(position, completed)
+            elif depth == 3 and self._stack[-2] == "[":
+                self._close_item(position + 1, completed)
+            if self._stack:
+                self._stack.pop()
+        elif char == ":" and depth == 1:
+            self._key = json.loads(self._last_string) if self._last_string else None
+            self._expect_key = False
+            self._index = 0
+        elif char == ",":
+            if depth == 1:
+                self._close_field(position, completed)
+                self._expect_key = True
+            elif in_root_array:
+                self._close_item(position, completed)
+
+    def _close_field(self, end: int, completed: list[PartialValue]) -> None:
+        if self._value_start is None or self._key is None:
+            return
+        value = json.loads(self._text[self._value_start : end])
+        self._value_start = None
+        # Array fields have already been reported item by item
+        if not isinstance(value, list):
+            completed.append(PartialValue(field=self._key, index=None, value=value))
+
+    def _close_item(self, end: int, completed: list[PartialValue]) -> None:
+        if self._item_start is None or self._key is None:
+            return
+        value = json.loads(self._text[self._item_start : end])
+        self._item_start = None
+        completed.append(PartialValue(field=self._key, index=self._index, value=value))
+        self._index += 1
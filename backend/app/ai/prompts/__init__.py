@@ -2,11 +2,13 @@
 
 from app.ai.prompts.system import SYSTEM_PROMPT, build_context_prompt
 from app.ai.prompts.impact_analysis import IMPACT_ANALYSIS_PROMPT
+from app.ai.prompts.insights import INSIGHTS_PROMPT
 from app.ai.prompts.trade_off import TRADE_OFF_PROMPT
 
 __all__ = [
     "SYSTEM_PROMPT",
     "build_context_prompt",
     "IMPACT_ANALYSIS_PROMPT",
+    "INSIGHTS_PROMPT",
     "TRADE_OFF_PROMPT",
 ]
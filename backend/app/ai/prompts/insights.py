@@ -0,0 +1,16 @@
+"""Insights prompt template."""
+
+INSIGHTS_PROMPT = """Review the user's current financial state and generate up to {limit} insights.
+
+Mix the insight types where the data supports it:
+1. **Tips**: Practical ways to improve their pot allocation or spending habits
+2. **Warnings**: Pots running low, goals at risk of missing their deadline
+3. **Achievements**: Milestones reached, goals close to completion, good habits
+
+For each insight:
+- Reference specific pots, goals or expenses with real numbers
+- Keep the description to one or two sentences
+- Suggest a concrete action item when one applies
+
+Order the insights from highest to lowest priority.
+"""
@@ -0,0 +1,16 @@
+"""Retrieval of relevant past chat turns."""
+
+from app.ai.retrieval.embedders import Embedder, HashingEmbedder, OpenAIEmbedder, get_embedder
+from app.ai.retrieval.index import VectorIndex, VectorIndexStore
+from app.ai.retrieval.memory import ChatMemory, format_recalled_messages
+
+__all__ = [
+    "ChatMemory",
+    "Embedder",
+    "HashingEmbedder",
+    "OpenAIEmbedder",
+    "VectorIndex",
+    "VectorIndexStore",
+    "format_recalled_messages",
+    "get_embedder",
+]
@@ -0,0 +1,93 @@
+"""Text embedders for chat memory retrieval."""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Protocol
+
+import numpy as np
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so that dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalized float32 vectors of a fixed dimension."""
+
+    dimension: int
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into an array of shape (len(texts), dimension)."""
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic offline embedder using signed feature hashing.
+
+    Unigrams and bigrams are hashed into a fixed number of buckets with a
+    stable hash, so the same text always maps to the same vector across
+    processes. Useful for tests and deployments without an embeddings API.
+    """
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def _features(self, text: str) -> list[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _embed_one(self, text: str, out: np.ndarray) -> None:
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            out[(value >> 1) % self.dimension] += sign
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            self._embed_one(text, vectors[row])
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """Embedder backed by the OpenAI embeddings API."""
+
+    def __init__(self, model: str, dimension: int):
+        self.model = model
+        self.dimension = dimension
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        from app.ai.client import get_openai_client
+
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        response = await get_openai_client().embeddings.create(
+            model=self.model,
+            input=texts,
+            dimensions=self.dimension,
+        )
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        return _normalize(vectors)
+
+
+@lru_cache
+def get_embedder() -> Embedder:
+    """Get the embedder configured in settings."""
+    if settings.chat_memory_embedder == "openai":
+        return OpenAIEmbedder(
+            model=settings.chat_memory_embedding_model,
+            dimension=settings.chat_memory_dimension,
+        )
+    return HashingEmbedder(dimension=settings.chat_memory_dimension)
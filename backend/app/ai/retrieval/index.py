@@ -0,0 +1,126 @@
+"""Compact in-memory NumPy vector index."""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class IndexEntry:
+    """Metadata stored alongside each indexed vector."""
+
+    row_id: int
+    message_id: str
+    session_id: str
+    tokens: int
+
+
+@dataclass
+class SearchHit:
+    """A search result with its cosine similarity score."""
+
+    entry: IndexEntry
+    score: float
+
+
+class VectorIndex:
+    """In-memory vector index for a single user.
+
+    Holds a copy of the user's stored embeddings as one contiguous float32
+    matrix, grown by doubling its capacity. Entries are added in storage
+    order, so `last_row_id` is the newest stored row the index includes.
+    Hold `lock` while bringing the index up to date.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.lock = asyncio.Lock()
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def last_row_id(self) -> int:
+        """Id of the newest stored row in the index, or 0 if it is empty."""
+        return self._entries[-1].row_id if self._entries else 0
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries: list[IndexEntry] = []
+        self._session_ids = np.empty(0, dtype="U36")
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+
+    def extend(self, vectors: np.ndarray, entries: list[IndexEntry]) -> None:
+        """Add normalized vectors and their metadata to the index."""
+        if len(entries) == 0:
+            return
+        if vectors.shape != (len(entries), self.dimension):
+            raise ValueError(
+                f"Expected vectors of shape ({len(entries)}, {self.dimension}), "
+                f"got {vectors.shape}"
+            )
+
+        size = len(self._entries)
+        if size + len(entries) > len(self._vectors):
+            grown = np.zeros(
+                (max(size + len(entries), 2 * len(self._vectors)), self.dimension),
+                dtype=np.float32,
+            )
+            grown[:size] = self._vectors[:size]
+            self._vectors = grown
+        self._vectors[size : size + len(entries)] = vectors
+
+        self._entries.extend(entries)
+        self._session_ids = np.concatenate(
+            [self._session_ids, np.array([e.session_id for e in entries], dtype="U36")]
+        )
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        exclude_session_id: str | None = None,
+        min_score: float = 0.0,
+    ) -> list[SearchHit]:
+        """Return up to `k` entries most similar to a normalized query vector."""
+        if not self._entries or k <= 0:
+            return []
+
+        vectors = self._vectors[: len(self._entries)]
+        scores = np.asarray(vectors @ query.astype(np.float32), dtype=np.float32)
+        if exclude_session_id is not None:
+            scores[self._session_ids == exclude_session_id] = -np.inf
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            SearchHit(entry=self._entries[i], score=float(scores[i]))
+            for i in top
+            if scores[i] >= min_score
+        ]
+
+
+class VectorIndexStore:
+    """Keeps recently used per-user indexes in memory, evicting the least recent."""
+
+    def __init__(self, dimension: int, max_open: int = 128):
+        self.dimension = dimension
+        self.max_open = max_open
+        self._indexes: OrderedDict[str, VectorIndex] = OrderedDict()
+
+    def get(self, user_id: str) -> VectorIndex:
+        """Get the index for a user, creating an empty one if needed."""
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = VectorIndex(self.dimension)
+            self._indexes[user_id] = index
+            if len(self._indexes) > self.max_open:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(user_id)
+        return index
@@ -0,0 +1,209 @@
+"""Long-term chat memory across a user's sessions.
+
+Embeddings are stored in Postgres, so the API and the worker share them.
+Each process keeps recently used users' embeddings in an in-memory index
+and brings it up to date before searching.
+"""
+
+import logging
+import uuid
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import ColumnElement, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.retrieval.embedders import Embedder, get_embedder
+from app.ai.retrieval.index import IndexEntry, VectorIndex, VectorIndexStore
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.chat import ChatMessage, ChatMessageEmbedding, ChatSession
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Number of messages embedded per request when backfilling
+BACKFILL_BATCH_SIZE = 256
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (about 4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+@lru_cache
+def _get_store(embedder_key: str, dimension: int) -> VectorIndexStore:
+    """Get the index store for an embedder, keyed so dimensions never mix."""
+    return VectorIndexStore(dimension)
+
+
+class ChatMemory:
+    """Indexes chat messages and recalls relevant turns from other sessions."""
+
+    def __init__(self, db: AsyncSession, embedder: Embedder | None = None):
+        self.db = db
+        self.embedder = embedder or get_embedder()
+        self.embedder_key = f"{type(self.embedder).__name__}-{self.embedder.dimension}"
+        self.store = _get_store(self.embedder_key, self.embedder.dimension)
+
+    async def remember(self, user_id: uuid.UUID, messages: list[ChatMessage]) -> None:
+        """Embed committed messages and store them for later recall.
+
+        Commits on its own session, so indexing neither waits for nor rolls
+        back the caller's transaction. Messages already stored are skipped.
+        """
+        messages = [m for m in messages if m.content]
+        if not messages:
+            return
+
+        vectors = await self.embedder.embed([m.content for m in messages])
+        statement = (
+            insert(ChatMessageEmbedding)
+            .values([
+                {
+                    "message_id": m.id,
+                    "user_id": user_id,
+                    "session_id": m.session_id,
+                    "embedder": self.embedder_key,
+                    "tokens": estimate_tokens(m.content),
+                    "vector": np.ascontiguousarray(vector, dtype=np.float32).tobytes(),
+                }
+                for m, vector in zip(messages, vectors)
+            ])
+            .on_conflict_do_nothing(index_elements=["message_id", "embedder"])
+        )
+        async with AsyncSessionLocal() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    async def backfill(self, user_id: uuid.UUID) -> int:
+        """Store embeddings for all of a user's messages that have none yet."""
+        result = await self.db.execute(
+            select(ChatMessage)
+            .join(ChatSession)
+            .where(
+                ChatSession.user_id == user_id,
+                ~exists().where(
+                    ChatMessageEmbedding.message_id == ChatMessage.id,
+                    ChatMessageEmbedding.embedder == self.embedder_key,
+                ),
+            )
+            .order_by(ChatMessage.created_at)
+        )
+        messages = list(result.scalars().all())
+        for start in range(0, len(messages), BACKFILL_BATCH_SIZE):
+            await self.remember(user_id, messages[start : start + BACKFILL_BATCH_SIZE])
+        return len(messages)
+
+    async def _load_index(self, user_id: uuid.UUID) -> VectorIndex:
+        """Get the user's in-memory index, brought up to date with stored embeddings.
+
+        Only rows newer than the index's last row are fetched. If the counts
+        then disagree, rows were deleted or committed out of id order, and
+        the index is reloaded in full.
+        """
+        index = self.store.get(str(user_id))
+        owned = (
+            ChatMessageEmbedding.user_id == user_id,
+            ChatMessageEmbedding.embedder == self.embedder_key,
+        )
+        async with index.lock:
+            count, last_row_id = (
+                await self.db.execute(
+                    select(func.count(), func.coalesce(func.max(ChatMessageEmbedding.id), 0))
+                    .where(*owned)
+                )
+            ).one()
+            if count == len(index) and last_row_id == index.last_row_id:
+                return index
+
+            rows = await self._fetch_rows(*owned, ChatMessageEmbedding.id > index.last_row_id)
+            if len(index) + len(rows) != count:
+                index.clear()
+                rows = await self._fetch_rows(*owned)
+            if rows:
+                index.extend(
+                    np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32)
+                    .reshape(len(rows), index.dimension),
+                    [
+                        IndexEntry(
+                            row_id=row.id,
+                            message_id=str(row.message_id),
+                            session_id=str(row.session_id),
+                            tokens=row.tokens,
+                        )
+                        for row in rows
+                    ],
+                )
+        return index
+
+    async def _fetch_rows(self, *conditions: ColumnElement[bool]) -> list:
+        """Fetch stored embedding rows in id order."""
+        result = await self.db.execute(
+            select(
+                ChatMessageEmbedding.id,
+                ChatMessageEmbedding.message_id,
+                ChatMessageEmbedding.session_id,
+                ChatMessageEmbedding.tokens,
+                ChatMessageEmbedding.vector,
+            )
+            .where(*conditions)
+            .order_by(ChatMessageEmbedding.id)
+        )
+        return list(result.all())
+
+    async def recall(
+        self,
+        user_id: uuid.UUID,
+        query: str,
+        exclude_session_id: uuid.UUID | None = None,
+        top_k: int | None = None,
+        token_budget: int | None = None,
+    ) -> list[ChatMessage]:
+        """Find past messages relevant to a query, within a token budget.
+
+        Results come from sessions other than `exclude_session_id` and are
+        returned in chronological order.
+        """
+        index = await self._load_index(user_id)
+        if len(index) == 0:
+            return []
+
+        top_k = top_k or settings.chat_memory_top_k
+        token_budget = token_budget or settings.chat_memory_token_budget
+
+        query_vector = (await self.embedder.embed([query]))[0]
+        hits = index.search(
+            query_vector,
+            k=top_k,
+            exclude_session_id=str(exclude_session_id) if exclude_session_id else None,
+            min_score=settings.chat_memory_min_score,
+        )
+
+        # Greedily keep the best hits that fit the budget
+        selected: list[uuid.UUID] = []
+        used = 0
+        for hit in hits:
+            if used + hit.entry.tokens > token_budget:
+                continue
+            selected.append(uuid.UUID(hit.entry.message_id))
+            used += hit.entry.tokens
+        if not selected:
+            return []
+
+        result = await self.db.execute(
+            select(ChatMessage)
+            .where(ChatMessage.id.in_(selected))
+            .order_by(ChatMessage.created_at)
+        )
+        return list(result.scalars().all())
+
+
+def format_recalled_messages(messages: list[ChatMessage]) -> str:
+    """Format recalled messages as a prompt section."""
+    lines = [
+        f"- [{m.created_at:%Y-%m-%d}] {m.role.value}: {m.content}"
+        for m in messages
+    ]
+    return "## Relevant Earlier Conversations\n" + "\n".join(lines)
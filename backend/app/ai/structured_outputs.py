@@ -58,3 +58,9 @@ class InsightOutput(BaseModel):
     insight_type: str = Field(description="tip, warning, or achievement")
     priority: str = Field(description="low, medium, or high")
     action_item: str | None = None
+
+
+class InsightsOutput(BaseModel):
+    """Structured output for a set of financial insights."""
+
+    insights: list[InsightOutput]
@@ -0,0 +1,220 @@
+"""In-process tools the AI coach can call."""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import func, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.chat import MessageType
+from app.models.pot import Pot
+from app.schemas.chat import ImpactAnalysis, TradeOff
+from app.services.impact_service import ImpactService
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzePurchaseArgs(BaseModel):
+    """Arguments for the analyze_purchase_impact tool."""
+
+    amount: float = Field(..., gt=0)
+    description: str = "Purchase"
+    pot_name: str | None = None
+
+
+class TradeOffArgs(BaseModel):
+    """Arguments for the suggest_trade_offs tool."""
+
+    amount: float = Field(..., gt=0)
+    description: str = "Purchase"
+
+
+COACH_TOOLS: list[dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "analyze_purchase_impact",
+            "description": (
+                "Calculate how a potential purchase affects the user's pots and goals. "
+                "Use whenever the user is considering spending a specific amount."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "amount": {
+                        "type": "number",
+                        "description": "Purchase amount in the user's currency",
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Short description of the purchase",
+                    },
+                    "pot_name": {
+                        "type": "string",
+                        "description": "Name of the pot the money would come from, if known",
+                    },
+                },
+                "required": ["amount", "description"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "suggest_trade_offs",
+            "description": (
+                "Generate alternative options (skip, delay, use another pot, split) "
+                "for a potential purchase."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "amount": {
+                        "type": "number",
+                        "description": "Purchase amount in the user's currency",
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Short description of the purchase",
+                    },
+                },
+                "required": ["amount", "description"],
+            },
+        },
+    },
+]
+
+# Message type produced by each tool, used for SSE event names and persistence
+TOOL_MESSAGE_TYPES: dict[str, MessageType] = {
+    "analyze_purchase_impact": MessageType.IMPACT_ANALYSIS,
+    "suggest_trade_offs": MessageType.TRADE_OFF,
+}
+
+
+class ToolCallResult(BaseModel):
+    """Outcome of a single tool call."""
+
+    tool_call_id: str
+    name: str
+    result: ImpactAnalysis | TradeOff | None = None
+    error: str | None = None
+
+    @property
+    def message_type(self) -> MessageType | None:
+        """Message type of the successful result, if any."""
+        if self.result is None:
+            return None
+        return TOOL_MESSAGE_TYPES.get(self.name)
+
+    def to_tool_message(self) -> dict[str, str]:
+        """Format the result as a `tool` message for the OpenAI API."""
+        if self.result is not None:
+            content = self.result.model_dump_json(by_alias=True)
+        else:
+            content = json.dumps({"error": self.error or "Tool failed"})
+        return {"role": "tool", "tool_call_id": self.tool_call_id, "content": content}
+
+
+class CoachToolExecutor:
+    """Executes coach tool calls against the service layer.
+
+    Each call runs on its own database session so that several calls
+    requested in one model turn can be awaited concurrently.
+    """
+
+    def __init__(self, user_id: uuid.UUID):
+        self.user_id = user_id
+        self._prefetched: dict[float, asyncio.Task[ImpactAnalysis | None]] = {}
+
+    def prefetch_impact(
+        self,
+        amount: float,
+        description: str,
+    ) -> asyncio.Task[ImpactAnalysis | None]:
+        """Start an impact analysis in the background.
+
+        A later `analyze_purchase_impact` call for the same amount (without a
+        specific pot) reuses the task instead of querying again.
+        """
+        task = self._prefetched.get(amount)
+        if task is None:
+            args = AnalyzePurchaseArgs(amount=amount, description=description)
+            task = asyncio.create_task(self._safe_analyze_purchase(args))
+            self._prefetched[amount] = task
+        return task
+
+    async def _safe_analyze_purchase(self, args: AnalyzePurchaseArgs) -> ImpactAnalysis | None:
+        """Analyze a purchase, logging instead of raising on failure."""
+        try:
+            return await self._run_analyze_purchase(args)
+        except Exception as e:
+            logger.warning(f"Prefetched impact analysis failed: {e}")
+            return None
+
+    async def execute_all(self, tool_calls: list[dict[str, Any]]) -> list[ToolCallResult]:
+        """Execute tool calls concurrently, preserving request order."""
+        return list(await asyncio.gather(*(self.execute(call) for call in tool_calls)))
+
+    async def execute(self, tool_call: dict[str, Any]) -> ToolCallResult:
+        """Execute a single tool call."""
+        call_id = tool_call["id"]
+        name = tool_call["function"]["name"]
+        try:
+            arguments = json.loads(tool_call["function"]["arguments"] or "{}")
+            if name == "analyze_purchase_impact":
+                result = await self.analyze_purchase(AnalyzePurchaseArgs.model_validate(arguments))
+            elif name == "suggest_trade_offs":
+                result = await self.suggest_trade_offs(TradeOffArgs.model_validate(arguments))
+            else:
+                return ToolCallResult(tool_call_id=call_id, name=name, error="Unknown tool")
+        except (json.JSONDecodeError, ValidationError) as e:
+            return ToolCallResult(tool_call_id=call_id, name=name, error=f"Invalid arguments: {e}")
+        except Exception as e:
+            logger.error(f"Error executing tool {name}: {e}")
+            return ToolCallResult(tool_call_id=call_id, name=name, error="Tool failed")
+
+        return ToolCallResult(tool_call_id=call_id, name=name, result=result)
+
+    async def analyze_purchase(self, args: AnalyzePurchaseArgs) -> ImpactAnalysis:
+        """Run ImpactService.analyze_purchase for the tool arguments."""
+        prefetched = self._prefetched.get(args.amount)
+        if prefetched is not None and args.pot_name is None:
+            result = await prefetched
+            if result is not None:
+                return result
+        return await self._run_analyze_purchase(args)
+
+    async def _run_analyze_purchase(self, args: AnalyzePurchaseArgs) -> ImpactAnalysis:
+        """Query pots and goals and build the impact analysis."""
+        async with AsyncSessionLocal() as session:
+            pot_id = None
+            if args.pot_name:
+                pot_result = await session.execute(
+                    select(Pot.id).where(
+                        Pot.user_id == self.user_id,
+                        func.lower(Pot.name) == args.pot_name.lower(),
+                    )
+                )
+                pot_id = pot_result.scalars().first()
+
+            service = ImpactService(session)
+            return await service.analyze_purchase(
+                user_id=self.user_id,
+                amount=args.amount,
+                pot_id=pot_id,
+                description=args.description,
+            )
+
+    async def suggest_trade_offs(self, args: TradeOffArgs) -> TradeOff:
+        """Run ImpactService.generate_trade_offs for the tool arguments."""
+        async with AsyncSessionLocal() as session:
+            service = ImpactService(session)
+            return await service.generate_trade_offs(
+                user_id=self.user_id,
+                amount=args.amount,
+                description=args.description,
+            )
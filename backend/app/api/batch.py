@@ -0,0 +1,134 @@
+"""In-process dispatch of batched sub-requests through the ASGI app.
+
+Each sub-request runs through the full middleware stack and its route's
+dependencies, exactly as if it had arrived on its own, so it gets its own
+pooled session, metrics and validation. Only the network round trips are
+saved.
+"""
+
+import asyncio
+import json
+import logging
+from urllib.parse import unquote
+
+from starlette.types import ASGIApp, Message, Scope
+
+from app.config import get_settings
+from app.core.exceptions import ValidationException
+from app.schemas.batch import BatchItemResponse, BatchMethod, BatchRequestItem
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Headers describing the batch's own body, replaced for each sub-request
+_BODY_HEADERS = {b"content-length", b"content-type", b"transfer-encoding"}
+
+# Scope key marking a sub-request, so one routed back to the batch endpoint
+# is refused however its path was written
+_SUB_REQUEST_KEY = "batch_sub_request"
+
+
+async def dispatch(app: ASGIApp, scope: Scope, item: BatchRequestItem) -> BatchItemResponse:
+    """Run one sub-request, forwarding the batch request's headers."""
+    path, _, query = item.path.partition("?")
+    path = settings.api_v1_prefix + path
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+
+    headers = [(name, value) for name, value in scope["headers"] if name not in _BODY_HEADERS]
+    if item.body is not None:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    sub_scope = {
+        "type": "http",
+        "asgi": scope["asgi"],
+        "http_version": scope["http_version"],
+        "method": item.method.value,
+        "scheme": scope["scheme"],
+        "server": scope.get("server"),
+        "client": scope.get("client"),
+        "root_path": scope.get("root_path", ""),
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(scope.get("state", {})),
+        _SUB_REQUEST_KEY: True,
+    }
+
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Streaming responses listen for a disconnect; the batch client stays
+        # connected until the sub-request completes
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    status = None
+    content_type = b""
+    chunks: list[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(sub_scope, receive, send)
+    except Exception as e:
+        logger.error(f"Batch sub-request {item.method.value} {item.path} failed: {e}")
+        if status is None:
+            return BatchItemResponse(id=item.id, status=500, body={"detail": "Internal error"})
+
+    content = b"".join(chunks)
+    if not content:
+        response_body = None
+    elif content_type.startswith(b"application/json"):
+        response_body = json.loads(content)
+    else:
+        response_body = content.decode("utf-8", errors="replace")
+    return BatchItemResponse(id=item.id, status=status or 500, body=response_body)
+
+
+async def run_batch(
+    app: ASGIApp,
+    scope: Scope,
+    items: list[BatchRequestItem],
+) -> list[BatchItemResponse]:
+    """Run sub-requests, concurrently where they are independent.
+
+    Consecutive GETs run together, up to the configured concurrency. A
+    write runs on its own once everything before it has finished, so later
+    sub-requests see its effects.
+    """
+    if scope.get(_SUB_REQUEST_KEY):
+        raise ValidationException("Batches cannot be nested")
+
+    responses: list[BatchItemResponse | None] = [None] * len(items)
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def run(index: int) -> None:
+        async with semaphore:
+            responses[index] = await dispatch(app, scope, items[index])
+
+    groups: list[list[int]] = []
+    for index, item in enumerate(items):
+        reads = groups and items[groups[-1][0]].method == BatchMethod.GET
+        if item.method == BatchMethod.GET and reads:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+
+    for group in groups:
+        async with asyncio.TaskGroup() as tasks:
+            for index in group:
+                tasks.create_task(run(index))
+    return responses
@@ -1,13 +1,16 @@
 """API dependencies."""
 
 import uuid
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Cookie, Depends, Header, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.read_only import assert_no_pending_writes
+from app.db.replica import bind_request_user
+from app.db.session import ReadOnlySessionLocal, ReadSessionLocal, get_db, read_your_writes
 from app.models.user import User
 
 
@@ -25,12 +28,35 @@ async def get_current_user_id(
             detail="X-User-ID header is required",
         )
     try:
-        return uuid.UUID(x_user_id)
+        user_id = uuid.UUID(x_user_id)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid user ID format",
         )
+    bind_request_user(user_id)
+    return user_id
+
+
+async def get_read_db(
+    user_id: Annotated[uuid.UUID, Depends(get_current_user_id)],
+    last_write: Annotated[
+        str | None, Cookie(alias=read_your_writes.cookie_name, include_in_schema=False)
+    ] = None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a session for read-only queries.
+
+    Uses the replica unless the user wrote recently, on this worker or as
+    their read-your-writes cookie shows, in which case the primary is used
+    so they see their own changes.
+    """
+    if read_your_writes.is_pinned(user_id) or read_your_writes.cookie_pins(user_id, last_write):
+        session_factory = ReadOnlySessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as session:
+        yield session
+        assert_no_pending_writes(session)
 
 
 async def get_current_user(
@@ -69,6 +95,7 @@ async def get_or_create_user(
 
 # Type aliases for cleaner dependency injection
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+ReadOnlyDbSession = Annotated[AsyncSession, Depends(get_read_db)]
 CurrentUserId = Annotated[uuid.UUID, Depends(get_current_user_id)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 CurrentOrNewUser = Annotated[User, Depends(get_or_create_user)]
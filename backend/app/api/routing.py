@@ -0,0 +1,37 @@
+"""Custom API route classes."""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.routing import APIRoute
+
+from app.db.instrumentation import mark_handler_end
+
+
+def _marking_handler_end(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an async endpoint so it records when it returns."""
+    if not inspect.iscoroutinefunction(endpoint) or getattr(endpoint, "__marks_end__", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            mark_handler_end()
+
+    wrapper.__marks_end__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class TimedAPIRoute(APIRoute):
+    """APIRoute that lets the Server-Timing header report serialization time.
+
+    Serialization is measured from the endpoint returning to the response
+    headers being sent, which covers response model validation and encoding.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _marking_handler_end(endpoint), **kwargs)
@@ -0,0 +1,50 @@
+"""Helpers for SSE streaming endpoints."""
+
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.ai.json_stream import PartialValue
+from app.api.responses import json_dumps
+
+logger = logging.getLogger(__name__)
+
+
+async def structured_output_events(
+    outputs: AsyncIterator[PartialValue | BaseModel],
+) -> AsyncIterator[dict[str, Any]]:
+    """Format a structured generation stream as SSE events.
+
+    Emits a `partial` event per completed field or array item, then a `done`
+    event with the validated output, or an `error` event on failure.
+    """
+    try:
+        async for output in outputs:
+            if isinstance(output, PartialValue):
+                yield {
+                    "event": "partial",
+                    "data": json_dumps({
+                        "field": output.field,
+                        "index": output.index,
+                        "value": output.value,
+                    }),
+                }
+            else:
+                yield {
+                    "event": "done",
+                    "data": output.model_dump_json(),
+                }
+    except ValidationError as e:
+        logger.warning(f"Structured output failed validation: {e}")
+        yield {
+            "event": "error",
+            "data": json_dumps({"error": "The AI response did not match the expected format"}),
+        }
+    except Exception as e:
+        logger.error(f"Error generating structured output: {e}")
+        yield {
+            "event": "error",
+            "data": json_dumps({"error": str(e)}),
+        }
@@ -1,25 +1,34 @@
 """Analytics API endpoints."""
 
 from fastapi import APIRouter, Query
+from sse_starlette.sse import EventSourceResponse
 
 from app.ai.coach import AICoach
-from app.api.deps import CurrentUserId, DbSession
+from app.ai.prompts import INSIGHTS_PROMPT
+from app.ai.structured_outputs import InsightsOutput
+from app.api.deps import CurrentUserId, ReadOnlyDbSession
+from app.api.routing import TimedAPIRoute
+from app.api.streaming import structured_output_events
 from app.schemas.analytics import (
     AIInsight,
     DashboardData,
+    GoalProbabilityReport,
     GoalProgressData,
+    InsightType,
     PotDistribution,
     SpendingTrend,
+    TrendGranularity,
 )
 from app.services.analytics_service import AnalyticsService
+from app.services.insights import InsightService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
 
 
 @router.get("/dashboard", response_model=DashboardData)
 async def get_dashboard(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
 ) -> DashboardData:
     """Get main dashboard data."""
     service = AnalyticsService(db)
@@ -29,18 +38,19 @@ async def get_dashboard(
 @router.get("/spending-trends", response_model=SpendingTrend)
 async def get_spending_trends(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     days: int = Query(30, ge=7, le=365),
+    granularity: TrendGranularity = Query(TrendGranularity.DAY),
 ) -> SpendingTrend:
     """Get spending trends over time."""
     service = AnalyticsService(db)
-    return await service.get_spending_trends(user_id, days)
+    return await service.get_spending_trends(user_id, days, granularity)
 
 
 @router.get("/pot-distribution", response_model=PotDistribution)
 async def get_pot_distribution(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
 ) -> PotDistribution:
     """Get pot allocation breakdown."""
     service = AnalyticsService(db)
@@ -50,19 +60,51 @@ async def get_pot_distribution(
 @router.get("/goal-progress", response_model=list[GoalProgressData])
 async def get_goal_progress(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
 ) -> list[GoalProgressData]:
     """Get goal progress overview."""
     service = AnalyticsService(db)
     return await service.get_goal_progress(user_id)
 
 
+@router.get("/goal-probability", response_model=GoalProbabilityReport)
+async def get_goal_probability(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    simulations: int = Query(5000, ge=100, le=50000),
+    seed: int | None = Query(None, ge=0),
+) -> GoalProbabilityReport:
+    """Simulate the probability of reaching each goal by its deadline."""
+    service = AnalyticsService(db)
+    return await service.get_goal_probabilities(user_id, simulations, seed)
+
+
 @router.get("/insights", response_model=list[AIInsight])
 async def get_insights(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
 ) -> list[AIInsight]:
-    """Get AI-generated insights."""
+    """Get precomputed insights."""
+    service = InsightService(db)
+    return [
+        AIInsight(
+            id=str(insight.id),
+            title=insight.title,
+            description=insight.description,
+            type=InsightType(insight.type.value),
+            created_at=insight.created_at,
+        )
+        for insight in await service.get_for_user(user_id)
+    ]
+
+
+@router.get("/insights/stream")
+async def stream_insights(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    limit: int = Query(5, ge=1, le=10),
+):
+    """Stream AI-written insights, emitting each insight as it completes."""
     coach = AICoach(db)
-    insights = await coach.generate_insights(user_id)
-    return [AIInsight.model_validate(insight) for insight in insights]
+    outputs = coach.generate_structured(user_id, InsightsOutput, INSIGHTS_PROMPT, limit=limit)
+    return EventSourceResponse(structured_output_events(outputs))
@@ -0,0 +1,25 @@
+"""Batch API endpoint."""
+
+from fastapi import APIRouter, Request
+
+from app.api.batch import run_batch
+from app.api.deps import CurrentUserId
+from app.api.routing import TimedAPIRoute
+from app.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter(route_class=TimedAPIRoute)
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    data: BatchRequest,
+    request: Request,
+    user_id: CurrentUserId,
+) -> BatchResponse:
+    """Run several API requests in one round trip.
+
+    Paths are relative to the API prefix, e.g. `/pots/`. Each sub-request
+    is authenticated with this request's headers and reports its own status.
+    """
+    responses = await run_batch(request.app, request.scope, data.requests)
+    return BatchResponse(responses=responses)
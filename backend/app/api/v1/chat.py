@@ -1,44 +1,63 @@
 """Chat API endpoints with SSE streaming."""
 
-import json
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import func, select
 from sse_starlette.sse import EventSourceResponse
 
 from app.ai.coach import AICoach
-from app.api.deps import CurrentUserId, DbSession
+from app.api.deps import CurrentUserId, DbSession, ReadOnlyDbSession
+from app.api.responses import json_dumps
+from app.api.routing import TimedAPIRoute
 from app.core.exceptions import NotFoundException
 from app.models.chat import ChatMessage, ChatSession
 from app.models.chat import MessageRole as MessageRoleModel
 from app.models.chat import MessageType as MessageTypeModel
 from app.schemas.chat import (
     ChatMessageCreate,
-    ChatMessageResponse,
+    ChatSearchPage,
     ChatSessionCreate,
+    ChatSessionPage,
     ChatSessionResponse,
     ChatSessionWithMessages,
 )
+from app.services.chat_service import ChatService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
 
+# Keys under which lists of structured tool results are stored in
+# ChatMessage.extra_data, one entry per result streamed
+EXTRA_DATA_KEYS = {
+    MessageTypeModel.IMPACT_ANALYSIS: "impactAnalysis",
+    MessageTypeModel.TRADE_OFF: "tradeOff",
+}
 
-@router.get("/sessions", response_model=list[ChatSessionResponse])
+
+@router.get("/sessions", response_model=ChatSessionPage)
 async def list_sessions(
     user_id: CurrentUserId,
-    db: DbSession,
-) -> list[ChatSessionResponse]:
-    """List all chat sessions for the current user."""
-    result = await db.execute(
-        select(ChatSession)
-        .where(ChatSession.user_id == user_id)
-        .order_by(ChatSession.created_at.desc())
-    )
-    sessions = list(result.scalars().all())
-    return [ChatSessionResponse.model_validate(session) for session in sessions]
+    db: ReadOnlyDbSession,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+) -> ChatSessionPage:
+    """List the current user's chat sessions, most recently active first."""
+    service = ChatService(db)
+    return await service.list_sessions(user_id, limit, cursor)
+
+
+@router.get("/search", response_model=ChatSearchPage)
+async def search_messages(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+) -> ChatSearchPage:
+    """Search the current user's chat history."""
+    service = ChatService(db)
+    return await service.search(user_id, q, limit, offset)
 
 
 @router.post("/sessions", response_model=ChatSessionResponse, status_code=201)
@@ -62,39 +81,14 @@ async def create_session(
 async def get_session(
     session_id: uuid.UUID,
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = None,
+    after: str | None = None,
 ) -> ChatSessionWithMessages:
-    """Get a chat session with all messages."""
-    result = await db.execute(
-        select(ChatSession)
-        .where(ChatSession.id == session_id, ChatSession.user_id == user_id)
-        .options(selectinload(ChatSession.messages))
-    )
-    session = result.scalar_one_or_none()
-    if not session:
-        raise NotFoundException("Chat session")
-
-    # Convert messages to response format
-    messages = []
-    for msg in session.messages:
-        msg_response = ChatMessageResponse(
-            id=msg.id,
-            role=msg.role,
-            content=msg.content,
-            messageType=msg.message_type,
-            createdAt=msg.created_at,
-            impactAnalysis=msg.extra_data.get("impactAnalysis") if msg.extra_data else None,
-            tradeOff=msg.extra_data.get("tradeOff") if msg.extra_data else None,
-            quickActions=msg.extra_data.get("quickActions") if msg.extra_data else None,
-        )
-        messages.append(msg_response)
-
-    return ChatSessionWithMessages(
-        id=session.id,
-        title=session.title,
-        createdAt=session.created_at,
-        messages=messages,
-    )
+    """Get a chat session with a page of messages, most recent first."""
+    service = ChatService(db)
+    return await service.get_session(user_id, session_id, limit, before, after)
 
 
 @router.delete("/sessions/{session_id}", status_code=204)
@@ -145,13 +139,14 @@ async def send_message(
         message_type=MessageTypeModel.TEXT,
     )
     db.add(user_message)
+    session.updated_at = func.now()
     await db.flush()
 
     # Update session title if it's the first message
-    messages_count = await db.execute(
-        select(ChatMessage).where(ChatMessage.session_id == session_id)
+    messages_count = await db.scalar(
+        select(func.count()).where(ChatMessage.session_id == session_id)
     )
-    if len(list(messages_count.scalars().all())) == 1:
+    if messages_count == 1:
         # Generate title from first message
         title = data.content[:50] + "..." if len(data.content) > 50 else data.content
         session.title = title
@@ -163,17 +158,34 @@ async def send_message(
     async def generate():
         """Generate SSE events for the streaming response."""
         response_content = []
+        extra_data: dict = {}
+        message_type = MessageTypeModel.TEXT
         message_id = uuid.uuid4()
 
         try:
-            # Stream the AI response
-            async for chunk in coach.generate_response(user_id, session_id, data.content):
-                response_content.append(chunk)
+            # Stream the AI response, including in-process tool results
+            async for event in coach.generate_response(user_id, session_id, data.content):
+                if event.type == MessageTypeModel.TEXT:
+                    response_content.append(event.data)
+                    yield {
+                        "event": "message",
+                        "data": json_dumps({
+                            "id": str(message_id),
+                            "chunk": event.data,
+                        }),
+                    }
+                    continue
+
+                key = EXTRA_DATA_KEYS[event.type]
+                result = event.data.model_dump(mode="json", by_alias=True)
+                extra_data.setdefault(key, []).append(result)
+                if message_type == MessageTypeModel.TEXT:
+                    message_type = event.type
                 yield {
-                    "event": "message",
-                    "data": json.dumps({
+                    "event": event.type.value,
+                    "data": json_dumps({
                         "id": str(message_id),
-                        "chunk": chunk,
+                        key: result,
                     }),
                 }
 
@@ -184,10 +196,15 @@ async def send_message(
                 session_id=session_id,
                 role=MessageRoleModel.ASSISTANT,
                 content=full_response,
-                message_type=MessageTypeModel.TEXT,
+                message_type=message_type,
+                extra_data=extra_data or None,
             )
             db.add(assistant_message)
+            session.updated_at = func.now()
             await db.flush()
+            # The stream can outlive the request-scoped transaction, so commit here
+            await db.commit()
+            await coach.remember(user_id, [user_message, assistant_message])
 
             # Generate quick actions
             quick_actions = await coach.generate_quick_actions(user_id)
@@ -195,7 +212,7 @@ async def send_message(
             # Send completion event
             yield {
                 "event": "done",
-                "data": json.dumps({
+                "data": json_dumps({
                     "id": str(message_id),
                     "quickActions": quick_actions,
                 }),
@@ -204,7 +221,7 @@ async def send_message(
         except Exception as e:
             yield {
                 "event": "error",
-                "data": json.dumps({"error": str(e)}),
+                "data": json_dumps({"error": str(e)}),
             }
 
     return EventSourceResponse(generate())
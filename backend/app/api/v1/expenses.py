@@ -3,33 +3,43 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
-from app.api.deps import CurrentUserId, DbSession
+from app.api.deps import CurrentUserId, DbSession, ReadOnlyDbSession
+from app.api.responses import ResponseAdapter
+from app.api.routing import TimedAPIRoute
 from app.schemas.expense import (
+    CashFlowCalendar,
+    CategorySuggestion,
     ExpenseCategory,
     ExpenseCreate,
     ExpenseResponse,
+    ExpenseSuggestion,
     ExpenseSummary,
     ExpenseUpdate,
 )
+from app.services.categorizer import ExpenseCategorizer
 from app.services.expense_service import ExpenseService
+from app.services.recurring import RecurringProjectionService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
+
+expense_list = ResponseAdapter(list[ExpenseResponse])
 
 
 @router.get("/", response_model=list[ExpenseResponse])
 async def list_expenses(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     pot_id: UUID | None = Query(None, alias="potId"),
     category: ExpenseCategory | None = None,
     start_date: datetime | None = Query(None, alias="startDate"),
     end_date: datetime | None = Query(None, alias="endDate"),
     recurring: bool | None = None,
+    q: str | None = Query(None, max_length=100),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
-) -> list[ExpenseResponse]:
+) -> Response:
     """List expenses with optional filters."""
     service = ExpenseService(db)
     expenses = await service.list_for_user(
@@ -39,10 +49,11 @@ async def list_expenses(
         start_date=start_date,
         end_date=end_date,
         recurring=recurring,
+        q=q,
         limit=limit,
         offset=offset,
     )
-    return [ExpenseResponse.model_validate(expense) for expense in expenses]
+    return expense_list.response(expenses)
 
 
 @router.post("/", response_model=ExpenseResponse, status_code=201)
@@ -60,7 +71,7 @@ async def create_expense(
 @router.get("/summary", response_model=ExpenseSummary)
 async def get_expense_summary(
     user_id: CurrentUserId,
-    db: DbSession,
+    db: ReadOnlyDbSession,
     start_date: datetime = Query(..., alias="startDate"),
     end_date: datetime = Query(..., alias="endDate"),
 ) -> ExpenseSummary:
@@ -70,6 +81,40 @@ async def get_expense_summary(
     return summary
 
 
+@router.get("/upcoming", response_model=CashFlowCalendar)
+async def get_upcoming_expenses(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    months: int = Query(3, ge=1, le=12),
+) -> CashFlowCalendar:
+    """Project recurring expenses forward into a cash-flow calendar."""
+    service = RecurringProjectionService(db)
+    return await service.get_cash_flow(user_id, months)
+
+
+@router.get("/autocomplete", response_model=list[ExpenseSuggestion])
+async def autocomplete_expenses(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+) -> list[ExpenseSuggestion]:
+    """Suggest descriptions from recent expenses with their usual category and pot."""
+    service = ExpenseService(db)
+    return await service.autocomplete(user_id, q, limit)
+
+
+@router.get("/suggest", response_model=CategorySuggestion)
+async def suggest_expense_category(
+    user_id: CurrentUserId,
+    db: ReadOnlyDbSession,
+    description: str = Query(..., min_length=1, max_length=500),
+) -> CategorySuggestion:
+    """Suggest a category and pot for an expense description."""
+    service = ExpenseCategorizer(db)
+    return await service.suggest(user_id, description)
+
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: UUID,
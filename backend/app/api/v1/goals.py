@@ -2,9 +2,11 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from app.api.deps import CurrentUserId, DbSession
+from app.api.deps import CurrentUserId, DbSession, ReadOnlyDbSession
+from app.api.responses import ResponseAdapter
+from app.api.routing import TimedAPIRoute
 from app.schemas.goal import (
     GoalContribution,
     GoalCreate,
@@ -16,18 +18,20 @@ from app.schemas.goal import (
 )
 from app.services.goal_service import GoalService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
+
+goal_list = ResponseAdapter(list[GoalResponse])
 
 
 @router.get("/", response_model=list[GoalResponse])
 async def list_goals(
     user_id: CurrentUserId,
-    db: DbSession,
-) -> list[GoalResponse]:
+    db: ReadOnlyDbSession,
+) -> Response:
     """List all goals for the current user."""
     service = GoalService(db)
     goals = await service.list_for_user(user_id)
-    return [GoalResponse.model_validate(goal) for goal in goals]
+    return goal_list.response(goals)
 
 
 @router.post("/", response_model=GoalResponse, status_code=201)
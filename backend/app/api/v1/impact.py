@@ -4,12 +4,18 @@ from uuid import UUID
 
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
+from sse_starlette.sse import EventSourceResponse
 
+from app.ai.coach import AICoach
+from app.ai.prompts import IMPACT_ANALYSIS_PROMPT, TRADE_OFF_PROMPT
+from app.ai.structured_outputs import ImpactAnalysisOutput, TradeOffAnalysisOutput
 from app.api.deps import CurrentUserId, DbSession
+from app.api.routing import TimedAPIRoute
+from app.api.streaming import structured_output_events
 from app.schemas.chat import ImpactAnalysis, TradeOff
-from app.services.impact_service import ImpactService
+from app.services.impact_service import ImpactService, PurchaseScenario
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
 
 
 class ImpactAnalyzeRequest(BaseModel):
@@ -22,6 +28,12 @@ class ImpactAnalyzeRequest(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class ImpactBatchRequest(BaseModel):
+    """Request schema for analyzing several candidate purchases."""
+
+    scenarios: list[ImpactAnalyzeRequest] = Field(..., min_length=1, max_length=20)
+
+
 class TradeOffRequest(BaseModel):
     """Request schema for trade-off generation."""
 
@@ -45,6 +57,27 @@ async def analyze_impact(
     )
 
 
+@router.post("/analyze-batch", response_model=list[ImpactAnalysis])
+async def analyze_impact_batch(
+    data: ImpactBatchRequest,
+    user_id: CurrentUserId,
+    db: DbSession,
+) -> list[ImpactAnalysis]:
+    """Analyze several candidate purchases at once, in request order."""
+    service = ImpactService(db)
+    return await service.analyze_purchases(
+        user_id,
+        [
+            PurchaseScenario(
+                amount=scenario.amount,
+                pot_id=scenario.pot_id,
+                description=scenario.description,
+            )
+            for scenario in data.scenarios
+        ],
+    )
+
+
 @router.post("/trade-off", response_model=TradeOff)
 async def get_trade_offs(
     data: TradeOffRequest,
@@ -58,3 +91,39 @@ async def get_trade_offs(
         amount=data.amount,
         description=data.description,
     )
+
+
+@router.post("/analyze/stream")
+async def stream_impact_analysis(
+    data: ImpactAnalyzeRequest,
+    user_id: CurrentUserId,
+    db: DbSession,
+):
+    """Stream an AI-written impact analysis, emitting each section as it completes."""
+    coach = AICoach(db)
+    outputs = coach.generate_structured(
+        user_id,
+        ImpactAnalysisOutput,
+        IMPACT_ANALYSIS_PROMPT,
+        action=data.description,
+        amount=data.amount,
+    )
+    return EventSourceResponse(structured_output_events(outputs))
+
+
+@router.post("/trade-off/stream")
+async def stream_trade_offs(
+    data: TradeOffRequest,
+    user_id: CurrentUserId,
+    db: DbSession,
+):
+    """Stream AI-generated trade-off options, emitting each option as it completes."""
+    coach = AICoach(db)
+    outputs = coach.generate_structured(
+        user_id,
+        TradeOffAnalysisOutput,
+        TRADE_OFF_PROMPT,
+        description=data.description,
+        amount=data.amount,
+    )
+    return EventSourceResponse(structured_output_events(outputs))
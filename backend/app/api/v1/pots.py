@@ -2,24 +2,28 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from app.api.deps import CurrentUserId, DbSession
+from app.api.deps import CurrentUserId, DbSession, ReadOnlyDbSession
+from app.api.responses import ResponseAdapter
+from app.api.routing import TimedAPIRoute
 from app.schemas.pot import PotCreate, PotResponse, PotTransfer, PotUpdate
 from app.services.pot_service import PotService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
+
+pot_list = ResponseAdapter(list[PotResponse])
 
 
 @router.get("/", response_model=list[PotResponse])
 async def list_pots(
     user_id: CurrentUserId,
-    db: DbSession,
-) -> list[PotResponse]:
+    db: ReadOnlyDbSession,
+) -> Response:
     """List all pots for the current user."""
     service = PotService(db)
     pots = await service.list_for_user(user_id)
-    return [PotResponse.model_validate(pot) for pot in pots]
+    return pot_list.response(pots)
 
 
 @router.post("/", response_model=PotResponse, status_code=201)
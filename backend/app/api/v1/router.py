@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import analytics, chat, expenses, goals, impact, pots, users
+from app.api.v1 import analytics, batch, chat, expenses, goals, impact, pots, users
 
 api_router = APIRouter()
 
@@ -13,3 +13,4 @@ api_router.include_router(expenses.router, prefix="/expenses", tags=["expenses"]
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
 api_router.include_router(impact.router, prefix="/impact", tags=["impact"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
@@ -3,13 +3,16 @@
 from fastapi import APIRouter, Depends
 
 from app.api.deps import CurrentOrNewUser, DbSession
+from app.api.routing import TimedAPIRoute
+from app.db.read_only import allow_writes
 from app.schemas.user import OnboardingData, UserResponse, UserUpdate
 from app.services.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
 
 
 @router.get("/me", response_model=UserResponse)
+@allow_writes
 async def get_current_user(
     user: CurrentOrNewUser,
 ) -> UserResponse:
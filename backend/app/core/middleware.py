@@ -1,33 +1,164 @@
 """Custom middleware."""
 
-import time
 import logging
-from collections.abc import Awaitable, Callable
+import math
+import time
+from http.cookies import SimpleCookie
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_REQUESTS_TOTAL,
+    HTTP_RESPONSE_SIZE,
+)
+from app.db.instrumentation import RequestTimings, pop_timings, push_timings
+from app.db.replica import ReadYourWritesGuard, pop_request_writes, push_request_writes
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def route_template(scope: Scope) -> str:
+    """Get the matched route's path template, keeping metric labels bounded."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware that records request metrics and logs each request.
+
+    Unlike `BaseHTTPMiddleware`, it forwards response messages as they are sent
+    instead of re-streaming the body, so SSE responses are not buffered or
+    delayed. Latency covers the full response body, including streams.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.6f}")
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            process_time = time.perf_counter() - start_time
+            route = route_template(scope)
+
+            HTTP_REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(process_time)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(response_size)
+
+            logger.info(
+                f"{method} {scope['path']} "
+                f"completed in {process_time:.3f}s "
+                f"with status {status_code}"
+            )
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware that reports per-request DB, LLM and serialize time.
+
+    Adds a `Server-Timing` header and logs requests whose query count or
+    database time exceed the configured thresholds. For streaming responses
+    the header only covers work done before the first byte; the log line
+    covers the whole response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if timings.handler_end is not None:
+                    timings.add_phase("serialize", time.perf_counter() - timings.handler_end)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing_header())
+            await send(message)
+
+        token = push_timings(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            pop_timings(token)
+            db_ms = timings.db_time * 1000
+            if (
+                timings.query_count > settings.slow_request_query_count
+                or db_ms > settings.slow_request_db_ms
+            ):
+                logger.warning(
+                    f"{scope['method']} {route_template(scope)} issued "
+                    f"{timings.query_count} queries taking {db_ms:.1f}ms"
+                )
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware that sets the read-your-writes cookie after a write.
 
+    Writes are flushed before a response starts and committed as it is
+    sent, so the cookie is set on the response of any request whose user
+    flushed a write.
+    """
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log request details."""
+    def __init__(self, app: ASGIApp, guard: ReadYourWritesGuard):
+        self.app = app
+        self.guard = guard
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        start_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        writes, token = push_request_writes()
 
-        process_time = time.time() - start_time
-        logger.info(
-            f"{request.method} {request.url.path} "
-            f"completed in {process_time:.3f}s "
-            f"with status {response.status_code}"
-        )
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and writes.wrote
+                and writes.user_id is not None
+            ):
+                cookie: SimpleCookie = SimpleCookie()
+                name = self.guard.cookie_name
+                cookie[name] = self.guard.cookie_value(writes.user_id)
+                cookie[name]["path"] = settings.api_v1_prefix
+                cookie[name]["max-age"] = math.ceil(self.guard.window)
+                cookie[name]["httponly"] = True
+                cookie[name]["samesite"] = "lax"
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", cookie.output(header="").strip())
+            await send(message)
 
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            pop_request_writes(token)
@@ -0,0 +1,23 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import uuid
+from datetime import datetime
+
+from app.core.exceptions import ValidationException
+
+
+def encode_cursor(position: datetime, id: uuid.UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = f"{position.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        position, id = raw.split("|")
+        return datetime.fromisoformat(position), uuid.UUID(id)
+    except ValueError as e:
+        raise ValidationException("Invalid cursor") from e
@@ -1,5 +1,21 @@
 """Database module."""
 
-from app.db.session import AsyncSessionLocal, engine, get_db
+from app.db.session import (
+    AsyncSessionLocal,
+    ReadOnlySessionLocal,
+    ReadSessionLocal,
+    engine,
+    get_db,
+    read_your_writes,
+    replica_engine,
+)
 
-__all__ = ["AsyncSessionLocal", "engine", "get_db"]
+__all__ = [
+    "AsyncSessionLocal",
+    "ReadOnlySessionLocal",
+    "ReadSessionLocal",
+    "engine",
+    "get_db",
+    "read_your_writes",
+    "replica_engine",
+]
@@ -0,0 +1,127 @@
+"""Concurrent fan-out of independent read queries.
+
+An `AsyncSession` runs one statement at a time, so independent queries
+awaited back to back each pay a full round trip. `fan_out` runs them on
+separately checked-out read-only connections instead, at most
+`db_fanout_concurrency` at once per call.
+
+With `snapshot=True` the connections share one exported snapshot, so the
+results are consistent with each other as if they came from a single
+REPEATABLE READ transaction.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import Executable, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.session import ReadOnlySessionLocal
+
+settings = get_settings()
+
+Query = Callable[[AsyncSession], Awaitable[Any]]
+
+_REPEATABLE_READ = {"isolation_level": "REPEATABLE READ"}
+
+
+def rows(statement: Executable) -> Query:
+    """Query returning all result rows of a statement."""
+
+    async def run(db: AsyncSession) -> list[Any]:
+        return list((await db.execute(statement)).all())
+
+    return run
+
+
+def scalars(statement: Executable) -> Query:
+    """Query returning the first column of every result row."""
+
+    async def run(db: AsyncSession) -> list[Any]:
+        return list((await db.scalars(statement)).all())
+
+    return run
+
+
+def scalar(statement: Executable) -> Query:
+    """Query returning the first column of the only result row."""
+
+    async def run(db: AsyncSession) -> Any:
+        return (await db.execute(statement)).scalar_one()
+
+    return run
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Whether a session holds writes other connections cannot see yet."""
+    return bool(session.info.get("has_writes") or session.new or session.dirty or session.deleted)
+
+
+def _fork(session: AsyncSession) -> AsyncSession:
+    """A new read-only session on the same database as `session`.
+
+    Read-only sessions are forked onto their own engine, so reads routed to
+    the replica stay there; others use the primary.
+    """
+    if session.info.get("read_only"):
+        return AsyncSession(
+            bind=session.bind,
+            expire_on_commit=False,
+            autoflush=False,
+            info={"read_only": True},
+        )
+    return ReadOnlySessionLocal()
+
+
+async def fan_out(
+    session: AsyncSession,
+    *queries: Query,
+    snapshot: bool = False,
+    reads_own_writes: bool = True,
+    concurrency: int | None = None,
+) -> list[Any]:
+    """Run independent queries concurrently and return their results in order.
+
+    Each query is called with its own session, which is closed once all
+    queries finish, so returned ORM objects are detached: only attributes
+    already loaded may be used.
+
+    Queries run in order on `session` itself when concurrency is 1, or when
+    the session has uncommitted writes that other connections could not
+    see. Pass `reads_own_writes=False` when none of the queries read rows
+    the current transaction may have written.
+    """
+    limit = settings.db_fanout_concurrency if concurrency is None else concurrency
+    if (
+        len(queries) < 2
+        or limit < 2
+        or (reads_own_writes and has_pending_writes(session))
+    ):
+        return [await query(session) for query in queries]
+
+    # The leader holds a slot for the whole call when it exports a snapshot
+    slots = asyncio.Semaphore(limit - 1 if snapshot else limit)
+
+    async def run(query: Query, snapshot_id: str | None) -> Any:
+        async with slots, _fork(session) as worker:
+            if snapshot_id is not None:
+                await worker.connection(execution_options=_REPEATABLE_READ)
+                await worker.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+            return await query(worker)
+
+    if not snapshot:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run(query, None)) for query in queries]
+        return [task.result() for task in tasks]
+
+    # The exporting transaction must stay open until every worker has
+    # imported its snapshot; it runs the first query meanwhile
+    async with _fork(session) as leader:
+        await leader.connection(execution_options=_REPEATABLE_READ)
+        snapshot_id = await leader.scalar(text("SELECT pg_export_snapshot()"))
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run(query, snapshot_id)) for query in queries[1:]]
+            first = await queries[0](leader)
+        return [first, *(task.result() for task in tasks)]
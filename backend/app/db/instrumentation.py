@@ -0,0 +1,125 @@
+"""Per-request SQL and phase timing instrumentation."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_QUERY_START_KEY = "query_start_times"
+
+
+@dataclass
+class RequestTimings:
+    """Query counts and phase durations collected while handling a request."""
+
+    query_count: int = 0
+    db_time: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    handler_end: float | None = None
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """Add time spent in a named phase."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing_header(self) -> str:
+        """Format the timings as a `Server-Timing` header value."""
+        metrics = [f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"']
+        metrics.extend(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()
+        )
+        return ", ".join(metrics)
+
+
+# Every active collector receives each query, so nested collectors
+# (e.g. a test budget around a request) all see the same statements.
+_active_timings: ContextVar[tuple[RequestTimings, ...]] = ContextVar(
+    "active_timings", default=()
+)
+
+
+def push_timings(timings: RequestTimings) -> Token:
+    """Start collecting into `timings` in the current context."""
+    return _active_timings.set((*_active_timings.get(), timings))
+
+
+def pop_timings(token: Token) -> None:
+    """Stop collecting into the timings pushed with `token`."""
+    _active_timings.reset(token)
+
+
+def current_timings() -> RequestTimings | None:
+    """Get the innermost active collector, if any."""
+    active = _active_timings.get()
+    return active[-1] if active else None
+
+
+def add_phase_time(name: str, seconds: float) -> None:
+    """Record time spent in a phase on all active collectors."""
+    for timings in _active_timings.get():
+        timings.add_phase(name, seconds)
+
+
+def mark_handler_end() -> None:
+    """Record that the endpoint function has returned."""
+    now = time.perf_counter()
+    for timings in _active_timings.get():
+        timings.handler_end = now
+
+
+@contextmanager
+def track_phase(name: str) -> Iterator[None]:
+    """Measure the wall time of a block as a named phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase_time(name, time.perf_counter() - start)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block issues more queries than its budget allows."""
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[RequestTimings]:
+    """Fail if the block issues more than `max_queries` SQL statements.
+
+    Intended for tests guarding against N+1 regressions, e.g. wrapping an
+    ASGI client call to an endpoint.
+    """
+    timings = RequestTimings()
+    token = push_timings(timings)
+    try:
+        yield timings
+    finally:
+        pop_timings(token)
+    if timings.query_count > max_queries:
+        raise QueryBudgetExceeded(
+            f"Expected at most {max_queries} queries, got {timings.query_count}"
+        )
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """Count statements and their execution time on an engine."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info[_QUERY_START_KEY].pop()
+        for timings in _active_timings.get():
+            timings.query_count += 1
+            timings.db_time += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(_QUERY_START_KEY):
+            connection.info[_QUERY_START_KEY].pop()
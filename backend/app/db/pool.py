@@ -0,0 +1,77 @@
+"""Connection pool configuration and metrics."""
+
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.config import Settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits.
+
+    The pool's logging name is used as the metrics label. It survives
+    `recreate()`, so the label stays stable across `engine.dispose()`.
+    """
+
+    @property
+    def metrics_label(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=self.metrics_label).observe(
+                time.perf_counter() - start
+            )
+
+
+def _prepared_statement_name() -> str:
+    """Unique statement names, so pgbouncer never routes a name to the wrong server."""
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(settings: Settings, name: str) -> dict[str, Any]:
+    """Keyword arguments for `create_async_engine` built from the pool settings."""
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.db_pgbouncer:
+        # Transaction pooling hands each transaction to any server connection,
+        # so neither asyncpg's nor SQLAlchemy's statement caches can be used.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    return options
+
+
+def register_pool_metrics(engine: AsyncEngine, name: str) -> None:
+    """Publish live pool occupancy gauges for an engine."""
+    # Read engine.pool on every scrape, as dispose() swaps in a new pool
+    DB_POOL_SIZE.labels(pool=name).set_function(lambda: engine.pool.size())
+    DB_POOL_CHECKED_OUT.labels(pool=name).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool=name).set_function(lambda: engine.pool.overflow())
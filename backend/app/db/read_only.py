@@ -0,0 +1,72 @@
+"""Read-only transactions for requests that should not write."""
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+EndpointT = TypeVar("EndpointT", bound=Callable[..., Any])
+
+# HTTP methods whose requests get a read-only session by default
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_WRITES_ALLOWED = "__allows_writes__"
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Raised when a read-only session is asked to write."""
+
+
+def allow_writes(endpoint: EndpointT) -> EndpointT:
+    """Mark a safe-method endpoint that legitimately writes, e.g. get-or-create."""
+    setattr(endpoint, _WRITES_ALLOWED, True)
+    return endpoint
+
+
+def endpoint_allows_writes(endpoint: Callable[..., Any] | None) -> bool:
+    """Whether an endpoint was marked with `allow_writes`."""
+    return bool(getattr(endpoint, _WRITES_ALLOWED, False))
+
+
+def read_only_engine(engine: AsyncEngine, deferrable: bool = False) -> AsyncEngine:
+    """A view of an engine whose transactions begin as READ ONLY.
+
+    DEFERRABLE only has an effect in SERIALIZABLE transactions, where it
+    waits for a snapshot that cannot conflict and then runs without
+    serialization checks. Hot standbys reject SERIALIZABLE, so only use it
+    against the primary.
+    """
+    options: dict[str, Any] = {"postgresql_readonly": True}
+    if deferrable:
+        options.update(isolation_level="SERIALIZABLE", postgresql_deferrable=True)
+    return engine.execution_options(**options)
+
+
+def _reject_flush(session: Session, flush_context: UOWTransaction, instances: Any) -> None:
+    if session.info.get("read_only"):
+        raise ReadOnlySessionError("Flush attempted in a read-only session")
+
+
+def _reject_dml(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.session.info.get("read_only"):
+        return
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise ReadOnlySessionError("Write statement executed in a read-only session")
+
+
+def install_read_only_guard() -> None:
+    """Raise on ORM flushes and DML statements in sessions marked read-only."""
+    event.listen(Session, "before_flush", _reject_flush)
+    event.listen(Session, "do_orm_execute", _reject_dml)
+
+
+def assert_no_pending_writes(session: AsyncSession) -> None:
+    """Raise if a read-only session holds changes that would be silently dropped."""
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    if session.new or session.deleted or modified:
+        raise ReadOnlySessionError(
+            f"Read-only session ended with unsaved changes: {len(session.new)} new, "
+            f"{len(modified)} modified, {len(session.deleted)} deleted"
+        )
@@ -0,0 +1,133 @@
+"""Read replica routing with a read-your-writes window."""
+
+import hashlib
+import hmac
+import time
+import uuid
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+# User the current request acts for, so commits can be attributed to them
+_request_user: ContextVar[uuid.UUID | None] = ContextVar("request_user", default=None)
+
+
+@dataclass
+class RequestWrites:
+    """Whether the current request flushed writes, for its response to report."""
+
+    user_id: uuid.UUID | None = None
+    wrote: bool = False
+
+
+_request_writes: ContextVar[RequestWrites | None] = ContextVar("request_writes", default=None)
+
+
+def push_request_writes() -> tuple[RequestWrites, Token]:
+    """Track writes in the current context, sharing an enclosing request's tracker.
+
+    Batch sub-requests therefore mark the batch request itself.
+    """
+    writes = _request_writes.get() or RequestWrites()
+    return writes, _request_writes.set(writes)
+
+
+def pop_request_writes(token: Token) -> None:
+    """Stop tracking writes pushed with `token`."""
+    _request_writes.reset(token)
+
+
+def bind_request_user(user_id: uuid.UUID) -> None:
+    """Attribute database writes made by the current request to a user."""
+    _request_user.set(user_id)
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.user_id = user_id
+
+
+class ReadYourWritesGuard:
+    """Pins users to the primary for a short window after they write.
+
+    Replica lag means a read routed to the replica right after a write may
+    not see it. The window should comfortably exceed typical lag. Writes are
+    remembered in process and, so that any worker can honour them, in a
+    signed cookie naming the user and write time that clients send back.
+    """
+
+    cookie_name = "last_write"
+
+    def __init__(self, window: float, secret: str, max_users: int = 10_000):
+        self.window = window
+        self.max_users = max_users
+        self._secret = secret.encode()
+        self._last_write: dict[uuid.UUID, float] = {}
+
+    def _sign(self, payload: str) -> str:
+        return hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+
+    def cookie_value(self, user_id: uuid.UUID) -> str:
+        """Cookie value recording that a user wrote just now."""
+        payload = f"{user_id}.{time.time():.3f}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def cookie_pins(self, user_id: uuid.UUID, value: str | None) -> bool:
+        """Whether a cookie from `cookie_value` still pins the user to the primary."""
+        payload, _, signature = (value or "").rpartition(".")
+        cookie_user, _, written_at = payload.partition(".")
+        if cookie_user != str(user_id) or not hmac.compare_digest(signature, self._sign(payload)):
+            return False
+        try:
+            age = time.time() - float(written_at)
+        except ValueError:
+            return False
+        # Allow for clock skew between workers, but not far-future write times
+        return -self.window < age < self.window
+
+    def record_write(self, user_id: uuid.UUID) -> None:
+        """Note that a user has just committed a write."""
+        now = time.monotonic()
+        if len(self._last_write) >= self.max_users:
+            self._last_write = {
+                user: at for user, at in self._last_write.items() if now - at < self.window
+            }
+        self._last_write[user_id] = now
+
+    def is_pinned(self, user_id: uuid.UUID) -> bool:
+        """Whether the user's reads should still go to the primary."""
+        written_at = self._last_write.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+
+def _mark_writes(session: Session) -> None:
+    session.info["has_writes"] = True
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.wrote = True
+
+
+def _mark_flush(session: Session, flush_context: UOWTransaction) -> None:
+    _mark_writes(session)
+
+
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_writes(orm_execute_state.session)
+
+
+def install_write_tracking(guard: ReadYourWritesGuard) -> None:
+    """Record committed writes made on behalf of a request user in the guard."""
+
+    def record_commit(session: Session) -> None:
+        user_id = _request_user.get()
+        if session.info.pop("has_writes", False) and user_id is not None:
+            guard.record_write(user_id)
+
+    def clear(session: Session) -> None:
+        session.info.pop("has_writes", None)
+
+    event.listen(Session, "after_flush", _mark_flush)
+    event.listen(Session, "do_orm_execute", _mark_dml)
+    event.listen(Session, "after_commit", record_commit)
+    event.listen(Session, "after_rollback", clear)
@@ -2,9 +2,20 @@
 
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
+from app.db.instrumentation import install_query_hooks
+from app.db.pool import engine_options, register_pool_metrics
+from app.db.read_only import (
+    READ_ONLY_METHODS,
+    assert_no_pending_writes,
+    endpoint_allows_writes,
+    install_read_only_guard,
+    read_only_engine,
+)
+from app.db.replica import ReadYourWritesGuard, install_write_tracking
 
 settings = get_settings()
 
@@ -12,7 +23,10 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    **engine_options(settings, name="primary"),
 )
+install_query_hooks(engine)
+register_pool_metrics(engine, name="primary")
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -22,9 +36,66 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Sessions for safe-method requests: READ ONLY transactions, never committed
+ReadOnlySessionLocal = async_sessionmaker(
+    read_only_engine(engine, deferrable=settings.db_read_deferrable),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+# Read-only traffic goes to the replica when one is configured
+if settings.database_replica_url:
+    replica_engine = create_async_engine(
+        settings.database_replica_url,
+        echo=settings.debug,
+        future=True,
+        **engine_options(settings, name="replica"),
+    )
+    install_query_hooks(replica_engine)
+    register_pool_metrics(replica_engine, name="replica")
+else:
+    replica_engine = engine
+
+ReadSessionLocal = async_sessionmaker(
+    read_only_engine(replica_engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+read_your_writes = ReadYourWritesGuard(
+    settings.read_your_writes_seconds, settings.read_your_writes_secret
+)
+install_write_tracking(read_your_writes)
+install_read_only_guard()
+
+
+def is_read_only_request(request: Request) -> bool:
+    """Whether a request should run in a read-only transaction."""
+    if request.method not in READ_ONLY_METHODS:
+        return False
+    route = request.scope.get("route")
+    return not endpoint_allows_writes(getattr(route, "endpoint", None))
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides an async database session.
+
+    Safe-method requests get a READ ONLY transaction that is rolled back
+    rather than flushed and committed; endpoints that need to write on
+    GET are marked with `allow_writes`.
+    """
+    if is_read_only_request(request):
+        async with ReadOnlySessionLocal() as session:
+            yield session
+            assert_no_pending_writes(session)
+        return
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that provides an async database session."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
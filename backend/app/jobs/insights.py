@@ -0,0 +1,92 @@
+"""Batch job that precomputes insights for every user.
+
+Run with:
+
+    python -m app.jobs.insights
+"""
+
+import argparse
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+from app.services.insights import InsightService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def _refresh_batch(
+    user_ids: list[uuid.UUID],
+    semaphore: asyncio.Semaphore,
+) -> int | None:
+    """Recompute insights for one batch of users in its own transaction.
+
+    Returns the number of insights stored, or None if the batch failed. A
+    failure is logged rather than raised, so it does not cancel the other
+    batches; its users are refreshed again on the next run.
+    """
+    async with semaphore:
+        try:
+            async with AsyncSessionLocal() as session:
+                count = await InsightService(session).refresh(user_ids)
+                await session.commit()
+                return count
+        except Exception:
+            logger.exception(
+                f"Failed to refresh insights for {len(user_ids)} users "
+                f"from {user_ids[0]} to {user_ids[-1]}"
+            )
+            return None
+
+
+async def refresh_all_insights(
+    batch_size: int = settings.insights_batch_size,
+    concurrency: int = settings.insights_batch_concurrency,
+) -> int:
+    """Recompute insights for all users, in batches ordered by user id.
+
+    Returns the number of insights stored. Raises only if every batch fails.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: list[asyncio.Task[int | None]] = []
+    users = 0
+
+    async with asyncio.TaskGroup() as group, AsyncSessionLocal() as session:
+        last_id: uuid.UUID | None = None
+        while True:
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            user_ids = list((await session.scalars(query)).all())
+            if not user_ids:
+                break
+
+            tasks.append(group.create_task(_refresh_batch(user_ids, semaphore)))
+            users += len(user_ids)
+            last_id = user_ids[-1]
+
+    results = [task.result() for task in tasks]
+    stored = sum(count for count in results if count is not None)
+    failed = results.count(None)
+    if failed and failed == len(results):
+        raise RuntimeError(f"All {failed} insight batches failed")
+    logger.info(
+        f"Refreshed {stored} insights for {users} users"
+        + (f"; {failed} of {len(results)} batches failed" if failed else "")
+    )
+    return stored
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.insights_batch_size)
+    parser.add_argument("--concurrency", type=int, default=settings.insights_batch_concurrency)
+    args = parser.parse_args()
+    asyncio.run(refresh_all_insights(args.batch_size, args.concurrency))
@@ -0,0 +1,236 @@
+"""Durable job queue on the `jobs` table.
+
+Jobs are enqueued in the caller's transaction, so they only become visible
+if the write that produced them commits. Workers claim jobs with
+`FOR UPDATE SKIP LOCKED`, so concurrent consumers never block on or
+double-claim the same row.
+"""
+
+import logging
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JobHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+# Handlers by job kind, registered with `register`
+HANDLERS: dict[str, JobHandler] = {}
+
+# Seconds between runs of periodic job kinds, registered with `register`
+SCHEDULES: dict[str, float] = {}
+
+
+def register(kind: str, every: float | None = None) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine as the handler for a job kind.
+
+    Handlers receive a session and the job payload. Their writes commit
+    together with the job's removal from the queue.
+
+    With `every`, the job kind also runs periodically: workers queue a run
+    when they start, and each run queues the next one `every` seconds after
+    it settles.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        HANDLERS[kind] = handler
+        if every:
+            SCHEDULES[kind] = every
+        return handler
+
+    return decorator
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a job that has failed `attempts` times.
+
+    Doubles per attempt up to the configured maximum, with jitter so jobs
+    that failed together don't retry together.
+    """
+    delay = min(settings.job_backoff_base * 2 ** (attempts - 1), settings.job_backoff_max)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+@dataclass
+class ClaimedJob:
+    """A job claimed by a consumer."""
+
+    id: uuid.UUID
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    worker_id: str
+
+
+class JobQueue:
+    """Enqueues, claims and settles background jobs."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        priority: int = 0,
+        delay: float = 0.0,
+        max_attempts: int | None = None,
+        dedupe_key: str | None = None,
+    ) -> None:
+        """Add a job to the queue.
+
+        Higher priorities are claimed first. A job with a `dedupe_key` is
+        dropped while another queued job has the same key.
+        """
+        statement = insert(Job).values(
+            id=uuid.uuid4(),
+            kind=kind,
+            payload=payload or {},
+            status=JobStatus.QUEUED,
+            priority=priority,
+            dedupe_key=dedupe_key,
+            attempts=0,
+            max_attempts=max_attempts or settings.job_max_attempts,
+            run_at=func.now() + timedelta(seconds=delay),
+        )
+        if dedupe_key is not None:
+            # The predicate must be a literal to match the partial unique
+            # index; a bound parameter stops matching once Postgres switches
+            # the prepared statement to a generic plan
+            statement = statement.on_conflict_do_nothing(
+                index_elements=[Job.dedupe_key],
+                index_where=text("status = 'queued'"),
+            )
+        await self.db.execute(statement)
+
+    async def claim(self, worker_id: str) -> ClaimedJob | None:
+        """Claim the next due job, or return None when none is due."""
+        candidate = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+            .order_by(Job.priority.desc(), Job.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.id == candidate)
+            .values(
+                status=JobStatus.RUNNING,
+                locked_at=func.now(),
+                locked_by=worker_id,
+                attempts=Job.attempts + 1,
+            )
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return ClaimedJob(
+            id=row.id,
+            kind=row.kind,
+            payload=row.payload,
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+            worker_id=worker_id,
+        )
+
+    async def heartbeat(self, job: ClaimedJob) -> bool:
+        """Refresh the lock on a running job so it is not presumed abandoned.
+
+        Returns False if the job is no longer locked by its consumer.
+        """
+        result = await self.db.execute(
+            update(Job)
+            .where(
+                Job.id == job.id,
+                Job.status == JobStatus.RUNNING,
+                Job.locked_by == job.worker_id,
+            )
+            .values(locked_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    async def schedule(self, kind: str, delay: float = 0.0) -> None:
+        """Queue a run of a periodic job kind, unless one is already queued."""
+        await self.enqueue(kind, delay=delay, dedupe_key=f"schedule:{kind}")
+
+    async def complete(self, job: ClaimedJob) -> None:
+        """Remove a job that succeeded, queueing the next run of periodic jobs."""
+        await self.db.execute(delete(Job).where(Job.id == job.id))
+        if job.kind in SCHEDULES:
+            await self.schedule(job.kind, delay=SCHEDULES[job.kind])
+
+    async def fail(self, job: ClaimedJob, error: str) -> None:
+        """Schedule a retry with backoff, or mark the job failed when out of attempts.
+
+        Retries drop their dedupe key so they never collide with a newer
+        queued job for the same work.
+        """
+        if job.attempts < job.max_attempts:
+            delay = backoff_delay(job.attempts)
+            values = {
+                "status": JobStatus.QUEUED,
+                "run_at": func.now() + timedelta(seconds=delay),
+                "dedupe_key": None,
+            }
+            logger.warning(
+                f"Job {job.kind} {job.id} failed (attempt {job.attempts}), "
+                f"retrying in {delay:.0f}s: {error}"
+            )
+        else:
+            values = {"status": JobStatus.FAILED}
+            logger.error(f"Job {job.kind} {job.id} failed after {job.attempts} attempts: {error}")
+            # A failed run must not end the schedule
+            if job.kind in SCHEDULES:
+                await self.schedule(job.kind, delay=SCHEDULES[job.kind])
+
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(locked_at=None, locked_by=None, last_error=error, **values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def requeue_abandoned(self) -> int:
+        """Requeue running jobs whose worker stopped without settling them.
+
+        Consumers refresh the lock of a job while it runs, so only jobs
+        without a heartbeat for `job_lock_timeout` seconds are requeued,
+        however long they legitimately take.
+
+        Returns the number of jobs requeued.
+        """
+        result = await self.db.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.RUNNING,
+                Job.locked_at < func.now() - timedelta(seconds=settings.job_lock_timeout),
+            )
+            .values(
+                status=JobStatus.QUEUED,
+                run_at=func.now(),
+                locked_at=None,
+                locked_by=None,
+                dedupe_key=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
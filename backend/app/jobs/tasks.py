@@ -0,0 +1,32 @@
+"""Background job handlers."""
+
+import uuid
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.retrieval import ChatMemory
+from app.config import get_settings
+from app.jobs.insights import refresh_all_insights
+from app.jobs.queue import register
+from app.services.insights import InsightService
+
+settings = get_settings()
+
+
+@register("insights.refresh")
+async def refresh_user_insights(db: AsyncSession, payload: dict[str, Any]) -> None:
+    """Recompute one user's precomputed insights."""
+    await InsightService(db).refresh([uuid.UUID(payload["user_id"])])
+
+
+@register("insights.refresh_all", every=settings.insights_refresh_interval)
+async def refresh_insights_for_all_users(db: AsyncSession, payload: dict[str, Any]) -> None:
+    """Recompute insights for every user, in batches with their own sessions."""
+    await refresh_all_insights()
+
+
+@register("chat_memory.backfill")
+async def backfill_chat_memory(db: AsyncSession, payload: dict[str, Any]) -> None:
+    """Index a user's past chat messages into long-term memory."""
+    await ChatMemory(db).backfill(uuid.UUID(payload["user_id"]))
@@ -0,0 +1,151 @@
+"""Worker process that runs queued background jobs.
+
+Run with:
+
+    python -m app.jobs.worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.jobs import tasks  # noqa: F401  (registers job handlers)
+from app.jobs.queue import HANDLERS, SCHEDULES, ClaimedJob, JobQueue
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class Worker:
+    """Runs a number of asyncio consumers that claim and execute jobs."""
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; jobs already running are allowed to finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Run consumers until stopped."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        logger.info(f"Worker {self.name} starting {self.concurrency} consumers")
+        await self._schedule_periodic()
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._recover())
+            for index in range(self.concurrency):
+                group.create_task(self._consume(f"{self.name}:{index}"))
+        logger.info(f"Worker {self.name} stopped")
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early when the worker is stopped."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except TimeoutError:
+            pass
+
+    async def _schedule_periodic(self) -> None:
+        """Queue a run of each periodic job kind that has none queued."""
+        try:
+            async with AsyncSessionLocal() as session:
+                queue = JobQueue(session)
+                for kind in SCHEDULES:
+                    await queue.schedule(kind)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Failed to schedule periodic jobs: {e}")
+
+    async def _consume(self, consumer_id: str) -> None:
+        """Claim and execute jobs one at a time."""
+        while not self._stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as session:
+                    job = await JobQueue(session).claim(consumer_id)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Consumer {consumer_id} failed to claim a job: {e}")
+                await self._sleep(self.poll_interval)
+                continue
+
+            if job is None:
+                await self._sleep(self.poll_interval)
+                continue
+            await self._execute(job)
+
+    async def _heartbeat(self, job: ClaimedJob) -> None:
+        """Keep refreshing a running job's lock until cancelled."""
+        while True:
+            await asyncio.sleep(settings.job_heartbeat_interval)
+            try:
+                async with AsyncSessionLocal() as session:
+                    locked = await JobQueue(session).heartbeat(job)
+                    await session.commit()
+                if not locked:
+                    logger.warning(f"Job {job.kind} {job.id} lost its lock while running")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to refresh the lock of job {job.id}: {e}")
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        """Run a job's handler and settle the job in the same transaction."""
+        handler = HANDLERS.get(job.kind)
+        start = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            async with AsyncSessionLocal() as session:
+                await handler(session, job.payload)
+                await JobQueue(session).complete(job)
+                await session.commit()
+        except Exception as e:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await JobQueue(session).fail(job, f"{type(e).__name__}: {e}")
+                    await session.commit()
+            except Exception as settle_error:
+                # Left running; requeued once its lock times out
+                logger.error(f"Failed to record failure of job {job.id}: {settle_error}")
+            return
+        finally:
+            heartbeat.cancel()
+
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(f"Job {job.kind} {job.id} done in {elapsed:.0f}ms")
+
+    async def _recover(self) -> None:
+        """Periodically requeue jobs abandoned by crashed workers."""
+        while not self._stopping.is_set():
+            try:
+                async with AsyncSessionLocal() as session:
+                    requeued = await JobQueue(session).requeue_abandoned()
+                    await session.commit()
+                if requeued:
+                    logger.warning(f"Requeued {requeued} abandoned jobs")
+            except Exception as e:
+                logger.error(f"Failed to requeue abandoned jobs: {e}")
+            await self._sleep(settings.job_lock_timeout / 2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=settings.job_worker_concurrency)
+    parser.add_argument("--poll-interval", type=float, default=settings.job_poll_interval)
+    args = parser.parse_args()
+    asyncio.run(Worker(args.concurrency, args.poll_interval).run())
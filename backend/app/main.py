@@ -3,12 +3,19 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import get_settings
-from app.core.middleware import RequestLoggingMiddleware
+from app.core.metrics import metrics_response
+from app.core.middleware import (
+    ReadYourWritesMiddleware,
+    RequestMetricsMiddleware,
+    ServerTimingMiddleware,
+)
+from app.db.session import read_your_writes
+from app.services.simulation import shutdown_simulation_pool
 
 settings = get_settings()
 
@@ -26,6 +33,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting MoneyPot AI Financial Coach API")
     yield
     logger.info("Shutting down MoneyPot API")
+    shutdown_simulation_pool()
 
 
 app = FastAPI(
@@ -46,8 +54,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add request logging middleware
-app.add_middleware(RequestLoggingMiddleware)
+# Pin users who just wrote to the primary on whichever worker they reach
+app.add_middleware(ReadYourWritesMiddleware, guard=read_your_writes)
+
+# Add per-request SQL and phase timing middleware
+app.add_middleware(ServerTimingMiddleware)
+
+# Add request metrics and logging middleware
+app.add_middleware(RequestMetricsMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_prefix)
@@ -62,6 +76,12 @@ async def health_check() -> dict:
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    return metrics_response()
+
+
 @app.get("/")
 async def root() -> dict:
     """Root endpoint."""
@@ -1,9 +1,12 @@
 """SQLAlchemy models."""
 
+from app.models.alert import Alert, AlertRule
 from app.models.base import Base
-from app.models.chat import ChatMessage, ChatSession
+from app.models.chat import ChatMessage, ChatMessageEmbedding, ChatSession
 from app.models.expense import Expense
-from app.models.goal import Goal, Milestone
+from app.models.goal import Goal, GoalContribution, Milestone
+from app.models.insight import Insight, InsightType
+from app.models.job import Job, JobStatus
 from app.models.pot import Pot
 from app.models.user import User
 
@@ -13,7 +16,15 @@ __all__ = [
     "Pot",
     "Goal",
     "Milestone",
+    "GoalContribution",
     "Expense",
     "ChatSession",
     "ChatMessage",
+    "ChatMessageEmbedding",
+    "Alert",
+    "AlertRule",
+    "Insight",
+    "InsightType",
+    "Job",
+    "JobStatus",
 ]
@@ -0,0 +1,63 @@
+"""Alert model."""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDMixin
+
+
+class AlertRule(str, enum.Enum):
+    """Rules that raise alerts on a pot or goal."""
+
+    LOW_BALANCE = "low_balance"
+    GOAL_NEAR_COMPLETION = "goal_near_completion"
+
+
+class Alert(Base, UUIDMixin, TimestampMixin):
+    """Current state of one alert rule for one pot or goal.
+
+    Pot rules leave `goal_id` empty; goal rules also record the goal's pot.
+    """
+
+    __tablename__ = "alerts"
+    __table_args__ = (
+        Index(
+            "uq_alerts_rule_pot_id",
+            "rule",
+            "pot_id",
+            unique=True,
+            postgresql_where=text("goal_id IS NULL"),
+        ),
+        Index(
+            "uq_alerts_rule_goal_id",
+            "rule",
+            "goal_id",
+            unique=True,
+            postgresql_where=text("goal_id IS NOT NULL"),
+        ),
+        Index("ix_alerts_pot_id_active", "pot_id", postgresql_where=text("active")),
+    )
+
+    pot_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pots.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    goal_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    rule: Mapped[AlertRule] = mapped_column(Enum(AlertRule, name="alert_rule"), nullable=False)
+    active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    triggered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    resolved_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
@@ -4,8 +4,23 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDMixin
@@ -33,6 +48,15 @@ class ChatSession(Base, UUIDMixin, TimestampMixin):
     """Chat session model."""
 
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # Session listings page through a user's sessions by last activity
+        Index(
+            "ix_chat_sessions_user_id_updated_at",
+            "user_id",
+            text("updated_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -43,11 +67,14 @@ class ChatSession(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="chat_sessions")
+    # Messages are paged explicitly rather than loaded with the session;
+    # the database cascades their deletion
     messages: Mapped[list["ChatMessage"]] = relationship(
         "ChatMessage",
         back_populates="session",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
         order_by="ChatMessage.created_at",
     )
 
@@ -56,6 +83,13 @@ class ChatMessage(Base, UUIDMixin):
     """Chat message model."""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_id_created_at_id", "session_id", "created_at", "id"),
+        Index("ix_chat_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # Postgres maintains search_vector for full-text search. It is left
+    # unmapped so inserts don't return it and loads don't select it.
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -72,6 +106,10 @@ class ChatMessage(Base, UUIDMixin):
         default=MessageType.TEXT,
     )
     extra_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content)", persisted=True),
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -80,3 +118,39 @@ class ChatMessage(Base, UUIDMixin):
 
     # Relationships
     session: Mapped["ChatSession"] = relationship("ChatSession", back_populates="messages")
+
+
+class ChatMessageEmbedding(Base):
+    """A chat message's embedding, for recalling it in later sessions.
+
+    Vectors are raw L2-normalized float32 bytes. A message has one row per
+    embedder, named with its dimension, so indexes built by different
+    embedders never mix. Ids increase with insertion, so processes holding
+    an index in memory only need to fetch rows past the newest they have.
+    """
+
+    __tablename__ = "chat_message_embeddings"
+    __table_args__ = (
+        UniqueConstraint(
+            "message_id",
+            "embedder",
+            name="uq_chat_message_embeddings_message_id_embedder",
+        ),
+        Index("ix_chat_message_embeddings_user_id_embedder_id", "user_id", "embedder", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    message_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_messages.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    embedder: Mapped[str] = mapped_column(String(64), nullable=False)
+    tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
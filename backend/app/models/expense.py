@@ -4,7 +4,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,15 @@ class Expense(Base, UUIDMixin, TimestampMixin):
     """Expense model representing financial transactions."""
 
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Trigram index for description search and autocomplete
+        Index(
+            "ix_expenses_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     pot_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
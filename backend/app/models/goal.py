@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Numeric, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -85,3 +85,22 @@ class Milestone(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     goal: Mapped["Goal"] = relationship("Goal", back_populates="milestones")
+
+
+class GoalContribution(Base, UUIDMixin):
+    """Append-only ledger of funds added to a goal."""
+
+    __tablename__ = "goal_contributions"
+    __table_args__ = (Index("ix_goal_contributions_goal_id_created_at", "goal_id", "created_at"),)
+
+    goal_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("goals.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,50 @@
+"""Insight model."""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class InsightType(str, enum.Enum):
+    """Types of insight."""
+
+    TIP = "tip"
+    WARNING = "warning"
+    ACHIEVEMENT = "achievement"
+
+
+class Insight(Base):
+    """An insight precomputed for a user.
+
+    Ids are derived from the user and what the insight is about, so the same
+    insight keeps its id across recomputations.
+    """
+
+    __tablename__ = "insights"
+    __table_args__ = (Index("ix_insights_user_id_position", "user_id", "position"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    type: Mapped[InsightType] = mapped_column(
+        Enum(InsightType, name="insight_type"),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -22,6 +22,7 @@ class User(Base, UUIDMixin, TimestampMixin):
     avatar: Mapped[str | None] = mapped_column(String(500), nullable=True)
     monthly_income: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
     currency: Mapped[str] = mapped_column(String(3), default="USD")
+    timezone: Mapped[str] = mapped_column(String(64), default="UTC", server_default="UTC")
     onboarding_completed: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Relationships
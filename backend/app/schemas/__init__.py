@@ -4,17 +4,30 @@ from app.schemas.analytics import (
     AIInsight,
     ChartDataPoint,
     DashboardData,
+    GoalProbabilityData,
+    GoalProbabilityReport,
     GoalProgressData,
     InsightType,
     PotDistribution,
     SpendingTrend,
-    TimeSeriesDataPoint,
+    TrendGranularity,
+)
+from app.schemas.batch import (
+    BatchItemResponse,
+    BatchMethod,
+    BatchRequest,
+    BatchRequestItem,
+    BatchResponse,
 )
 from app.schemas.chat import (
     ChatMessageCreate,
     ChatMessageResponse,
+    ChatSearchPage,
+    ChatSearchResult,
     ChatSessionCreate,
+    ChatSessionPage,
     ChatSessionResponse,
+    ChatSessionSummary,
     ChatSessionWithMessages,
     ImpactAnalysis,
     MessageRole,
@@ -26,11 +39,16 @@ from app.schemas.chat import (
     TradeOffOption,
 )
 from app.schemas.expense import (
+    CashFlowCalendar,
+    CategorySuggestion,
     ExpenseCategory,
     ExpenseCreate,
     ExpenseResponse,
+    ExpenseSuggestion,
     ExpenseSummary,
     ExpenseUpdate,
+    PotCashFlow,
+    UpcomingExpense,
 )
 from app.schemas.goal import (
     GoalContribution,
@@ -85,14 +103,23 @@ __all__ = [
     "ExpenseCategory",
     "ExpenseCreate",
     "ExpenseResponse",
+    "ExpenseSuggestion",
     "ExpenseUpdate",
     "ExpenseSummary",
+    "UpcomingExpense",
+    "CategorySuggestion",
+    "PotCashFlow",
+    "CashFlowCalendar",
     # Chat
     "MessageRole",
     "MessageType",
     "ChatSessionCreate",
     "ChatSessionResponse",
     "ChatSessionWithMessages",
+    "ChatSessionSummary",
+    "ChatSessionPage",
+    "ChatSearchResult",
+    "ChatSearchPage",
     "ChatMessageCreate",
     "ChatMessageResponse",
     "ImpactAnalysis",
@@ -106,8 +133,16 @@ __all__ = [
     "SpendingTrend",
     "PotDistribution",
     "GoalProgressData",
+    "GoalProbabilityData",
+    "GoalProbabilityReport",
     "AIInsight",
     "InsightType",
     "ChartDataPoint",
-    "TimeSeriesDataPoint",
+    "TrendGranularity",
+    # Batch
+    "BatchMethod",
+    "BatchRequestItem",
+    "BatchRequest",
+    "BatchItemResponse",
+    "BatchResponse",
 ]
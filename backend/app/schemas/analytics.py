@@ -19,6 +19,14 @@ class InsightType(str, Enum):
     ACHIEVEMENT = "achievement"
 
 
+class TrendGranularity(str, Enum):
+    """Bucket size for time series."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
 class ChartDataPoint(BaseModel):
     """Schema for chart data point."""
 
@@ -27,17 +35,16 @@ class ChartDataPoint(BaseModel):
     fill: str | None = None
 
 
-class TimeSeriesDataPoint(BaseModel):
-    """Schema for time series data point."""
-
-    date: str
-    amount: float
-
-
 class SpendingTrend(BaseModel):
-    """Schema for spending trends."""
+    """Schema for spending trends.
 
-    data: list[TimeSeriesDataPoint]
+    The series is columnar: `amounts[i]` is the spending in the bucket
+    starting on `dates[i]`, in the user's timezone.
+    """
+
+    granularity: TrendGranularity
+    dates: list[str]
+    amounts: list[float]
     total_this_period: float = Field(alias="totalThisPeriod")
     total_last_period: float = Field(alias="totalLastPeriod")
     change_percentage: float = Field(alias="changePercentage")
@@ -65,6 +72,33 @@ class GoalProgressData(BaseModel):
     status: GoalStatus
     deadline: datetime | None = None
     days_remaining: int | None = Field(None, alias="daysRemaining")
+    contribution_velocity: float = Field(0.0, alias="contributionVelocity")
+    projected_completion_date: datetime | None = Field(None, alias="projectedCompletionDate")
+    on_track: bool | None = Field(None, alias="onTrack")
+
+    model_config = {"populate_by_name": True}
+
+
+class GoalProbabilityData(BaseModel):
+    """Schema for the simulated chance of reaching a goal by its deadline."""
+
+    goal_id: UUID = Field(alias="goalId")
+    title: str
+    target_amount: float = Field(alias="targetAmount")
+    current_amount: float = Field(alias="currentAmount")
+    deadline: datetime
+    probability: float
+    median_amount_at_deadline: float = Field(alias="medianAmountAtDeadline")
+
+    model_config = {"populate_by_name": True}
+
+
+class GoalProbabilityReport(BaseModel):
+    """Schema for goal attainment simulation results."""
+
+    simulations: int
+    seed: int
+    goals: list[GoalProbabilityData]
 
     model_config = {"populate_by_name": True}
 
@@ -85,6 +119,8 @@ class DashboardData(BaseModel):
     """Schema for main dashboard data."""
 
     total_balance: float = Field(alias="totalBalance")
+    upcoming_commitments: float = Field(0.0, alias="upcomingCommitments")
+    projected_balance: float = Field(0.0, alias="projectedBalance")
     monthly_income: float = Field(alias="monthlyIncome")
     total_expenses_this_month: float = Field(alias="totalExpensesThisMonth")
     savings_rate: float = Field(alias="savingsRate")
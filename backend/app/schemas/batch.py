@@ -0,0 +1,63 @@
+"""Batch request schemas."""
+
+from enum import Enum
+from typing import Any
+from urllib.parse import unquote
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class BatchMethod(str, Enum):
+    """HTTP methods allowed in a batch."""
+
+    GET = "GET"
+    POST = "POST"
+    PUT = "PUT"
+    PATCH = "PATCH"
+    DELETE = "DELETE"
+
+
+class BatchRequestItem(BaseModel):
+    """Schema for one sub-request of a batch."""
+
+    id: str | None = Field(None, max_length=64)
+    method: BatchMethod = BatchMethod.GET
+    path: str = Field(..., min_length=1, max_length=2048)
+    body: Any = None
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, value: str) -> str:
+        """Ensure the path is relative to the API prefix, e.g. /pots/?limit=10."""
+        if not value.startswith("/") or value.startswith("//"):
+            raise ValueError("Path must start with a single /")
+        # Compare the path as it is routed, which is percent-decoded
+        if unquote(value.split("?", 1)[0]).rstrip("/").lower() == "/batch":
+            raise ValueError("Batches cannot be nested")
+        return value
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of sub-requests."""
+
+    requests: list[BatchRequestItem] = Field(
+        ..., min_length=1, max_length=settings.batch_max_requests
+    )
+
+
+class BatchItemResponse(BaseModel):
+    """Schema for the outcome of one sub-request."""
+
+    id: str | None = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch results, in the order the sub-requests were given."""
+
+    responses: list[BatchItemResponse]
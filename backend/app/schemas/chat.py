@@ -32,6 +32,7 @@ class PotImpact(BaseModel):
     current_amount: float = Field(alias="currentAmount")
     projected_amount: float = Field(alias="projectedAmount")
     change: float
+    upcoming_commitments: float = Field(0.0, alias="upcomingCommitments")
 
     model_config = {"populate_by_name": True}
 
@@ -102,6 +103,49 @@ class ChatSessionResponse(BaseModel):
     model_config = {"populate_by_name": True, "from_attributes": True}
 
 
+class ChatSessionSummary(ChatSessionResponse):
+    """Schema for a chat session in a session listing."""
+
+    message_count: int = Field(alias="messageCount")
+    last_message_preview: str | None = Field(None, alias="lastMessagePreview")
+    last_activity_at: datetime = Field(alias="lastActivityAt")
+
+
+class ChatSessionPage(BaseModel):
+    """Schema for a page of chat sessions, most recently active first."""
+
+    sessions: list[ChatSessionSummary]
+    next_cursor: str | None = Field(None, alias="nextCursor")
+
+    model_config = {"populate_by_name": True}
+
+
+class ChatSearchResult(BaseModel):
+    """Schema for a chat message matching a search.
+
+    The snippet is HTML-escaped message text with matches wrapped in <mark>.
+    """
+
+    message_id: UUID = Field(alias="messageId")
+    session_id: UUID = Field(alias="sessionId")
+    session_title: str = Field(alias="sessionTitle")
+    role: MessageRole
+    snippet: str
+    rank: float
+    created_at: datetime = Field(alias="createdAt")
+
+    model_config = {"populate_by_name": True}
+
+
+class ChatSearchPage(BaseModel):
+    """Schema for a page of chat search results, best match first."""
+
+    results: list[ChatSearchResult]
+    next_offset: int | None = Field(None, alias="nextOffset")
+
+    model_config = {"populate_by_name": True}
+
+
 class ChatMessageCreate(BaseModel):
     """Schema for creating a chat message."""
 
@@ -116,14 +160,22 @@ class ChatMessageResponse(BaseModel):
     content: str
     type: MessageType = Field(alias="messageType")
     timestamp: datetime = Field(alias="createdAt")
+    # The first result of each tool; the lists hold every result in order
     impact_analysis: ImpactAnalysis | None = Field(None, alias="impactAnalysis")
+    impact_analyses: list[ImpactAnalysis] | None = Field(None, alias="impactAnalyses")
     trade_off: TradeOff | None = Field(None, alias="tradeOff")
+    trade_offs: list[TradeOff] | None = Field(None, alias="tradeOffs")
     quick_actions: list[QuickAction] | None = Field(None, alias="quickActions")
 
     model_config = {"populate_by_name": True, "from_attributes": True}
 
 
 class ChatSessionWithMessages(ChatSessionResponse):
-    """Schema for chat session with messages."""
+    """Schema for chat session with a page of messages in chronological order.
+
+    The cursors are set when older or newer messages exist beyond the page.
+    """
 
     messages: list[ChatMessageResponse] = Field(default_factory=list)
+    older_cursor: str | None = Field(None, alias="olderCursor")
+    newer_cursor: str | None = Field(None, alias="newerCursor")
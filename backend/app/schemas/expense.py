@@ -1,5 +1,6 @@
 """Expense schemas."""
 
+from datetime import date as date_type
 from datetime import datetime
 from enum import Enum
 from uuid import UUID
@@ -32,9 +33,13 @@ class ExpenseBase(BaseModel):
 
 
 class ExpenseCreate(ExpenseBase):
-    """Schema for creating an expense."""
+    """Schema for creating an expense.
 
-    pot_id: UUID = Field(..., alias="potId")
+    Category and pot may be omitted to use the categorizer's suggestion.
+    """
+
+    category: ExpenseCategory | None = None
+    pot_id: UUID | None = Field(None, alias="potId")
 
     model_config = {"populate_by_name": True}
 
@@ -77,3 +82,62 @@ class ExpenseSummary(BaseModel):
     period_end: datetime = Field(alias="periodEnd")
 
     model_config = {"populate_by_name": True}
+
+
+class ExpenseSuggestion(BaseModel):
+    """Schema for an autocomplete suggestion drawn from past expenses."""
+
+    description: str
+    category: ExpenseCategory
+    pot_id: UUID = Field(alias="potId")
+    use_count: int = Field(alias="useCount")
+    last_used_at: datetime = Field(alias="lastUsedAt")
+
+    model_config = {"populate_by_name": True}
+
+
+class CategorySuggestion(BaseModel):
+    """Schema for a suggested category and pot for an expense description."""
+
+    category: ExpenseCategory | None = None
+    category_confidence: float = Field(alias="categoryConfidence")
+    pot_id: UUID | None = Field(None, alias="potId")
+    pot_confidence: float = Field(alias="potConfidence")
+
+    model_config = {"populate_by_name": True}
+
+
+class UpcomingExpense(BaseModel):
+    """Schema for a projected occurrence of a recurring expense."""
+
+    date: date_type
+    pot_id: UUID = Field(alias="potId")
+    description: str
+    category: ExpenseCategory
+    amount: float
+    period: str
+
+    model_config = {"populate_by_name": True}
+
+
+class PotCashFlow(BaseModel):
+    """Schema for a pot's balance after upcoming recurring expenses."""
+
+    pot_id: UUID = Field(alias="potId")
+    pot_name: str = Field(alias="potName")
+    current_amount: float = Field(alias="currentAmount")
+    committed_amount: float = Field(alias="committedAmount")
+    projected_amount: float = Field(alias="projectedAmount")
+
+    model_config = {"populate_by_name": True}
+
+
+class CashFlowCalendar(BaseModel):
+    """Schema for projected recurring expenses over the coming months."""
+
+    start_date: date_type = Field(alias="startDate")
+    end_date: date_type = Field(alias="endDate")
+    events: list[UpcomingExpense]
+    pots: list[PotCashFlow]
+
+    model_config = {"populate_by_name": True}
@@ -2,8 +2,9 @@
 
 from datetime import datetime
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 from app.schemas.pot import PotCategory
 
@@ -29,6 +30,19 @@ class UserUpdate(BaseModel):
     avatar: str | None = None
     monthly_income: float | None = Field(None, ge=0)
     currency: str | None = Field(None, min_length=3, max_length=3)
+    timezone: str | None = Field(None, max_length=64)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value: str | None) -> str | None:
+        """Ensure the timezone is a known IANA name such as Europe/London."""
+        if value is None:
+            return value
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {value}")
+        return value
 
 
 class UserResponse(BaseModel):
@@ -40,6 +54,7 @@ class UserResponse(BaseModel):
     avatar: str | None = None
     monthly_income: float = Field(alias="monthlyIncome")
     currency: str
+    timezone: str
     onboarding_completed: bool = Field(alias="onboardingCompleted")
     created_at: datetime = Field(alias="createdAt")
 
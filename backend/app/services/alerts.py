@@ -0,0 +1,170 @@
+"""Budget alerts evaluated incrementally as pots and goals change.
+
+Each write re-evaluates the rules for just the pot or goal it touched and
+persists a transition only when a rule starts or stops holding, so reads
+fetch active alerts instead of rescanning every pot and goal.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.alert import Alert, AlertRule
+from app.models.goal import Goal
+from app.models.goal import GoalStatus as GoalStatusModel
+from app.models.pot import Pot
+from app.models.pot import PotCategory as PotCategoryModel
+from app.services.insights import InsightService
+
+# A pot is low once its balance falls below this share of its target
+LOW_BALANCE_RATIO = 0.2
+# A goal is near completion once it reaches this share of its target
+GOAL_NEAR_COMPLETION_RATIO = 0.8
+
+
+def is_low_balance(pot: Pot) -> bool:
+    """Whether a pot's balance is below the low-balance threshold."""
+    target = float(pot.target_amount or 0)
+    return target > 0 and float(pot.current_amount) < target * LOW_BALANCE_RATIO
+
+
+def is_near_completion(goal: Goal) -> bool:
+    """Whether an active goal is close to, but not yet at, its target."""
+    target = float(goal.target_amount)
+    current = float(goal.current_amount)
+    return (
+        goal.status == GoalStatusModel.ACTIVE
+        and target > 0
+        and target * GOAL_NEAR_COMPLETION_RATIO <= current < target
+    )
+
+
+@dataclass
+class ActiveAlert:
+    """An active alert with the pot and goal details needed to present it."""
+
+    rule: AlertRule
+    triggered_at: datetime
+    pot_id: uuid.UUID
+    pot_name: str
+    pot_category: PotCategoryModel
+    goal_id: uuid.UUID | None = None
+    goal_title: str | None = None
+    goal_remaining: float = 0.0
+
+
+class AlertEngine:
+    """Evaluates alert rules for single pots and goals."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def evaluate_pot(self, pot: Pot) -> None:
+        """Re-evaluate pot rules after its balance or target changed."""
+        await self._transition(AlertRule.LOW_BALANCE, pot.id, None, is_low_balance(pot))
+
+    async def evaluate_goal(self, goal: Goal) -> None:
+        """Re-evaluate goal rules after its progress, target or status changed."""
+        await self._transition(
+            AlertRule.GOAL_NEAR_COMPLETION,
+            goal.pot_id,
+            goal.id,
+            is_near_completion(goal),
+        )
+
+    async def active_for_user(self, user_id: uuid.UUID) -> list[ActiveAlert]:
+        """Get a user's active alerts, pot alerts first."""
+        result = await self.db.execute(
+            select(
+                Alert.rule,
+                Alert.triggered_at,
+                Alert.pot_id,
+                Pot.name,
+                Pot.category,
+                Alert.goal_id,
+                Goal.title,
+                (Goal.target_amount - Goal.current_amount).label("goal_remaining"),
+            )
+            .join(Pot, Pot.id == Alert.pot_id)
+            .outerjoin(Goal, Goal.id == Alert.goal_id)
+            .where(Pot.user_id == user_id, Alert.active.is_(True))
+            .order_by(Alert.rule, Alert.triggered_at)
+        )
+        return [
+            ActiveAlert(
+                rule=row.rule,
+                triggered_at=row.triggered_at,
+                pot_id=row.pot_id,
+                pot_name=row.name,
+                pot_category=row.category,
+                goal_id=row.goal_id,
+                goal_title=row.title,
+                goal_remaining=float(row.goal_remaining or 0),
+            )
+            for row in result.all()
+        ]
+
+    async def _transition(
+        self,
+        rule: AlertRule,
+        pot_id: uuid.UUID,
+        goal_id: uuid.UUID | None,
+        triggered: bool,
+    ) -> None:
+        """Record a rule starting or stopping to hold, in a single statement.
+
+        Both statements only touch a row when the state actually changes, so
+        repeated evaluations of an unchanged rule write nothing. A change
+        queues a refresh of the owner's precomputed insights.
+        """
+        now = datetime.now(timezone.utc)
+        if goal_id is None:
+            subject = Alert.pot_id
+            subject_id = pot_id
+            scope = Alert.goal_id.is_(None)
+        else:
+            subject = Alert.goal_id
+            subject_id = goal_id
+            scope = Alert.goal_id.is_not(None)
+
+        if triggered:
+            statement = (
+                insert(Alert)
+                .values(
+                    id=uuid.uuid4(),
+                    pot_id=pot_id,
+                    goal_id=goal_id,
+                    rule=rule,
+                    active=True,
+                    triggered_at=now,
+                )
+                .on_conflict_do_update(
+                    index_elements=[Alert.rule, subject],
+                    index_where=scope,
+                    set_={
+                        "pot_id": pot_id,
+                        "active": True,
+                        "triggered_at": now,
+                        "resolved_at": None,
+                        "updated_at": func.now(),
+                    },
+                    where=Alert.active.is_(False),
+                )
+                .returning(Alert.id)
+            )
+        else:
+            statement = (
+                update(Alert)
+                .where(Alert.rule == rule, subject == subject_id, scope, Alert.active.is_(True))
+                .values(active=False, resolved_at=now)
+                .returning(Alert.id)
+                .execution_options(synchronize_session=False)
+            )
+
+        result = await self.db.execute(statement)
+        if result.first() is not None:
+            await InsightService(self.db).schedule_refresh_for_pot(pot_id)
@@ -1,11 +1,13 @@
 """Analytics service."""
 
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
+import numpy as np
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.fanout import fan_out, rows, scalar
 from app.models.expense import Expense
 from app.models.goal import Goal
 from app.models.goal import GoalStatus as GoalStatusModel
@@ -14,13 +16,19 @@ from app.models.user import User
 from app.schemas.analytics import (
     ChartDataPoint,
     DashboardData,
+    GoalProbabilityData,
+    GoalProbabilityReport,
     GoalProgressData,
     PotDistribution,
     SpendingTrend,
-    TimeSeriesDataPoint,
+    TrendGranularity,
 )
 from app.schemas.expense import ExpenseCategory
 from app.schemas.goal import GoalStatus
+from app.services.goal_forecast import GoalForecaster
+from app.services.recurring import RecurringProjectionService
+from app.services.simulation import DAYS_PER_MONTH, SimulationInput, run_simulation
+from app.services.timeseries import spending_series_statement
 
 
 class AnalyticsService:
@@ -30,17 +38,55 @@ class AnalyticsService:
         self.db = db
 
     async def get_dashboard(self, user_id: uuid.UUID) -> DashboardData:
-        """Get main dashboard data."""
-        # Get user
-        user_result = await self.db.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one()
+        """Get main dashboard data.
 
-        # Get pots for total balance and distribution
-        pots_result = await self.db.execute(
-            select(Pot).where(Pot.user_id == user_id)
+        The independent reads run concurrently on one shared snapshot, so
+        balances, spending and goal counts agree with each other.
+        """
+        now = datetime.now(timezone.utc)
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        (
+            monthly_income,
+            pots,
+            commitments,
+            total_expenses,
+            category_rows,
+            goal_rows,
+        ) = await fan_out(
+            self.db,
+            # User's income for the savings rate
+            scalar(select(User.monthly_income).where(User.id == user_id)),
+            # Pots for total balance and distribution
+            rows(select(Pot.name, Pot.current_amount, Pot.color).where(Pot.user_id == user_id)),
+            # Recurring expenses due in the next 30 days
+            lambda db: RecurringProjectionService(db).get_commitments(user_id),
+            # Expenses this month
+            scalar(
+                select(func.coalesce(func.sum(Expense.amount), 0))
+                .join(Pot)
+                .where(Pot.user_id == user_id, Expense.date >= month_start)
+            ),
+            # Spending by category
+            rows(
+                select(Expense.category, func.sum(Expense.amount))
+                .join(Pot)
+                .where(Pot.user_id == user_id, Expense.date >= month_start)
+                .group_by(Expense.category)
+            ),
+            # Goal counts
+            rows(
+                select(Goal.status, func.count(Goal.id))
+                .join(Pot)
+                .where(Pot.user_id == user_id)
+                .group_by(Goal.status)
+            ),
+            snapshot=True,
         )
-        pots = list(pots_result.scalars().all())
+
         total_balance = sum(float(pot.current_amount) for pot in pots)
+        upcoming_commitments = sum(commitments.values())
+        total_expenses = float(total_expenses or 0)
 
         pot_distribution = [
             ChartDataPoint(
@@ -51,25 +97,6 @@ class AnalyticsService:
             for pot in pots
         ]
 
-        # Get expenses this month
-        now = datetime.now(timezone.utc)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        expenses_result = await self.db.execute(
-            select(func.coalesce(func.sum(Expense.amount), 0))
-            .join(Pot)
-            .where(Pot.user_id == user_id, Expense.date >= month_start)
-        )
-        total_expenses = float(expenses_result.scalar() or 0)
-
-        # Get spending by category
-        category_result = await self.db.execute(
-            select(Expense.category, func.sum(Expense.amount))
-            .join(Pot)
-            .where(Pot.user_id == user_id, Expense.date >= month_start)
-            .group_by(Expense.category)
-        )
-
         category_colors = {
             "food": "#ef4444",
             "transport": "#f97316",
@@ -87,26 +114,21 @@ class AnalyticsService:
                 value=float(row[1]),
                 fill=category_colors.get(row[0].value, "#6b7280"),
             )
-            for row in category_result.all()
+            for row in category_rows
         ]
 
-        # Get goal counts
-        goals_result = await self.db.execute(
-            select(Goal.status, func.count(Goal.id))
-            .join(Pot)
-            .where(Pot.user_id == user_id)
-            .group_by(Goal.status)
-        )
-        goal_counts = {row[0]: row[1] for row in goals_result.all()}
+        goal_counts = {row[0]: row[1] for row in goal_rows}
 
         # Calculate savings rate
-        monthly_income = float(user.monthly_income) if user.monthly_income else 0
+        monthly_income = float(monthly_income) if monthly_income else 0
         savings_rate = 0.0
         if monthly_income > 0:
             savings_rate = ((monthly_income - total_expenses) / monthly_income) * 100
 
         return DashboardData(
             total_balance=total_balance,
+            upcoming_commitments=upcoming_commitments,
+            projected_balance=total_balance - upcoming_commitments,
             monthly_income=monthly_income,
             total_expenses_this_month=total_expenses,
             savings_rate=max(0, savings_rate),
@@ -120,47 +142,14 @@ class AnalyticsService:
         self,
         user_id: uuid.UUID,
         days: int = 30,
+        granularity: TrendGranularity = TrendGranularity.DAY,
     ) -> SpendingTrend:
-        """Get spending trends over time."""
-        now = datetime.now(timezone.utc)
-        period_start = now - timedelta(days=days)
-        prev_period_start = period_start - timedelta(days=days)
-
-        # Get daily spending for current period
-        daily_result = await self.db.execute(
-            select(
-                func.date(Expense.date),
-                func.sum(Expense.amount),
-            )
-            .join(Pot)
-            .where(Pot.user_id == user_id, Expense.date >= period_start)
-            .group_by(func.date(Expense.date))
-            .order_by(func.date(Expense.date))
-        )
-
-        data = [
-            TimeSeriesDataPoint(date=str(row[0]), amount=float(row[1]))
-            for row in daily_result.all()
-        ]
-
-        # Get totals for comparison
-        current_total_result = await self.db.execute(
-            select(func.coalesce(func.sum(Expense.amount), 0))
-            .join(Pot)
-            .where(Pot.user_id == user_id, Expense.date >= period_start)
-        )
-        total_this_period = float(current_total_result.scalar() or 0)
+        """Get spending trends over time, bucketed in the user's timezone."""
+        result = await self.db.execute(spending_series_statement(user_id, days, granularity))
+        rows = result.all()
 
-        prev_total_result = await self.db.execute(
-            select(func.coalesce(func.sum(Expense.amount), 0))
-            .join(Pot)
-            .where(
-                Pot.user_id == user_id,
-                Expense.date >= prev_period_start,
-                Expense.date < period_start,
-            )
-        )
-        total_last_period = float(prev_total_result.scalar() or 0)
+        total_this_period = float(rows[0].total_this_period) if rows else 0.0
+        total_last_period = float(rows[0].total_last_period) if rows else 0.0
 
         change_percentage = 0.0
         if total_last_period > 0:
@@ -169,7 +158,9 @@ class AnalyticsService:
             ) * 100
 
         return SpendingTrend(
-            data=data,
+            granularity=granularity,
+            dates=[row.bucket.isoformat() for row in rows],
+            amounts=[float(row.amount) for row in rows],
             total_this_period=total_this_period,
             total_last_period=total_last_period,
             change_percentage=change_percentage,
@@ -201,11 +192,13 @@ class AnalyticsService:
             select(Goal).join(Pot).where(Pot.user_id == user_id).order_by(Goal.deadline)
         )
         goals = list(goals_result.scalars().all())
+        forecasts = await GoalForecaster(self.db).forecast(goals)
 
         now = datetime.now(timezone.utc)
         result = []
 
         for goal in goals:
+            forecast = forecasts[goal.id]
             target = float(goal.target_amount)
             current = float(goal.current_amount)
             progress = (current / target * 100) if target > 0 else 0
@@ -225,7 +218,77 @@ class AnalyticsService:
                     status=GoalStatus(goal.status.value),
                     deadline=goal.deadline,
                     days_remaining=days_remaining,
+                    contribution_velocity=forecast.velocity,
+                    projected_completion_date=forecast.projected_completion,
+                    on_track=forecast.on_track,
                 )
             )
 
         return result
+
+    async def get_goal_probabilities(
+        self,
+        user_id: uuid.UUID,
+        simulations: int = 5000,
+        seed: int | None = None,
+        history_days: int = 180,
+    ) -> GoalProbabilityReport:
+        """Estimate the chance of reaching each active goal by its deadline.
+
+        Runs a Monte Carlo simulation of income and spending built from the
+        user's recent daily spending and goal contributions.
+        """
+        user_result = await self.db.execute(select(User).where(User.id == user_id))
+        user = user_result.scalar_one()
+
+        goals_result = await self.db.execute(
+            select(Goal)
+            .join(Pot)
+            .where(
+                Pot.user_id == user_id,
+                Goal.status == GoalStatusModel.ACTIVE,
+                Goal.deadline.is_not(None),
+            )
+            .order_by(Goal.deadline)
+        )
+        goals = list(goals_result.scalars().all())
+        if not goals:
+            return GoalProbabilityReport(simulations=simulations, seed=seed or 0, goals=[])
+
+        trend = await self.get_spending_trends(user_id, history_days, TrendGranularity.DAY)
+        forecasts = await GoalForecaster(self.db).forecast(goals)
+
+        now = datetime.now(timezone.utc)
+        simulation = await run_simulation(
+            SimulationInput(
+                monthly_income=float(user.monthly_income),
+                daily_spending=np.array(trend.amounts),
+                targets=np.array([float(goal.target_amount) for goal in goals]),
+                currents=np.array([float(goal.current_amount) for goal in goals]),
+                months_to_deadline=np.array(
+                    [max((goal.deadline - now).days // DAYS_PER_MONTH, 0) for goal in goals]
+                ),
+                monthly_contributions=np.array(
+                    [forecasts[goal.id].velocity * DAYS_PER_MONTH for goal in goals]
+                ),
+                simulations=simulations,
+                seed=seed,
+            )
+        )
+
+        return GoalProbabilityReport(
+            simulations=simulations,
+            seed=simulation.seed,
+            goals=[
+                GoalProbabilityData(
+                    goal_id=goal.id,
+                    title=goal.title,
+                    target_amount=float(goal.target_amount),
+                    current_amount=float(goal.current_amount),
+                    deadline=goal.deadline,
+                    probability=float(simulation.probabilities[i]),
+                    median_amount_at_deadline=float(simulation.median_at_deadline[i]),
+                )
+                for i, goal in enumerate(goals)
+            ],
+        )
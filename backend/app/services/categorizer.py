@@ -0,0 +1,328 @@
+"""Local expense categorizer suggesting a category and pot from a description.
+
+Each user gets a multinomial naive Bayes model over description tokens,
+trained from their own expenses and updated in place as expense writes
+commit. A global model trained across users acts as the prior for
+categories, so new users still get sensible suggestions. Models are cached
+per process with LRU eviction and expire so writes made by other workers
+are picked up.
+"""
+
+import re
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+from app.models.expense import ExpenseCategory as ExpenseCategoryModel
+from app.models.pot import Pot
+from app.schemas.expense import CategorySuggestion, ExpenseCategory
+
+CACHE_MAX_USERS = 1024
+CACHE_TTL_SECONDS = 600
+GLOBAL_TTL_SECONDS = 3600
+
+# Most recent expenses a user's model is trained from
+USER_TRAINING_LIMIT = 2000
+# Most recent expenses across all users the global model is trained from
+GLOBAL_TRAINING_LIMIT = 20000
+# Tokens enter the global model only once this many users have used them
+GLOBAL_MIN_USERS = 3
+
+# Pseudo-counts given to the prior when smoothing a model's estimates
+PRIOR_WEIGHT = 5.0
+
+# Posterior a suggestion needs before it is applied to an expense created without it
+MIN_CONFIDENCE = 0.5
+
+CATEGORY_LABELS = list(ExpenseCategoryModel)
+
+_TOKEN_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+def tokenize(description: str) -> list[str]:
+    """Lowercased words of a description; numbers and single letters are dropped."""
+    return _TOKEN_RE.findall(description.lower())
+
+
+class NaiveBayes:
+    """Multinomial naive Bayes over tokens, trainable one example at a time.
+
+    Counts are kept as a small integer array per token, indexed by label.
+    Estimates are smoothed towards `prior` when given (which must share
+    the same labels), otherwise towards uniform.
+    """
+
+    def __init__(self, labels: Sequence[Hashable] = (), prior: "NaiveBayes | None" = None):
+        self.labels: list[Hashable] = list(labels)
+        self.prior = prior
+        self._index = {label: i for i, label in enumerate(self.labels)}
+        self.doc_counts = np.zeros(len(self.labels), dtype=np.int32)
+        self.token_totals = np.zeros(len(self.labels), dtype=np.int32)
+        self.token_counts: dict[str, np.ndarray] = {}
+
+    def add(self, tokens: Iterable[str], label: Hashable, weight: int = 1) -> None:
+        """Train on one example, or untrain it with a negative weight."""
+        index = self._index.get(label)
+        if index is None:
+            if weight < 0:
+                return
+            index = self._add_label(label)
+
+        self.doc_counts[index] = max(self.doc_counts[index] + weight, 0)
+        for token in tokens:
+            counts = self.token_counts.get(token)
+            if counts is None or len(counts) < len(self.labels):
+                counts = self._counts(token)
+                self.token_counts[token] = counts
+            counts[index] = max(counts[index] + weight, 0)
+            self.token_totals[index] = max(self.token_totals[index] + weight, 0)
+
+    def label_probs(self) -> np.ndarray:
+        """Smoothed probability of each label."""
+        if self.prior is not None:
+            base = self.prior.label_probs()
+        else:
+            base = 1.0 / max(len(self.labels), 1)
+        return (self.doc_counts + PRIOR_WEIGHT * base) / (self.doc_counts.sum() + PRIOR_WEIGHT)
+
+    def token_probs(self, token: str) -> np.ndarray:
+        """Smoothed probability of a token under each label."""
+        if self.prior is not None:
+            base = self.prior.token_probs(token)
+        else:
+            base = 1.0 / (len(self.token_counts) + 1)
+        return (self._counts(token) + PRIOR_WEIGHT * base) / (self.token_totals + PRIOR_WEIGHT)
+
+    def is_trained(self) -> bool:
+        """Whether this model or its prior has seen any examples."""
+        return bool(self.doc_counts.sum()) or (
+            self.prior is not None and self.prior.is_trained()
+        )
+
+    def knows(self, token: str) -> bool:
+        """Whether this model or its prior has seen a token."""
+        return token in self.token_counts or (
+            self.prior is not None and self.prior.knows(token)
+        )
+
+    def predict(self, tokens: Iterable[str]) -> tuple[Hashable, float] | None:
+        """Most likely label and its posterior probability, or None when untrained."""
+        if not self.labels or not self.is_trained():
+            return None
+        scores = np.log(self.label_probs())
+        for token in tokens:
+            if self.knows(token):
+                scores += np.log(self.token_probs(token))
+        probs = np.exp(scores - scores.max())
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best] / probs.sum())
+
+    def _add_label(self, label: Hashable) -> int:
+        self._index[label] = len(self.labels)
+        self.labels.append(label)
+        self.doc_counts = np.append(self.doc_counts, 0).astype(np.int32)
+        self.token_totals = np.append(self.token_totals, 0).astype(np.int32)
+        return self._index[label]
+
+    def _counts(self, token: str) -> np.ndarray:
+        """A token's counts, padded to the current number of labels."""
+        counts = self.token_counts.get(token)
+        if counts is None:
+            return np.zeros(len(self.labels), dtype=np.int32)
+        if len(counts) < len(self.labels):
+            return np.pad(counts, (0, len(self.labels) - len(counts)))
+        return counts
+
+
+@dataclass
+class UserCategorizer:
+    """A user's trained category and pot models."""
+
+    categories: NaiveBayes
+    pots: NaiveBayes
+    loaded_at: float
+
+    def learn(
+        self,
+        description: str,
+        category: ExpenseCategoryModel,
+        pot_id: uuid.UUID,
+        weight: int = 1,
+    ) -> None:
+        """Train on an expense, or untrain it with a negative weight."""
+        tokens = tokenize(description)
+        self.categories.add(tokens, category, weight)
+        self.pots.add(tokens, pot_id, weight)
+
+    def suggest(self, description: str, min_confidence: float = 0.0) -> CategorySuggestion:
+        """Suggest a category and pot for a description. Runs without I/O.
+
+        A category or pot less likely than `min_confidence` is left out,
+        though its confidence is still reported.
+        """
+        tokens = tokenize(description)
+        category, category_confidence = self.categories.predict(tokens) or (None, 0.0)
+        pot_id, pot_confidence = self.pots.predict(tokens) or (None, 0.0)
+        return CategorySuggestion(
+            category=(
+                ExpenseCategory(category.value)
+                if category is not None and category_confidence >= min_confidence
+                else None
+            ),
+            category_confidence=category_confidence,
+            pot_id=pot_id if pot_confidence >= min_confidence else None,
+            pot_confidence=pot_confidence,
+        )
+
+
+# user_id -> trained models, least recently used first
+_models: OrderedDict[uuid.UUID, UserCategorizer] = OrderedDict()
+
+# (loaded at, model) for the global category model
+_global: tuple[float, NaiveBayes] | None = None
+
+
+# Cached model updates waiting for the session that wrote them to commit
+_PENDING_KEY = "categorizer_updates"
+
+
+def _defer(db: AsyncSession, update: Callable[[], None]) -> None:
+    # Tie the update to a transaction, so that a rollback always discards it
+    if not db.in_transaction():
+        db.sync_session.begin()
+    db.info.setdefault(_PENDING_KEY, []).append(update)
+
+
+def _apply_pending(session: Session) -> None:
+    for update in session.info.pop(_PENDING_KEY, ()):
+        update()
+
+
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(Session, "after_commit", _apply_pending)
+event.listen(Session, "after_rollback", _discard_pending)
+
+
+def _learn(
+    user_id: uuid.UUID,
+    description: str,
+    category: ExpenseCategoryModel,
+    pot_id: uuid.UUID,
+    weight: int,
+) -> None:
+    model = _models.get(user_id)
+    if model is not None:
+        model.learn(description, category, pot_id, weight)
+
+
+def learn_expense(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    description: str,
+    category: ExpenseCategoryModel,
+    pot_id: uuid.UUID,
+    weight: int = 1,
+) -> None:
+    """Update a user's cached model once the session writing an expense commits.
+
+    Use a negative weight to remove an expense's old values. Users without
+    a cached model are left alone; their model is trained on next use. The
+    update is dropped if the session rolls back.
+    """
+    _defer(db, partial(_learn, user_id, description, category, pot_id, weight))
+
+
+def forget_user(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Drop a user's cached model once the session commits, e.g. a pot deletion."""
+    _defer(db, partial(_models.pop, user_id, None))
+
+
+class ExpenseCategorizer:
+    """Loads and caches categorizer models.
+
+    Fetch a model once with `get_model` and call `suggest` on it for each
+    expense in a batch; suggestions themselves never touch the database.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def suggest(
+        self,
+        user_id: uuid.UUID,
+        description: str,
+        min_confidence: float = 0.0,
+    ) -> CategorySuggestion:
+        """Suggest a category and pot for one description."""
+        return (await self.get_model(user_id)).suggest(description, min_confidence)
+
+    async def get_model(self, user_id: uuid.UUID) -> UserCategorizer:
+        """A user's trained models, from cache when fresh."""
+        model = _models.get(user_id)
+        if model is None or time.monotonic() - model.loaded_at >= CACHE_TTL_SECONDS:
+            model = await self._train(user_id)
+
+        _models[user_id] = model
+        _models.move_to_end(user_id)
+        if len(_models) > CACHE_MAX_USERS:
+            _models.popitem(last=False)
+        return model
+
+    async def _train(self, user_id: uuid.UUID) -> UserCategorizer:
+        result = await self.db.execute(
+            select(Expense.description, Expense.category, Expense.pot_id)
+            .join(Pot)
+            .where(Pot.user_id == user_id)
+            .order_by(Expense.date.desc())
+            .limit(USER_TRAINING_LIMIT)
+        )
+        model = UserCategorizer(
+            categories=NaiveBayes(CATEGORY_LABELS, prior=await self._global_model()),
+            pots=NaiveBayes(),
+            loaded_at=time.monotonic(),
+        )
+        for description, category, pot_id in result.all():
+            model.learn(description, category, pot_id)
+        return model
+
+    async def _global_model(self) -> NaiveBayes:
+        """Category model trained across users, limited to widely used tokens."""
+        global _global
+        if _global is not None and time.monotonic() - _global[0] < GLOBAL_TTL_SECONDS:
+            return _global[1]
+
+        result = await self.db.execute(
+            select(Pot.user_id, Expense.description, Expense.category)
+            .join(Pot)
+            .order_by(Expense.created_at.desc())
+            .limit(GLOBAL_TRAINING_LIMIT)
+        )
+        examples = [
+            (user_id, tokenize(description), category)
+            for user_id, description, category in result.all()
+        ]
+        users_by_token: dict[str, set[uuid.UUID]] = defaultdict(set)
+        for user_id, tokens, _ in examples:
+            for token in tokens:
+                users_by_token[token].add(user_id)
+        shared = {
+            token for token, users in users_by_token.items() if len(users) >= GLOBAL_MIN_USERS
+        }
+
+        model = NaiveBayes(CATEGORY_LABELS)
+        for _, tokens, category in examples:
+            model.add([token for token in tokens if token in shared], category)
+        _global = (time.monotonic(), model)
+        return model
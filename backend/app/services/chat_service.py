@@ -0,0 +1,259 @@
+"""Chat service."""
+
+import uuid
+
+from sqlalchemy import func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException, ValidationException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.chat import ChatMessage, ChatSession
+from app.schemas.chat import (
+    ChatMessageResponse,
+    ChatSearchPage,
+    ChatSearchResult,
+    ChatSessionPage,
+    ChatSessionSummary,
+    ChatSessionWithMessages,
+)
+
+# Characters of the latest message shown in session listings
+PREVIEW_LENGTH = 120
+
+# Text search configuration; must match the chat_messages.search_vector column
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# ts_headline options for search result snippets
+SNIPPET_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=2"
+
+
+class ChatService:
+    """Service for chat session operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_sessions(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> ChatSessionPage:
+        """List a user's sessions by last activity, with message aggregates.
+
+        Runs as one query that never loads messages. Pages are keyed on
+        (updated_at, id), so pass the previous page's `next_cursor` to
+        continue.
+        """
+        message_count = (
+            select(func.count())
+            .where(ChatMessage.session_id == ChatSession.id)
+            .correlate(ChatSession)
+            .scalar_subquery()
+        )
+        last_message = (
+            select(func.left(ChatMessage.content, PREVIEW_LENGTH))
+            .where(ChatMessage.session_id == ChatSession.id)
+            .order_by(ChatMessage.created_at.desc())
+            .limit(1)
+            .correlate(ChatSession)
+            .scalar_subquery()
+        )
+
+        query = (
+            select(
+                ChatSession.id,
+                ChatSession.title,
+                ChatSession.created_at,
+                ChatSession.updated_at,
+                message_count.label("message_count"),
+                last_message.label("last_message_preview"),
+            )
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            query = query.where(
+                tuple_(ChatSession.updated_at, ChatSession.id) < decode_cursor(cursor)
+            )
+
+        rows = (await self.db.execute(query)).all()
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1].updated_at, page[-1].id)
+
+        return ChatSessionPage(
+            sessions=[
+                ChatSessionSummary(
+                    id=row.id,
+                    title=row.title,
+                    created_at=row.created_at,
+                    message_count=row.message_count,
+                    last_message_preview=row.last_message_preview,
+                    last_activity_at=row.updated_at,
+                )
+                for row in page
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def get_session(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        limit: int = 50,
+        before: str | None = None,
+        after: str | None = None,
+    ) -> ChatSessionWithMessages:
+        """Get a session with one page of its messages.
+
+        Without a cursor this is the most recent page. `before` pages back
+        through older messages and `after` forward through newer ones; pages
+        are keyed on (created_at, id).
+        """
+        if before and after:
+            raise ValidationException("Pass either before or after, not both")
+
+        result = await self.db.execute(
+            select(ChatSession.id, ChatSession.title, ChatSession.created_at).where(
+                ChatSession.id == session_id,
+                ChatSession.user_id == user_id,
+            )
+        )
+        session = result.one_or_none()
+        if not session:
+            raise NotFoundException("Chat session")
+
+        key = tuple_(ChatMessage.created_at, ChatMessage.id)
+        query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+        if after:
+            query = query.where(key > decode_cursor(after)).order_by(
+                ChatMessage.created_at, ChatMessage.id
+            )
+        else:
+            if before:
+                query = query.where(key < decode_cursor(before))
+            query = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+
+        rows = list((await self.db.execute(query.limit(limit + 1))).scalars().all())
+        has_more = len(rows) > limit
+        messages = rows[:limit]
+        if not after:
+            messages.reverse()
+
+        # Paging forwards implies older messages exist, and backwards newer ones
+        has_older = has_more if not after else True
+        has_newer = has_more if after else bool(before)
+
+        return ChatSessionWithMessages(
+            id=session.id,
+            title=session.title,
+            created_at=session.created_at,
+            messages=[_message_response(message) for message in messages],
+            older_cursor=(
+                encode_cursor(messages[0].created_at, messages[0].id)
+                if messages and has_older
+                else None
+            ),
+            newer_cursor=(
+                encode_cursor(messages[-1].created_at, messages[-1].id)
+                if messages and has_newer
+                else None
+            ),
+        )
+
+    async def search(
+        self,
+        user_id: uuid.UUID,
+        q: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> ChatSearchPage:
+        """Search a user's messages, best match first, with highlighted snippets.
+
+        Matching and ranking use the GIN-indexed search vector; snippets are
+        only generated for the rows on the requested page.
+        """
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        search_vector = ChatMessage.__table__.c.search_vector
+        rank = func.ts_rank_cd(search_vector, query)
+
+        matches = (
+            select(
+                ChatMessage.id,
+                ChatMessage.session_id,
+                ChatMessage.role,
+                ChatMessage.content,
+                ChatMessage.created_at,
+                ChatSession.title,
+                rank.label("rank"),
+            )
+            .join(ChatSession)
+            .where(ChatSession.user_id == user_id, search_vector.op("@@")(query))
+            .order_by(rank.desc(), ChatMessage.created_at.desc(), ChatMessage.id)
+            .limit(limit + 1)
+            .offset(offset)
+            .subquery()
+        )
+        escaped = func.replace(
+            func.replace(func.replace(matches.c.content, "&", "&amp;"), "<", "&lt;"),
+            ">",
+            "&gt;",
+        )
+        result = await self.db.execute(
+            select(
+                matches.c.id,
+                matches.c.session_id,
+                matches.c.title,
+                matches.c.role,
+                matches.c.created_at,
+                matches.c.rank,
+                func.ts_headline(SEARCH_CONFIG, escaped, query, SNIPPET_OPTIONS).label("snippet"),
+            ).order_by(matches.c.rank.desc(), matches.c.created_at.desc(), matches.c.id)
+        )
+        rows = result.all()
+
+        return ChatSearchPage(
+            results=[
+                ChatSearchResult(
+                    message_id=row.id,
+                    session_id=row.session_id,
+                    session_title=row.title,
+                    role=row.role,
+                    snippet=row.snippet,
+                    rank=row.rank,
+                    created_at=row.created_at,
+                )
+                for row in rows[:limit]
+            ],
+            next_offset=offset + limit if len(rows) > limit else None,
+        )
+
+
+def _tool_results(extra_data: dict, key: str) -> list[dict] | None:
+    """Tool results stored under a key; older messages stored a single result."""
+    results = extra_data.get(key)
+    if results is None or isinstance(results, list):
+        return results
+    return [results]
+
+
+def _message_response(message: ChatMessage) -> ChatMessageResponse:
+    """Convert a stored message, including structured tool results, to its schema."""
+    extra_data = message.extra_data or {}
+    impact_analyses = _tool_results(extra_data, "impactAnalysis")
+    trade_offs = _tool_results(extra_data, "tradeOff")
+    return ChatMessageResponse(
+        id=message.id,
+        role=message.role,
+        content=message.content,
+        type=message.message_type,
+        timestamp=message.created_at,
+        impact_analysis=impact_analyses[0] if impact_analyses else None,
+        impact_analyses=impact_analyses,
+        trade_off=trade_offs[0] if trade_offs else None,
+        trade_offs=trade_offs,
+        quick_actions=extra_data.get("quickActions"),
+    )
@@ -1,16 +1,36 @@
 """Expense service."""
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundException
+from app.core.exceptions import NotFoundException, ValidationException
 from app.models.expense import Expense
 from app.models.expense import ExpenseCategory as ExpenseCategoryModel
 from app.models.pot import Pot
-from app.schemas.expense import ExpenseCategory, ExpenseCreate, ExpenseSummary, ExpenseUpdate
+from app.schemas.expense import (
+    ExpenseCategory,
+    ExpenseCreate,
+    ExpenseSuggestion,
+    ExpenseSummary,
+    ExpenseUpdate,
+)
+from app.services.alerts import AlertEngine
+from app.services.categorizer import MIN_CONFIDENCE, ExpenseCategorizer, learn_expense
+from app.services.insights import InsightService
+from app.services.recurring import SeriesKey, invalidate_series, series_key
+
+# Only expenses from this far back feed autocomplete suggestions
+AUTOCOMPLETE_LOOKBACK = timedelta(days=365)
+
+
+def like_pattern(text: str) -> str:
+    """Substring LIKE pattern matching `text` literally."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 class ExpenseService:
@@ -39,10 +59,15 @@ class ExpenseService:
         start_date: datetime | None = None,
         end_date: datetime | None = None,
         recurring: bool | None = None,
+        q: str | None = None,
         limit: int = 100,
         offset: int = 0,
     ) -> list[Expense]:
-        """List expenses for a user with optional filters."""
+        """List expenses for a user with optional filters.
+
+        `q` matches anywhere in the description, case-insensitively, using
+        the trigram index.
+        """
         query = select(Expense).join(Pot).where(Pot.user_id == user_id)
 
         if pot_id:
@@ -55,27 +80,95 @@ class ExpenseService:
             query = query.where(Expense.date <= end_date)
         if recurring is not None:
             query = query.where(Expense.recurring == recurring)
+        if q:
+            query = query.where(Expense.description.ilike(like_pattern(q), escape="\\"))
 
         query = query.order_by(Expense.date.desc()).limit(limit).offset(offset)
 
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def autocomplete(
+        self,
+        user_id: uuid.UUID,
+        q: str,
+        limit: int = 10,
+    ) -> list[ExpenseSuggestion]:
+        """Suggest past descriptions matching `q`, with their usual category and pot.
+
+        Descriptions are grouped case-insensitively and matched by substring
+        or by trigram word similarity, so small typos still match. Prefix
+        matches come first, then closer and more frequent descriptions.
+        """
+        description_key = func.lower(Expense.description)
+        similarity = func.word_similarity(q, description_key)
+        is_prefix = description_key.startswith(q.lower(), autoescape=True)
+
+        result = await self.db.execute(
+            select(
+                func.array_agg(
+                    aggregate_order_by(Expense.description, Expense.date.desc())
+                )[1].label("description"),
+                func.mode().within_group(Expense.category).label("category"),
+                func.mode().within_group(Expense.pot_id).label("pot_id"),
+                func.count().label("use_count"),
+                func.max(Expense.date).label("last_used_at"),
+            )
+            .join(Pot)
+            .where(
+                Pot.user_id == user_id,
+                Expense.date >= datetime.now(timezone.utc) - AUTOCOMPLETE_LOOKBACK,
+                Expense.description.ilike(like_pattern(q), escape="\\")
+                | literal(q).op("<%")(Expense.description),
+            )
+            .group_by(description_key)
+            .order_by(
+                is_prefix.desc(),
+                similarity.desc(),
+                func.count().desc(),
+                func.max(Expense.date).desc(),
+            )
+            .limit(limit)
+        )
+        return [
+            ExpenseSuggestion(
+                description=row.description,
+                category=ExpenseCategory(row.category.value),
+                pot_id=row.pot_id,
+                use_count=row.use_count,
+                last_used_at=row.last_used_at,
+            )
+            for row in result.all()
+        ]
+
     async def create(self, user_id: uuid.UUID, data: ExpenseCreate) -> Expense:
-        """Create a new expense."""
+        """Create a new expense, suggesting its category and pot when omitted."""
+        category = data.category
+        pot_id = data.pot_id
+        if category is None or pot_id is None:
+            suggestion = await ExpenseCategorizer(self.db).suggest(
+                user_id, data.description, min_confidence=MIN_CONFIDENCE
+            )
+            category = category or suggestion.category or ExpenseCategory.OTHER
+            pot_id = pot_id or suggestion.pot_id
+            if pot_id is None:
+                raise ValidationException(
+                    "potId is required; no pot could be suggested confidently"
+                )
+
         # Verify pot belongs to user
         result = await self.db.execute(
-            select(Pot).where(Pot.id == data.pot_id, Pot.user_id == user_id)
+            select(Pot).where(Pot.id == pot_id, Pot.user_id == user_id)
         )
         pot = result.scalar_one_or_none()
         if not pot:
             raise NotFoundException("Pot")
 
         expense = Expense(
-            pot_id=data.pot_id,
+            pot_id=pot_id,
             description=data.description,
             amount=data.amount,
-            category=ExpenseCategoryModel(data.category.value),
+            category=ExpenseCategoryModel(category.value),
             date=data.date,
             recurring=data.recurring,
             notes=data.notes,
@@ -85,7 +178,13 @@ class ExpenseService:
         # Deduct from pot
         pot.current_amount = float(pot.current_amount) - data.amount
 
+        if data.recurring:
+            invalidate_series(user_id, [series_key(pot_id, data.description)])
+        learn_expense(self.db, user_id, expense.description, expense.category, pot_id)
+
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_pot(pot)
+        await InsightService(self.db).schedule_refresh(user_id)
         await self.db.refresh(expense)
         return expense
 
@@ -93,8 +192,13 @@ class ExpenseService:
         """Update an expense."""
         update_data = data.model_dump(exclude_unset=True, by_alias=False)
 
+        old_key = series_key(expense.pot_id, expense.description)
+        was_recurring = expense.recurring
+        old_labels = (expense.description, expense.category, expense.pot_id)
+
         # Handle pot change
         old_amount = expense.amount
+        changed_pots: list[Pot] = []
         if "pot_id" in update_data and update_data["pot_id"] != expense.pot_id:
             # Return amount to old pot
             old_pot_result = await self.db.execute(
@@ -110,6 +214,7 @@ class ExpenseService:
             new_pot = new_pot_result.scalar_one()
             new_amount = update_data.get("amount", old_amount)
             new_pot.current_amount = float(new_pot.current_amount) - new_amount
+            changed_pots.extend([old_pot, new_pot])
         elif "amount" in update_data:
             # Just update amount in current pot
             pot_result = await self.db.execute(
@@ -118,13 +223,32 @@ class ExpenseService:
             pot = pot_result.scalar_one()
             amount_diff = update_data["amount"] - old_amount
             pot.current_amount = float(pot.current_amount) - amount_diff
+            changed_pots.append(pot)
 
         for field, value in update_data.items():
             if field == "category" and value is not None:
                 value = ExpenseCategoryModel(value.value)
             setattr(expense, field, value)
 
+        if was_recurring or expense.recurring:
+            await self._invalidate_recurring(
+                expense.pot_id,
+                [old_key, series_key(expense.pot_id, expense.description)],
+            )
+
+        new_labels = (expense.description, expense.category, expense.pot_id)
+        if new_labels != old_labels:
+            user_id = await self.db.scalar(select(Pot.user_id).where(Pot.id == expense.pot_id))
+            learn_expense(self.db, user_id, *old_labels, weight=-1)
+            learn_expense(self.db, user_id, *new_labels)
+
         await self.db.flush()
+
+        alerts = AlertEngine(self.db)
+        for pot in changed_pots:
+            await alerts.evaluate_pot(pot)
+        await InsightService(self.db).schedule_refresh_for_pot(expense.pot_id)
+
         await self.db.refresh(expense)
         return expense
 
@@ -137,8 +261,22 @@ class ExpenseService:
         pot = pot_result.scalar_one()
         pot.current_amount = float(pot.current_amount) + float(expense.amount)
 
+        if expense.recurring:
+            invalidate_series(pot.user_id, [series_key(expense.pot_id, expense.description)])
+        learn_expense(
+            self.db, pot.user_id, expense.description, expense.category, expense.pot_id, weight=-1
+        )
+
         await self.db.delete(expense)
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_pot(pot)
+        await InsightService(self.db).schedule_refresh(pot.user_id)
+
+    async def _invalidate_recurring(self, pot_id: uuid.UUID, keys: list[SeriesKey]) -> None:
+        """Mark recurring series touched by a write for recomputation."""
+        user_id = await self.db.scalar(select(Pot.user_id).where(Pot.id == pot_id))
+        if user_id is not None:
+            invalidate_series(user_id, keys)
 
     async def get_summary(
         self,
@@ -0,0 +1,143 @@
+"""Goal completion forecasts from the contribution ledger."""
+
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.goal import Goal, GoalContribution
+
+SECONDS_PER_DAY = 86_400.0
+# Contributions older than this do not count towards the current velocity
+LOOKBACK_DAYS = 90
+CACHE_TTL_SECONDS = 3600.0
+CACHE_MAX_ENTRIES = 1024
+
+
+@dataclass
+class GoalForecast:
+    """Contribution velocity and projected completion for a goal."""
+
+    goal_id: uuid.UUID
+    velocity: float
+    days_to_complete: float | None
+    projected_completion: datetime | None
+    on_track: bool | None
+
+    def delay_days(self, amount: float) -> int | None:
+        """Days of contributions at the current velocity needed to make up `amount`."""
+        if self.velocity <= 0:
+            return None
+        return int(amount / self.velocity)
+
+
+def forecast_goals(
+    goals: Sequence[Goal],
+    contributions: Sequence[tuple[uuid.UUID, float, datetime]],
+    now: datetime,
+    lookback_days: int = LOOKBACK_DAYS,
+) -> dict[uuid.UUID, GoalForecast]:
+    """Forecast all goals at once from their (goal_id, amount, created_at) contributions.
+
+    Velocity is the amount contributed per day over the lookback window, or
+    over the goal's lifetime if it is younger. Goals with no recent
+    contributions have zero velocity and no projected completion.
+    """
+    if not goals:
+        return {}
+
+    index = {goal.id: i for i, goal in enumerate(goals)}
+    now_ts = now.timestamp()
+    target = np.array([float(goal.target_amount) for goal in goals])
+    current = np.array([float(goal.current_amount) for goal in goals])
+    created = np.array([goal.created_at.timestamp() for goal in goals])
+    deadline = np.array(
+        [goal.deadline.timestamp() if goal.deadline else np.nan for goal in goals]
+    )
+
+    rows = [row for row in contributions if row[0] in index]
+    goal_index = np.array([index[row[0]] for row in rows], dtype=np.intp)
+    amounts = np.array([float(row[1]) for row in rows])
+    times = np.array([row[2].timestamp() for row in rows])
+
+    window_start = np.maximum(created, now_ts - lookback_days * SECONDS_PER_DAY)
+    in_window = times >= window_start[goal_index]
+    contributed = np.bincount(
+        goal_index,
+        weights=np.where(in_window, amounts, 0.0),
+        minlength=len(goals),
+    )
+    window_days = np.maximum((now_ts - window_start) / SECONDS_PER_DAY, 1.0)
+    velocity = contributed / window_days
+
+    remaining = np.maximum(target - current, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(remaining > 0, remaining / velocity, 0.0)
+    completion = now_ts + days * SECONDS_PER_DAY
+    progressing = (remaining > 0) & np.isfinite(days)
+    has_deadline = ~np.isnan(deadline)
+    on_track = (remaining <= 0) | (progressing & (completion <= deadline))
+
+    return {
+        goal.id: GoalForecast(
+            goal_id=goal.id,
+            velocity=float(velocity[i]),
+            days_to_complete=float(days[i]) if np.isfinite(days[i]) else None,
+            projected_completion=(
+                datetime.fromtimestamp(completion[i], tz=timezone.utc) if progressing[i] else None
+            ),
+            on_track=bool(on_track[i]) if has_deadline[i] else None,
+        )
+        for i, goal in enumerate(goals)
+    }
+
+
+# (goal_id, updated_at) pairs -> (computed at, forecasts)
+_cache: OrderedDict[tuple, tuple[float, dict[uuid.UUID, GoalForecast]]] = OrderedDict()
+
+
+class GoalForecaster:
+    """Forecasts goals from the contribution ledger, with caching.
+
+    Results are cached per set of goals, keyed on each goal's id and
+    `updated_at`. A contribution updates its goal's row, so the next lookup
+    after one recomputes; entries also expire as the lookback window moves.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def forecast(self, goals: Sequence[Goal]) -> dict[uuid.UUID, GoalForecast]:
+        """Forecast the given goals, reading their recent contributions."""
+        if not goals:
+            return {}
+
+        key = tuple(sorted((goal.id, goal.updated_at) for goal in goals))
+        cached = _cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+            _cache.move_to_end(key)
+            return cached[1]
+
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(
+                GoalContribution.goal_id,
+                GoalContribution.amount,
+                GoalContribution.created_at,
+            ).where(
+                GoalContribution.goal_id.in_([goal.id for goal in goals]),
+                GoalContribution.created_at >= now - timedelta(days=LOOKBACK_DAYS),
+            )
+        )
+        forecasts = forecast_goals(goals, [tuple(row) for row in result.all()], now)
+
+        _cache[key] = (time.monotonic(), forecasts)
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+        return forecasts
@@ -9,6 +9,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import NotFoundException, ValidationException
 from app.models.goal import Goal, Milestone
+from app.models.goal import GoalContribution as GoalContributionModel
 from app.models.goal import GoalPriority as GoalPriorityModel
 from app.models.goal import GoalStatus as GoalStatusModel
 from app.models.pot import Pot
@@ -19,6 +20,8 @@ from app.schemas.goal import (
     MilestoneCreate,
     MilestoneUpdate,
 )
+from app.services.alerts import AlertEngine
+from app.services.insights import InsightService
 
 
 class GoalService:
@@ -85,6 +88,7 @@ class GoalService:
             self.db.add(milestone)
 
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_goal(goal)
         await self.db.refresh(goal)
         return goal
 
@@ -98,6 +102,7 @@ class GoalService:
                 value = GoalStatusModel(value.value)
             setattr(goal, field, value)
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_goal(goal)
         await self.db.refresh(goal)
         return goal
 
@@ -111,11 +116,13 @@ class GoalService:
         goal: Goal,
         data: GoalContribution,
     ) -> Goal:
-        """Add funds to a goal."""
+        """Add funds to a goal and record the contribution in the ledger."""
         goal.current_amount = float(goal.current_amount) + data.amount
+        self.db.add(GoalContributionModel(goal_id=goal.id, amount=data.amount))
 
         # Check if goal is completed
-        if goal.current_amount >= goal.target_amount:
+        completed = goal.current_amount >= goal.target_amount
+        if completed:
             goal.status = GoalStatusModel.COMPLETED
 
         # Update milestones
@@ -125,6 +132,8 @@ class GoalService:
                 milestone.completed_at = datetime.now(timezone.utc)
 
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_goal(goal)
+        await InsightService(self.db).schedule_refresh_for_pot(goal.pot_id)
         await self.db.refresh(goal)
         return goal
 
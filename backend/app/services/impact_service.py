@@ -1,8 +1,11 @@
 """Impact analysis service."""
 
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -10,6 +13,17 @@ from sqlalchemy.orm import selectinload
 from app.models.goal import Goal
 from app.models.pot import Pot
 from app.schemas.chat import GoalImpact, ImpactAnalysis, PotImpact, TradeOff, TradeOffOption
+from app.services.goal_forecast import GoalForecaster
+from app.services.recurring import RecurringProjectionService
+
+
+@dataclass
+class PurchaseScenario:
+    """A candidate purchase to analyze."""
+
+    amount: float
+    pot_id: uuid.UUID | None = None
+    description: str = "Purchase"
 
 
 class ImpactService:
@@ -26,6 +40,23 @@ class ImpactService:
         description: str = "Purchase",
     ) -> ImpactAnalysis:
         """Analyze the impact of a potential purchase on pots and goals."""
+        results = await self.analyze_purchases(
+            user_id,
+            [PurchaseScenario(amount=amount, pot_id=pot_id, description=description)],
+        )
+        return results[0]
+
+    async def analyze_purchases(
+        self,
+        user_id: uuid.UUID,
+        scenarios: Sequence[PurchaseScenario],
+    ) -> list[ImpactAnalysis]:
+        """Analyze several candidate purchases against the same pots and goals.
+
+        State is loaded once and every scenario is evaluated with array
+        operations over pots and goals. A scenario without a pot is checked
+        against every pot.
+        """
         # Get all pots for the user
         pots_result = await self.db.execute(
             select(Pot)
@@ -33,80 +64,86 @@ class ImpactService:
             .options(selectinload(Pot.goals))
         )
         pots = list(pots_result.scalars().all())
+        forecasts = await GoalForecaster(self.db).forecast(
+            [goal for pot in pots for goal in pot.goals]
+        )
+        commitments = await RecurringProjectionService(self.db).get_commitments(user_id)
 
-        pot_impacts: list[PotImpact] = []
-        goal_impacts: list[GoalImpact] = []
+        # Active goals, in pot order, with the index of their pot
+        goals = [
+            (pot_index, goal)
+            for pot_index, pot in enumerate(pots)
+            for goal in pot.goals
+            if goal.status.value == "active"
+        ]
 
-        # Analyze impact on pots
-        for pot in pots:
-            current_amount = float(pot.current_amount)
-
-            # Check if this pot would be affected
-            if pot_id is None or pot.id == pot_id:
-                projected_amount = current_amount - amount
-                change = -amount
-
-                pot_impacts.append(
-                    PotImpact(
-                        pot_id=pot.id,
-                        pot_name=pot.name,
-                        current_amount=current_amount,
-                        projected_amount=max(0, projected_amount),
-                        change=change,
-                    )
-                )
+        pot_balances = np.array([float(pot.current_amount) for pot in pots])
+        amounts = np.array([scenario.amount for scenario in scenarios])
 
-                # Analyze impact on goals within this pot
-                for goal in pot.goals:
-                    if goal.status.value != "active":
-                        continue
-
-                    target = float(goal.target_amount)
-                    current_goal = float(goal.current_amount)
-                    current_progress = (current_goal / target * 100) if target > 0 else 0
-
-                    # Calculate delay if applicable
-                    delay_days = None
-                    if goal.deadline:
-                        now = datetime.now(timezone.utc)
-                        remaining_days = (goal.deadline - now).days
-                        if remaining_days > 0:
-                            remaining_amount = target - current_goal
-                            daily_rate = remaining_amount / remaining_days
-                            if daily_rate > 0:
-                                delay_days = int(amount / daily_rate)
-
-                    goal_impacts.append(
-                        GoalImpact(
-                            goal_id=goal.id,
-                            goal_title=goal.title,
-                            current_progress=current_progress,
-                            projected_progress=current_progress,  # No change to current
-                            delay_days=delay_days,
-                        )
-                    )
-            else:
-                pot_impacts.append(
-                    PotImpact(
-                        pot_id=pot.id,
-                        pot_name=pot.name,
-                        current_amount=current_amount,
-                        projected_amount=current_amount,
-                        change=0,
-                    )
-                )
+        # affected[s, p]: whether scenario s draws from pot p
+        pot_positions = {pot.id: i for i, pot in enumerate(pots)}
+        affected = np.zeros((len(scenarios), len(pots)), dtype=bool)
+        for s, scenario in enumerate(scenarios):
+            if scenario.pot_id is None:
+                affected[s] = True
+            elif scenario.pot_id in pot_positions:
+                affected[s, pot_positions[scenario.pot_id]] = True
 
-        # Generate recommendation
-        recommendation = self._generate_recommendation(
-            amount, pot_impacts, goal_impacts
-        )
+        changes = np.where(affected, -amounts[:, None], 0.0)
+        projected = pot_balances + changes
 
-        return ImpactAnalysis(
-            action=description,
-            pot_impacts=pot_impacts,
-            goal_impacts=goal_impacts,
-            recommendation=recommendation,
+        # Delay at the goal's contribution velocity, falling back to the rate
+        # needed to meet the deadline for goals without history
+        now = datetime.now(timezone.utc)
+        targets = np.array([float(goal.target_amount) for _, goal in goals])
+        saved = np.array([float(goal.current_amount) for _, goal in goals])
+        velocity = np.array([forecasts[goal.id].velocity for _, goal in goals])
+        days_left = np.array(
+            [(goal.deadline - now).days if goal.deadline else 0 for _, goal in goals]
         )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            required_rate = np.where(days_left > 0, (targets - saved) / days_left, 0.0)
+            daily_rate = np.where(velocity > 0, velocity, required_rate)
+            delays = np.where(daily_rate > 0, amounts[:, None] / daily_rate, np.nan)
+            progress = np.where(targets > 0, saved / targets * 100, 0.0)
+        goal_affected = affected[:, [pot_index for pot_index, _ in goals]]
+
+        results: list[ImpactAnalysis] = []
+        for s, scenario in enumerate(scenarios):
+            pot_impacts = [
+                PotImpact(
+                    pot_id=pot.id,
+                    pot_name=pot.name,
+                    current_amount=float(pot_balances[p]),
+                    projected_amount=max(0.0, float(projected[s, p])),
+                    change=float(changes[s, p]),
+                    upcoming_commitments=commitments.get(pot.id, 0.0),
+                )
+                for p, pot in enumerate(pots)
+            ]
+            goal_impacts = [
+                GoalImpact(
+                    goal_id=goal.id,
+                    goal_title=goal.title,
+                    current_progress=float(progress[g]),
+                    projected_progress=float(progress[g]),  # No change to current
+                    delay_days=int(delays[s, g]) if np.isfinite(delays[s, g]) else None,
+                )
+                for g, (_, goal) in enumerate(goals)
+                if goal_affected[s, g]
+            ]
+            results.append(
+                ImpactAnalysis(
+                    action=scenario.description,
+                    pot_impacts=pot_impacts,
+                    goal_impacts=goal_impacts,
+                    recommendation=self._generate_recommendation(
+                        scenario.amount, pot_impacts, goal_impacts
+                    ),
+                )
+            )
+
+        return results
 
     def _generate_recommendation(
         self,
@@ -117,12 +154,25 @@ class ImpactService:
         """Generate a recommendation based on impact analysis."""
         # Check for insufficient funds
         for impact in pot_impacts:
-            if impact.change < 0 and impact.projected_amount < 0:
+            if impact.change < 0 and impact.current_amount + impact.change < 0:
                 return (
                     f"This purchase would overdraw your {impact.pot_name} pot. "
                     "Consider reducing the amount or using a different pot."
                 )
 
+        # Check for recurring expenses due before the next month
+        short_pots = [
+            p for p in pot_impacts
+            if p.change < 0 and p.current_amount + p.change < p.upcoming_commitments
+        ]
+        if short_pots:
+            pot = short_pots[0]
+            return (
+                f"After this purchase, your {pot.pot_name} pot won't cover the "
+                f"${pot.upcoming_commitments:.2f} of recurring expenses due in the "
+                "next 30 days."
+            )
+
         # Check for goal delays
         delayed_goals = [g for g in goal_impacts if g.delay_days and g.delay_days > 7]
         if delayed_goals:
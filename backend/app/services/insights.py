@@ -0,0 +1,216 @@
+"""Precomputed financial insights.
+
+Insights are computed for batches of users with set-based queries and
+stored, so reads are a single indexed lookup. The batch job refreshes every
+user periodically; expense and contribution writes queue a refresh of just
+that user.
+"""
+
+import uuid
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.queue import JobQueue
+from app.models.alert import Alert, AlertRule
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.goal import GoalStatus as GoalStatusModel
+from app.models.insight import Insight, InsightType
+from app.models.pot import Pot
+from app.models.pot import PotCategory as PotCategoryModel
+from app.models.user import User
+
+# Namespace for deriving stable insight ids from a user and an insight key
+INSIGHT_NAMESPACE = uuid.UUID("f1a69e14-44be-4177-a5ce-0f2712e00c6a")
+
+# Maximum insights kept per user
+MAX_INSIGHTS = 5
+
+# Recent expenses averaged for the spending pattern insight
+RECENT_EXPENSES = 10
+
+
+def insight_id(user_id: uuid.UUID, key: str) -> uuid.UUID:
+    """Stable id for the insight identified by `key` for a user."""
+    return uuid.uuid5(INSIGHT_NAMESPACE, f"{user_id}:{key}")
+
+
+class InsightService:
+    """Service for computing and reading precomputed insights."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_for_user(self, user_id: uuid.UUID) -> list[Insight]:
+        """Get a user's precomputed insights."""
+        result = await self.db.execute(
+            select(Insight)
+            .where(Insight.user_id == user_id)
+            .order_by(Insight.position)
+            .limit(MAX_INSIGHTS)
+        )
+        return list(result.scalars().all())
+
+    async def refresh(self, user_ids: Sequence[uuid.UUID]) -> int:
+        """Recompute and store insights for a batch of users.
+
+        Insights are upserted by their stable ids, so concurrent refreshes of
+        the same user do not conflict, and then the users' insights not
+        recomputed in this transaction are removed.
+
+        Returns the number of insights stored.
+        """
+        rows = await self.compute(user_ids)
+        if rows:
+            statement = insert(Insight)
+            await self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[Insight.id],
+                    set_={
+                        "position": statement.excluded.position,
+                        "title": statement.excluded.title,
+                        "description": statement.excluded.description,
+                        "type": statement.excluded.type,
+                        "created_at": statement.excluded.created_at,
+                        "computed_at": func.now(),
+                    },
+                ),
+                rows,
+            )
+        # now() is the transaction start, which every upserted row carries
+        await self.db.execute(
+            delete(Insight).where(
+                Insight.user_id.in_(user_ids),
+                Insight.computed_at < func.now(),
+            )
+        )
+        return len(rows)
+
+    async def schedule_refresh(self, user_id: uuid.UUID) -> None:
+        """Queue a recompute of a user's insights, unless one is already queued."""
+        await JobQueue(self.db).enqueue(
+            "insights.refresh",
+            {"user_id": str(user_id)},
+            dedupe_key=f"insights.refresh:{user_id}",
+        )
+
+    async def schedule_refresh_for_pot(self, pot_id: uuid.UUID) -> None:
+        """Queue a recompute of insights for the owner of a pot."""
+        user_id = await self.db.scalar(select(Pot.user_id).where(Pot.id == pot_id))
+        if user_id is not None:
+            await self.schedule_refresh(user_id)
+
+    async def compute(self, user_ids: Sequence[uuid.UUID]) -> list[dict]:
+        """Compute insight rows for a batch of users."""
+        currencies = dict(
+            (await self.db.execute(
+                select(User.id, User.currency).where(User.id.in_(user_ids))
+            )).all()
+        )
+        insights: dict[uuid.UUID, list[dict]] = defaultdict(list)
+
+        def add(
+            user_id: uuid.UUID,
+            key: str,
+            title: str,
+            description: str,
+            type: InsightType,
+            created_at: datetime,
+        ) -> None:
+            insights[user_id].append({
+                "id": insight_id(user_id, key),
+                "user_id": user_id,
+                "title": title,
+                "description": description,
+                "type": type,
+                "created_at": created_at,
+            })
+
+        # Spending pattern: average of each user's most recent expenses
+        ranked = (
+            select(
+                Pot.user_id,
+                Expense.amount,
+                Expense.created_at,
+                func.row_number()
+                .over(partition_by=Pot.user_id, order_by=Expense.date.desc())
+                .label("rank"),
+            )
+            .join(Pot)
+            .where(Pot.user_id.in_(user_ids))
+            .subquery()
+        )
+        spending = await self.db.execute(
+            select(
+                ranked.c.user_id,
+                func.avg(ranked.c.amount),
+                func.max(ranked.c.created_at).filter(ranked.c.rank == 1),
+            )
+            .where(ranked.c.rank <= RECENT_EXPENSES)
+            .group_by(ranked.c.user_id)
+        )
+        for user_id, avg_expense, created_at in spending.all():
+            add(
+                user_id,
+                "spending_pattern",
+                "Spending Pattern",
+                f"Your average expense is {currencies[user_id]}{float(avg_expense):.2f}. "
+                "Consider if each purchase aligns with your goals.",
+                InsightType.TIP,
+                created_at,
+            )
+
+        # Goal progress: each user's active goal closest to completion
+        remaining = Goal.target_amount - Goal.current_amount
+        closest = await self.db.execute(
+            select(Pot.user_id, Goal.id, Goal.title, Goal.created_at, remaining)
+            .join(Pot)
+            .where(Pot.user_id.in_(user_ids), Goal.status == GoalStatusModel.ACTIVE)
+            .distinct(Pot.user_id)
+            .order_by(Pot.user_id, remaining)
+        )
+        for user_id, goal_id, title, created_at, amount in closest.all():
+            add(
+                user_id,
+                f"goal:{goal_id}",
+                "Almost There!",
+                f"You're {currencies[user_id]}{float(amount):.2f} away from "
+                f"completing '{title}'. Keep going!",
+                InsightType.ACHIEVEMENT,
+                created_at,
+            )
+
+        # Low balance warnings for necessities pots
+        low_pots = await self.db.execute(
+            select(Pot.user_id, Pot.id, Pot.name, Alert.triggered_at)
+            .join(Alert, Alert.pot_id == Pot.id)
+            .where(
+                Pot.user_id.in_(user_ids),
+                Pot.category == PotCategoryModel.NECESSITIES,
+                Alert.rule == AlertRule.LOW_BALANCE,
+                Alert.goal_id.is_(None),
+                Alert.active.is_(True),
+            )
+            .order_by(Pot.user_id, Alert.triggered_at)
+        )
+        for user_id, pot_id, name, triggered_at in low_pots.all():
+            add(
+                user_id,
+                f"low_balance:{pot_id}",
+                "Low Balance Alert",
+                f"Your {name} pot is running low. "
+                "Consider transferring funds or reducing spending.",
+                InsightType.WARNING,
+                triggered_at,
+            )
+
+        rows = []
+        for user_insights in insights.values():
+            for position, row in enumerate(user_insights[:MAX_INSIGHTS]):
+                rows.append({**row, "position": position})
+        return rows
@@ -9,6 +9,9 @@ from app.core.exceptions import NotFoundException, ValidationException
 from app.models.pot import Pot
 from app.models.pot import PotCategory as PotCategoryModel
 from app.schemas.pot import PotCreate, PotTransfer, PotUpdate
+from app.services.alerts import AlertEngine
+from app.services.categorizer import forget_user
+from app.services.insights import InsightService
 
 
 class PotService:
@@ -48,6 +51,8 @@ class PotService:
         )
         self.db.add(pot)
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_pot(pot)
+        await InsightService(self.db).schedule_refresh(user_id)
         await self.db.refresh(pot)
         return pot
 
@@ -59,6 +64,8 @@ class PotService:
                 value = PotCategoryModel(value.value)
             setattr(pot, field, value)
         await self.db.flush()
+        await AlertEngine(self.db).evaluate_pot(pot)
+        await InsightService(self.db).schedule_refresh(pot.user_id)
         await self.db.refresh(pot)
         return pot
 
@@ -66,6 +73,8 @@ class PotService:
         """Delete a pot."""
         await self.db.delete(pot)
         await self.db.flush()
+        forget_user(self.db, pot.user_id)
+        await InsightService(self.db).schedule_refresh(pot.user_id)
 
     async def transfer(
         self,
@@ -89,6 +98,12 @@ class PotService:
         to_pot.current_amount = float(to_pot.current_amount) + data.amount
 
         await self.db.flush()
+
+        alerts = AlertEngine(self.db)
+        await alerts.evaluate_pot(from_pot)
+        await alerts.evaluate_pot(to_pot)
+        await InsightService(self.db).schedule_refresh(user_id)
+
         await self.db.refresh(from_pot)
         await self.db.refresh(to_pot)
 
@@ -0,0 +1,319 @@
+"""Projection of recurring expenses into a forward cash-flow calendar."""
+
+import calendar
+import statistics
+import uuid
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.expense import Expense
+from app.models.pot import Pot
+from app.schemas.expense import CashFlowCalendar, ExpenseCategory, PotCashFlow, UpcomingExpense
+
+# Recurring expenses are grouped into series by pot and normalized description
+SeriesKey = tuple[uuid.UUID, str]
+
+CACHE_MAX_USERS = 1024
+
+
+def series_key(pot_id: uuid.UUID, description: str) -> SeriesKey:
+    """Key of the series an expense belongs to."""
+    return pot_id, " ".join(description.lower().split())
+
+
+@dataclass(frozen=True)
+class Period:
+    """Interval between occurrences, in days or calendar months."""
+
+    name: str
+    days: int = 0
+    months: int = 0
+
+    def step(self, start: date, anchor_day: int, count: int = 1) -> date:
+        """The date `count` periods after `start`, keeping the anchor day for months."""
+        if not self.months:
+            return start + timedelta(days=self.days * count)
+        month_index = start.year * 12 + start.month - 1 + self.months * count
+        year, month = divmod(month_index, 12)
+        last_day = calendar.monthrange(year, month + 1)[1]
+        return date(year, month + 1, min(anchor_day, last_day))
+
+
+WEEKLY = Period("weekly", days=7)
+BIWEEKLY = Period("biweekly", days=14)
+MONTHLY = Period("monthly", months=1)
+QUARTERLY = Period("quarterly", months=3)
+YEARLY = Period("yearly", months=12)
+
+
+def infer_period(dates: list[date]) -> Period:
+    """Snap the median gap between occurrences to the nearest common period.
+
+    A single occurrence is assumed to be monthly.
+    """
+    if len(dates) < 2:
+        return MONTHLY
+    gap = statistics.median((b - a).days for a, b in zip(dates, dates[1:]))
+    if gap <= 10:
+        return WEEKLY
+    if gap <= 20:
+        return BIWEEKLY
+    if gap <= 45:
+        return MONTHLY
+    if gap <= 135:
+        return QUARTERLY
+    return YEARLY
+
+
+def infer_anchor_day(dates: list[date]) -> int:
+    """Day of the month that monthly occurrences fall on.
+
+    The most common day wins, ties going to the later day. An occurrence on
+    the last day of a short month also counts towards any later day, as
+    that is where a later anchor day is clamped to.
+    """
+
+    def votes(day: int) -> int:
+        return sum(
+            d.day == day or (d.day < day and d.day == calendar.monthrange(d.year, d.month)[1])
+            for d in dates
+        )
+
+    return max({d.day for d in dates}, key=lambda day: (votes(day), day))
+
+
+@dataclass
+class RecurringSeries:
+    """A recurring expense inferred from its past occurrences."""
+
+    key: SeriesKey
+    pot_id: uuid.UUID
+    description: str
+    category: str
+    amount: float
+    period: Period
+    last_date: date
+    anchor_day: int
+    occurrences: int
+    last_updated: datetime
+
+    @classmethod
+    def from_expenses(cls, key: SeriesKey, expenses: list[Expense]) -> "RecurringSeries":
+        """Build a series from its occurrences, ordered by date."""
+        latest = expenses[-1]
+        dates = [expense.date.date() for expense in expenses]
+        return cls(
+            key=key,
+            pot_id=latest.pot_id,
+            description=latest.description,
+            category=latest.category.value,
+            amount=float(latest.amount),
+            period=infer_period(dates),
+            last_date=dates[-1],
+            anchor_day=infer_anchor_day(dates),
+            occurrences=len(expenses),
+            last_updated=max(expense.updated_at for expense in expenses),
+        )
+
+    def is_active(self, today: date) -> bool:
+        """Whether the series still appears to be running (missed at most one period)."""
+        return self.period.step(self.last_date, self.anchor_day, 2) >= today
+
+    def upcoming(self, start: date, end: date) -> Iterable[date]:
+        """Projected dates in [start, end)."""
+        count = 1
+        next_date = self.period.step(self.last_date, self.anchor_day, count)
+        while next_date < end:
+            if next_date >= start:
+                yield next_date
+            count += 1
+            next_date = self.period.step(self.last_date, self.anchor_day, count)
+
+
+@dataclass
+class CashFlowEvent:
+    """A projected occurrence of a recurring expense."""
+
+    date: date
+    pot_id: uuid.UUID
+    description: str
+    category: str
+    amount: float
+    period: str
+
+
+@dataclass
+class _UserSeries:
+    series: dict[SeriesKey, RecurringSeries]
+    dirty: set[SeriesKey] = field(default_factory=set)
+
+
+# user_id -> inferred series, least recently used first
+_cache: OrderedDict[uuid.UUID, _UserSeries] = OrderedDict()
+
+
+def invalidate_series(user_id: uuid.UUID, keys: Iterable[SeriesKey]) -> None:
+    """Mark series touched by a write so the next read recomputes only them."""
+    cached = _cache.get(user_id)
+    if cached is not None:
+        cached.dirty.update(keys)
+
+
+class RecurringProjectionService:
+    """Expands recurring expenses into upcoming cash flows.
+
+    Inferred series are cached per user. Writes mark their series dirty and
+    only those are re-queried; a cheap (count, latest update) check over the
+    user's recurring expenses catches changes made by other workers, which
+    trigger a full rebuild.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_series(self, user_id: uuid.UUID) -> list[RecurringSeries]:
+        """Current recurring series for a user."""
+        version_result = await self.db.execute(
+            select(func.count(Expense.id), func.max(Expense.updated_at))
+            .join(Pot)
+            .where(Pot.user_id == user_id, Expense.recurring.is_(True))
+        )
+        version = tuple(version_result.one())
+
+        cached = _cache.get(user_id)
+        if cached is not None and cached.dirty:
+            await self._refresh(user_id, cached)
+        if cached is None or self._version(cached.series) != version:
+            cached = _UserSeries(series=await self._load(user_id))
+
+        _cache[user_id] = cached
+        _cache.move_to_end(user_id)
+        if len(_cache) > CACHE_MAX_USERS:
+            _cache.popitem(last=False)
+        return list(cached.series.values())
+
+    async def get_calendar(
+        self,
+        user_id: uuid.UUID,
+        months: int = 3,
+        today: date | None = None,
+    ) -> list[CashFlowEvent]:
+        """Projected recurring expenses from today for the next `months` months."""
+        today = today or datetime.now(timezone.utc).date()
+        end = MONTHLY.step(today, today.day, months)
+        events = [
+            CashFlowEvent(
+                date=when,
+                pot_id=series.pot_id,
+                description=series.description,
+                category=series.category,
+                amount=series.amount,
+                period=series.period.name,
+            )
+            for series in await self.get_series(user_id)
+            if series.is_active(today)
+            for when in series.upcoming(today, end)
+        ]
+        return sorted(events, key=lambda event: event.date)
+
+    async def get_cash_flow(self, user_id: uuid.UUID, months: int = 3) -> CashFlowCalendar:
+        """Upcoming recurring expenses and each pot's balance after them."""
+        today = datetime.now(timezone.utc).date()
+        events = await self.get_calendar(user_id, months, today)
+
+        pots_result = await self.db.execute(select(Pot).where(Pot.user_id == user_id))
+        committed: dict[uuid.UUID, float] = defaultdict(float)
+        for event in events:
+            committed[event.pot_id] += event.amount
+
+        return CashFlowCalendar(
+            start_date=today,
+            end_date=MONTHLY.step(today, today.day, months),
+            events=[
+                UpcomingExpense(
+                    date=event.date,
+                    pot_id=event.pot_id,
+                    description=event.description,
+                    category=ExpenseCategory(event.category),
+                    amount=event.amount,
+                    period=event.period,
+                )
+                for event in events
+            ],
+            pots=[
+                PotCashFlow(
+                    pot_id=pot.id,
+                    pot_name=pot.name,
+                    current_amount=float(pot.current_amount),
+                    committed_amount=committed[pot.id],
+                    projected_amount=float(pot.current_amount) - committed[pot.id],
+                )
+                for pot in pots_result.scalars().all()
+            ],
+        )
+
+    async def get_commitments(
+        self,
+        user_id: uuid.UUID,
+        days: int = 30,
+    ) -> dict[uuid.UUID, float]:
+        """Total projected recurring spending per pot over the next `days` days."""
+        today = datetime.now(timezone.utc).date()
+        end = today + timedelta(days=days)
+        commitments: dict[uuid.UUID, float] = defaultdict(float)
+        for series in await self.get_series(user_id):
+            if series.is_active(today):
+                for _ in series.upcoming(today, end):
+                    commitments[series.pot_id] += series.amount
+        return commitments
+
+    @staticmethod
+    def _version(series: dict[SeriesKey, RecurringSeries]) -> tuple[int, datetime | None]:
+        if not series:
+            return 0, None
+        return (
+            sum(s.occurrences for s in series.values()),
+            max(s.last_updated for s in series.values()),
+        )
+
+    async def _load(self, user_id: uuid.UUID) -> dict[SeriesKey, RecurringSeries]:
+        result = await self.db.execute(
+            select(Expense)
+            .join(Pot)
+            .where(Pot.user_id == user_id, Expense.recurring.is_(True))
+            .order_by(Expense.date)
+        )
+        grouped: dict[SeriesKey, list[Expense]] = defaultdict(list)
+        for expense in result.scalars().all():
+            grouped[series_key(expense.pot_id, expense.description)].append(expense)
+        return {key: RecurringSeries.from_expenses(key, rows) for key, rows in grouped.items()}
+
+    async def _refresh(self, user_id: uuid.UUID, cached: _UserSeries) -> None:
+        """Recompute only the series marked dirty."""
+        for key in cached.dirty:
+            pot_id, description = key
+            result = await self.db.execute(
+                select(Expense)
+                .join(Pot)
+                .where(
+                    Pot.user_id == user_id,
+                    Expense.pot_id == pot_id,
+                    Expense.recurring.is_(True),
+                    func.regexp_replace(
+                        func.lower(func.trim(Expense.description)), r"\s+", " ", "g"
+                    )
+                    == description,
+                )
+                .order_by(Expense.date)
+            )
+            rows = list(result.scalars().all())
+            if rows:
+                cached.series[key] = RecurringSeries.from_expenses(key, rows)
+            else:
+                cached.series.pop(key, None)
+        cached.dirty.clear()
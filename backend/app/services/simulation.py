@@ -0,0 +1,186 @@
+"""Monte Carlo simulation of goal attainment."""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.config import get_settings
+
+settings = get_settings()
+
+DAYS_PER_MONTH = 30
+# Simulate at most this many months ahead, whatever the deadlines
+MAX_HORIZON_MONTHS = 120
+# Month-to-month variation in income, as a fraction of monthly income
+INCOME_VOLATILITY = 0.05
+CACHE_MAX_ENTRIES = 256
+# Paths simulated together; memory peaks at a few float64 arrays of this
+# many paths by the horizon in months, whatever the number of simulations
+CHUNK_PATHS = 5000
+
+
+@dataclass
+class SimulationInput:
+    """Everything one simulation needs; sent to a worker process, so keep it picklable."""
+
+    monthly_income: float
+    daily_spending: np.ndarray
+    targets: np.ndarray
+    currents: np.ndarray
+    # Whole months from now until each goal's deadline
+    months_to_deadline: np.ndarray
+    # Recent contributions per month for each goal, used as allocation weights
+    monthly_contributions: np.ndarray
+    simulations: int
+    # Derived from the state when not given, so the same state gives the same result
+    seed: int | None = None
+
+    def state_version(self) -> str:
+        """Digest of the user state the simulation depends on."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.float64(self.monthly_income).tobytes())
+        for array in (
+            self.daily_spending,
+            self.targets,
+            self.currents,
+            self.months_to_deadline,
+            self.monthly_contributions,
+        ):
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+            digest.update(b"|")
+        return digest.hexdigest()
+
+
+@dataclass
+class SimulationResult:
+    """Per-goal outcomes across all simulated paths."""
+
+    probabilities: np.ndarray
+    median_at_deadline: np.ndarray
+    seed: int
+
+
+def _monthly_spending_samples(daily_spending: np.ndarray) -> np.ndarray:
+    """Observed 30-day spending totals to bootstrap from.
+
+    Rolling windows keep the within-month pattern of the history (rent,
+    pay-day spending). With less than a month of history, single days are
+    scaled up instead.
+    """
+    if daily_spending.size >= DAYS_PER_MONTH:
+        windows = np.lib.stride_tricks.sliding_window_view(daily_spending, DAYS_PER_MONTH)
+        return windows.sum(axis=1)
+    if daily_spending.size:
+        return daily_spending * DAYS_PER_MONTH
+    return np.zeros(1)
+
+
+def _simulate_paths(
+    data: SimulationInput,
+    rng: np.random.Generator,
+    paths: int,
+    horizon: int,
+    spending_samples: np.ndarray,
+) -> np.ndarray:
+    """Simulate `paths` surplus paths; return each goal's amount at its deadline."""
+    goals = data.targets.size
+    spending = rng.choice(spending_samples, size=(paths, horizon))
+    income = data.monthly_income * (1 + INCOME_VOLATILITY * rng.standard_normal((paths, horizon)))
+    surplus = np.maximum(income - spending, 0.0)
+
+    contributed = data.monthly_contributions.sum()
+    if contributed > 0:
+        weights = data.monthly_contributions / contributed
+        mean_surplus = surplus.mean()
+        saving_rate = min(contributed / mean_surplus, 1.0) if mean_surplus > 0 else 0.0
+    else:
+        weights = np.full(goals, 1.0 / goals)
+        saving_rate = 1.0
+
+    # Savings per path accumulated up to the end of each month
+    saved = np.cumsum(surplus * saving_rate, axis=1)
+    month = np.clip(data.months_to_deadline, 0, horizon).astype(np.intp)
+    # Column 0 stands for "no months left"
+    saved = np.concatenate([np.zeros((paths, 1)), saved], axis=1)
+    return data.currents + saved[:, month] * weights
+
+
+def simulate_goal_attainment(data: SimulationInput) -> SimulationResult:
+    """Simulate monthly surplus paths and the resulting progress on each goal.
+
+    Each path draws monthly spending from the user's history and income with
+    small noise. The surplus is split between goals in proportion to their
+    recent contributions (evenly if there are none), at the share of the
+    average surplus the user has actually been saving. Paths are simulated
+    in chunks of `CHUNK_PATHS`, each estimating the average on its own.
+    """
+    seed = data.seed if data.seed is not None else int(data.state_version()[:8], 16)
+    rng = np.random.default_rng(seed)
+    horizon = int(min(max(data.months_to_deadline.max(initial=0), 1), MAX_HORIZON_MONTHS))
+    spending_samples = _monthly_spending_samples(data.daily_spending)
+
+    at_deadline = np.concatenate(
+        [
+            _simulate_paths(
+                data,
+                rng,
+                min(CHUNK_PATHS, data.simulations - start),
+                horizon,
+                spending_samples,
+            )
+            for start in range(0, data.simulations, CHUNK_PATHS)
+        ]
+    )
+
+    return SimulationResult(
+        probabilities=(at_deadline >= data.targets).mean(axis=0),
+        median_at_deadline=np.median(at_deadline, axis=0),
+        seed=seed,
+    )
+
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.simulation_workers)
+    return _executor
+
+
+# (state version, simulations, seed) -> result
+_results: OrderedDict[tuple[str, int, int | None], SimulationResult] = OrderedDict()
+
+
+async def run_simulation(data: SimulationInput) -> SimulationResult:
+    """Run a simulation in the process pool, keeping the event loop free.
+
+    Results are cached by state version, so repeated requests for an
+    unchanged user state do not simulate again.
+    """
+    key = (data.state_version(), data.simulations, data.seed)
+    cached = _results.get(key)
+    if cached is not None:
+        _results.move_to_end(key)
+        return cached
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_get_executor(), simulate_goal_attainment, data)
+
+    _results[key] = result
+    if len(_results) > CACHE_MAX_ENTRIES:
+        _results.popitem(last=False)
+    return result
+
+
+def shutdown_simulation_pool() -> None:
+    """Stop the simulation worker processes, if any were started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
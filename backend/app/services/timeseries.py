@@ -0,0 +1,101 @@
+"""Gap-filled spending time series computed in a single statement."""
+
+import uuid
+
+from sqlalchemy import ColumnElement, Date, Select, cast, func, literal_column, select
+
+from app.models.expense import Expense
+from app.models.pot import Pot
+from app.models.user import User
+from app.schemas.analytics import TrendGranularity
+
+
+def _interval(amount: int, unit: str) -> ColumnElement:
+    return literal_column(f"INTERVAL '{amount} {unit}'")
+
+
+def _truncate(unit: str, value: ColumnElement) -> ColumnElement:
+    # Inline the unit so GROUP BY matches the selected expression
+    return func.date_trunc(literal_column(f"'{unit}'"), value)
+
+
+def spending_series_statement(
+    user_id: uuid.UUID,
+    days: int,
+    granularity: TrendGranularity,
+) -> Select:
+    """Build the spending series query for the last `days` days.
+
+    Days are taken in the user's timezone. Rows are one per bucket from the
+    bucket containing the period start up to today, gap-filled with zero,
+    and every row carries the current and previous period totals, summed
+    from the same scan in a one-row CTE so they do not depend on which
+    buckets have spending.
+
+    Columns: bucket, amount, total_this_period, total_last_period.
+    """
+    unit = granularity.value
+
+    params = select(
+        select(User.timezone).where(User.id == user_id).scalar_subquery().label("tz"),
+    ).cte("params")
+    # Midnight today and at the start of each period, as local wall-clock times
+    today = _truncate("day", func.timezone(params.c.tz, func.now()))
+    bounds = select(
+        params.c.tz,
+        today.label("today"),
+        (today - _interval(days - 1, "days")).label("period_start"),
+        (today - _interval(2 * days - 1, "days")).label("previous_start"),
+    ).cte("bounds")
+
+    local_time = func.timezone(bounds.c.tz, Expense.date)
+    in_period = local_time >= bounds.c.period_start
+    bucket = _truncate(unit, local_time)
+    per_bucket = (
+        select(
+            bucket.label("bucket"),
+            func.sum(Expense.amount).filter(in_period).label("amount"),
+            func.sum(Expense.amount).filter(~in_period).label("previous_amount"),
+        )
+        .select_from(Expense)
+        .join(Pot)
+        .join(bounds, literal_column("true"))
+        .where(
+            Pot.user_id == user_id,
+            # Compare in UTC so the expenses date index can be used
+            Expense.date >= func.timezone(bounds.c.tz, bounds.c.previous_start),
+            Expense.date < func.timezone(bounds.c.tz, bounds.c.today + _interval(1, "day")),
+        )
+        .group_by(bucket)
+        .cte("per_bucket")
+    )
+
+    # Previous-period buckets precede the series, so the totals cannot be
+    # read off the joined rows
+    totals = select(
+        func.coalesce(func.sum(per_bucket.c.amount), 0).label("this_period"),
+        func.coalesce(func.sum(per_bucket.c.previous_amount), 0).label("last_period"),
+    ).cte("totals")
+
+    series = select(
+        func.generate_series(
+            _truncate(unit, bounds.c.period_start),
+            bounds.c.today,
+            _interval(1, unit),
+        ).label("bucket")
+    ).cte("series")
+
+    return (
+        select(
+            cast(series.c.bucket, Date).label("bucket"),
+            func.coalesce(per_bucket.c.amount, 0).label("amount"),
+            totals.c.this_period.label("total_this_period"),
+            totals.c.last_period.label("total_last_period"),
+        )
+        .select_from(
+            series.outerjoin(per_bucket, per_bucket.c.bucket == series.c.bucket).join(
+                totals, literal_column("true")
+            )
+        )
+        .order_by(series.c.bucket)
+    )
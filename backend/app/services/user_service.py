@@ -10,6 +10,7 @@ from app.models.pot import Pot
 from app.models.pot import PotCategory as PotCategoryModel
 from app.models.user import User
 from app.schemas.user import OnboardingData, UserUpdate
+from app.services.alerts import AlertEngine
 
 
 class UserService:
@@ -48,6 +49,7 @@ class UserService:
         user.onboarding_completed = True
 
         # Create pots based on allocations
+        pots = []
         for pot_data in data.pots:
             # Calculate target amount based on monthly income and percentage
             target_amount = (data.monthly_income * pot_data.percentage) / 100
@@ -63,7 +65,13 @@ class UserService:
                 icon=pot_data.icon,
             )
             self.db.add(pot)
+            pots.append(pot)
 
         await self.db.flush()
+
+        alerts = AlertEngine(self.db)
+        for pot in pots:
+            await alerts.evaluate_pot(pot)
+
         await self.db.refresh(user)
         return user
@@ -0,0 +1,112 @@
+"""Benchmark per-request overhead of the request metrics middleware.
+
+Drives a minimal FastAPI app directly through the ASGI interface (no network
+or HTTP client) with and without middleware, and reports the added time per
+request. The legacy `BaseHTTPMiddleware` logger is included for comparison.
+
+Run from the backend directory:
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message
+
+from app.core.middleware import RequestMetricsMiddleware
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based request logger."""
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logging.getLogger(__name__).info(
+            f"{request.method} {request.url.path} "
+            f"completed in {process_time:.3f}s "
+            f"with status {response.status_code}"
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+def build_app(middleware: type | None) -> ASGIApp:
+    """Build a FastAPI app with a single JSON route."""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id, "name": "item"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def run(app: ASGIApp, requests: int) -> float:
+    """Send requests through the ASGI app and return seconds per request."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/1",
+        "raw_path": b"/items/1",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    # Warm up routing and dependency caches
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int) -> None:
+    # Keep log output out of the measurement
+    logging.disable(logging.CRITICAL)
+
+    variants: list[tuple[str, type | None]] = [
+        ("no middleware", None),
+        ("RequestMetricsMiddleware (pure ASGI)", RequestMetricsMiddleware),
+        ("BaseHTTPMiddleware logger (previous)", LegacyRequestLoggingMiddleware),
+    ]
+    results = {name: await run(build_app(mw), requests) for name, mw in variants}
+
+    baseline = results["no middleware"]
+    print(f"{'variant':<40} {'us/request':>12} {'overhead us':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<40} {seconds * 1e6:>12.1f} {(seconds - baseline) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
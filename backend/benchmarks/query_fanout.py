@@ -0,0 +1,133 @@
+"""Benchmark concurrent query fan-out on the dashboard and coach context paths.
+
+Runs `AnalyticsService.get_dashboard` and the coach's user context load
+with fan-out disabled (every query awaited in turn on the request's
+session) and enabled (independent queries on separate pooled connections,
+the dashboard on a shared exported snapshot). Reports latency per request.
+
+The saving grows with the round trip time to the database, so run it
+against a database as far away as production's. Needs a reachable database
+at DATABASE_URL with migrations applied; a throwaway user with pots, goals
+and expenses is created and deleted again. Run from the backend directory:
+
+    python -m benchmarks.query_fanout --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.ai.coach import AICoach
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal, ReadOnlySessionLocal, engine
+from app.models.expense import Expense, ExpenseCategory
+from app.models.goal import Goal
+from app.models.pot import Pot, PotCategory
+from app.models.user import User
+from app.services.analytics_service import AnalyticsService
+
+settings = get_settings()
+
+
+async def seed(pots: int, expenses: int) -> uuid.UUID:
+    """Create a user with pots, a goal per pot and expenses spread over them."""
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        session.add(
+            User(
+                id=user_id,
+                name="Benchmark",
+                email=f"{user_id}@benchmark.local",
+                monthly_income=5000,
+            )
+        )
+        pot_ids = []
+        for index in range(pots):
+            pot = Pot(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                name=f"Pot {index}",
+                category=list(PotCategory)[index % len(PotCategory)],
+                current_amount=1000,
+                target_amount=2000,
+            )
+            session.add(pot)
+            session.add(Goal(pot_id=pot.id, title=f"Goal {index}", target_amount=1500))
+            pot_ids.append(pot.id)
+        for index in range(expenses):
+            session.add(
+                Expense(
+                    pot_id=pot_ids[index % pots],
+                    description=f"Expense {index % 40}",
+                    amount=12.5,
+                    category=list(ExpenseCategory)[index % len(ExpenseCategory)],
+                    date=now - timedelta(days=index % 90),
+                    recurring=index % 10 == 0,
+                )
+            )
+        await session.commit()
+    return user_id
+
+
+async def dashboard_request(user_id: uuid.UUID) -> None:
+    """GET /analytics/dashboard on a read-only session."""
+    async with ReadOnlySessionLocal() as session:
+        await AnalyticsService(session).get_dashboard(user_id)
+
+
+async def coach_context_request(user_id: uuid.UUID) -> None:
+    """The context load at the start of a chat reply, on a read-write session."""
+    async with AsyncSessionLocal() as session:
+        await AICoach(session)._get_user_context(user_id)
+
+
+async def run(
+    request: Callable[[uuid.UUID], Awaitable[None]],
+    user_id: uuid.UUID,
+    requests: int,
+) -> tuple[float, float]:
+    """Run requests sequentially, returning median and p95 milliseconds."""
+    for _ in range(20):
+        await request(user_id)
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await request(user_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+async def main(requests: int, pots: int, expenses: int, concurrency: int) -> None:
+    user_id = await seed(pots, expenses)
+    paths = [("dashboard", dashboard_request), ("coach context", coach_context_request)]
+    try:
+        print(f"{'path':<16} {'fan-out':<14} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, request in paths:
+            for label, limit in (("off", 1), (f"{concurrency} connections", concurrency)):
+                settings.db_fanout_concurrency = limit
+                p50, p95 = await run(request, user_id, requests)
+                print(f"{name:<16} {label:<14} {p50:>8.2f} {p95:>8.2f}")
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--pots", type=int, default=5)
+    parser.add_argument("--expenses", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=settings.db_fanout_concurrency)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.pots, args.expenses, args.concurrency))
@@ -0,0 +1,113 @@
+"""Benchmark read-only GET transactions against read-write ones.
+
+Runs the same read workload (the queries behind the pot list and goal
+progress endpoints) in a read-write transaction that is flushed and
+committed, as `get_db` previously did for every request, and in the READ
+ONLY session now used for safe-method requests, which is closed without a
+flush or commit. Reports latency and the statements and transaction
+control round trips each request costs.
+
+Needs a reachable database at DATABASE_URL with migrations applied. The
+queries use a random user id, so no data is read or written. Run from the
+backend directory:
+
+    python -m benchmarks.read_only_transactions --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, ReadOnlySessionLocal, engine
+from app.services.analytics_service import AnalyticsService
+from app.services.pot_service import PotService
+
+events: Counter[str] = Counter()
+
+
+def count_events() -> None:
+    """Count statements and transaction control on the primary engine."""
+
+    def on_execute(*args: Any) -> None:
+        events["statements"] += 1
+
+    def on_begin(conn: Any) -> None:
+        events["begin"] += 1
+
+    def on_commit(conn: Any) -> None:
+        events["commit"] += 1
+
+    def on_rollback(conn: Any) -> None:
+        events["rollback"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    event.listen(engine.sync_engine, "begin", on_begin)
+    event.listen(engine.sync_engine, "commit", on_commit)
+    event.listen(engine.sync_engine, "rollback", on_rollback)
+
+
+async def read_workload(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """The queries of a typical list/analytics GET request."""
+    await PotService(session).list_for_user(user_id)
+    await AnalyticsService(session).get_goal_progress(user_id)
+
+
+async def read_write_request(user_id: uuid.UUID) -> None:
+    """The previous get_db: read-write transaction, committed at the end."""
+    async with AsyncSessionLocal() as session:
+        await read_workload(session, user_id)
+        await session.commit()
+
+
+async def read_only_request(user_id: uuid.UUID) -> None:
+    """get_db for safe methods: READ ONLY transaction, closed without commit."""
+    async with ReadOnlySessionLocal() as session:
+        await read_workload(session, user_id)
+
+
+async def run(factory: Any, requests: int) -> tuple[float, dict[str, float]]:
+    """Run requests sequentially, returning seconds and events per request."""
+    for _ in range(50):
+        await factory(uuid.uuid4())
+
+    events.clear()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await factory(uuid.uuid4())
+    elapsed = (time.perf_counter() - start) / requests
+    return elapsed, {name: count / requests for name, count in events.items()}
+
+
+async def main(requests: int) -> None:
+    count_events()
+    variants = [
+        ("read-write + commit (previous)", read_write_request),
+        ("READ ONLY, no commit", read_only_request),
+    ]
+
+    print(
+        f"{'variant':<32} {'ms/request':>10} {'statements':>10} "
+        f"{'begin':>6} {'commit':>6} {'rollback':>8}"
+    )
+    for name, factory in variants:
+        seconds, counts = await run(factory, requests)
+        print(
+            f"{name:<32} {seconds * 1e3:>10.3f} {counts.get('statements', 0):>10.1f} "
+            f"{counts.get('begin', 0):>6.1f} {counts.get('commit', 0):>6.1f} "
+            f"{counts.get('rollback', 0):>8.1f}"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
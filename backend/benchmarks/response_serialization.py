@@ -0,0 +1,157 @@
+"""Benchmark building and serializing a 500-row `/expenses/` response.
+
+Serves the same 500 in-memory `Expense` rows through a minimal FastAPI app
+(no database or HTTP client) in three ways:
+
+- the previous handler: `model_validate` per row, then FastAPI validates
+  the list against `response_model` and serializes it;
+- the same with stdlib `json` encoding (`response_class=JSONResponse`),
+  as FastAPI did before serializing through pydantic-core;
+- `ResponseAdapter`: one prebuilt `TypeAdapter` validates the ORM rows and
+  dumps the JSON, and FastAPI's own pass is skipped.
+
+Also times SSE chunk encoding with `json.dumps` against `json_dumps`. Run
+from the backend directory:
+
+    python -m benchmarks.response_serialization --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message
+
+from app.api.responses import ResponseAdapter, json_dumps
+from app.models.expense import Expense, ExpenseCategory
+from app.schemas.expense import ExpenseResponse
+
+ROWS = 500
+ROUNDS = 3
+
+
+def make_expenses(count: int) -> list[Expense]:
+    """Transient expenses shaped like a page of real ones."""
+    now = datetime.now(timezone.utc)
+    pot_ids = [uuid.uuid4() for _ in range(5)]
+    categories = list(ExpenseCategory)
+    return [
+        Expense(
+            id=uuid.uuid4(),
+            pot_id=pot_ids[index % len(pot_ids)],
+            description=f"Groceries at store {index % 40}",
+            amount=12.5 + index,
+            category=categories[index % len(categories)],
+            date=now - timedelta(hours=index),
+            recurring=index % 10 == 0,
+            notes=None if index % 3 else "Weekly shop",
+        )
+        for index in range(count)
+    ]
+
+
+def build_app(expenses: list[Expense]) -> FastAPI:
+    """An app serving the expenses through each variant."""
+    app = FastAPI()
+    expense_list = ResponseAdapter(list[ExpenseResponse])
+
+    @app.get("/validated", response_model=list[ExpenseResponse])
+    async def validated() -> list[ExpenseResponse]:
+        return [ExpenseResponse.model_validate(expense) for expense in expenses]
+
+    @app.get("/stdlib", response_model=list[ExpenseResponse], response_class=JSONResponse)
+    async def stdlib() -> list[ExpenseResponse]:
+        return [ExpenseResponse.model_validate(expense) for expense in expenses]
+
+    @app.get("/adapter", response_model=list[ExpenseResponse])
+    async def adapter() -> Response:
+        return expense_list.response(expenses)
+
+    return app
+
+
+async def run(app: ASGIApp, path: str, requests: int) -> tuple[float, int]:
+    """Send requests through the ASGI app; return seconds per request and body size."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    size = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size = len(message.get("body", b""))
+
+    for _ in range(20):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests, size
+
+
+def time_sse_chunks(chunks: int) -> list[tuple[str, float]]:
+    """Seconds per SSE message chunk encoded with each encoder."""
+    message_id = str(uuid.uuid4())
+    payload = {"id": message_id, "chunk": "Consider moving $50 from Fun to your Savings pot."}
+    results = []
+    for name, encode in (("json.dumps", json.dumps), ("json_dumps", json_dumps)):
+        start = time.perf_counter()
+        for _ in range(chunks):
+            encode(payload)
+        results.append((name, (time.perf_counter() - start) / chunks))
+    return results
+
+
+async def main(requests: int) -> None:
+    app = build_app(make_expenses(ROWS))
+    variants = [
+        ("model_validate + response_model", "/validated"),
+        ("same, stdlib json encoder", "/stdlib"),
+        ("ResponseAdapter", "/adapter"),
+    ]
+    # Interleave rounds and keep each variant's best to damp GC and warm-up noise
+    results: dict[str, tuple[float, int]] = {}
+    for _ in range(ROUNDS):
+        for name, path in variants:
+            seconds, size = await run(app, path, requests)
+            if name not in results or seconds < results[name][0]:
+                results[name] = (seconds, size)
+
+    baseline = results["model_validate + response_model"][0]
+    print(f"{ROWS}-row /expenses/ response")
+    print(f"{'variant':<34} {'ms/request':>10} {'speedup':>8} {'bytes':>8}")
+    for name, (seconds, size) in results.items():
+        print(f"{name:<34} {seconds * 1e3:>10.3f} {baseline / seconds:>7.2f}x {size:>8}")
+
+    print()
+    print(f"{'SSE chunk encoder':<34} {'us/chunk':>10}")
+    for name, seconds in time_sse_chunks(requests * 50):
+        print(f"{name:<34} {seconds * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,125 @@
+"""Shared test fixtures.
+
+Tests using the `db_ready` fixture, directly or through `client` or
+`seeded_user`, need a reachable database at DATABASE_URL with migrations
+applied. They are skipped when there is none.
+"""
+
+import uuid
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractContextManager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, text
+
+from app.db.instrumentation import RequestTimings
+from app.db.instrumentation import query_budget as _query_budget
+from app.db.session import AsyncSessionLocal, engine, replica_engine
+from app.main import app
+from app.models.expense import Expense, ExpenseCategory
+from app.models.goal import Goal, GoalContribution
+from app.models.pot import Pot, PotCategory
+from app.models.user import User
+
+_database_error: str | None = None
+_database_checked = False
+
+
+@pytest.fixture
+async def db_ready() -> AsyncIterator[None]:
+    """Skip the test unless the database is reachable.
+
+    Pools are disposed afterwards, as each test runs on its own event loop.
+    """
+    global _database_checked, _database_error
+    if not _database_checked:
+        _database_checked = True
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            _database_error = f"{type(e).__name__}: {e}"
+    if _database_error is not None:
+        await engine.dispose()
+        pytest.skip(f"Database unavailable ({_database_error})")
+
+    yield
+
+    await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
+
+
+@pytest.fixture
+async def client(db_ready: None) -> AsyncIterator[AsyncClient]:
+    """HTTP client calling the app in-process."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+
+
+@pytest.fixture
+async def seeded_user(db_ready: None) -> AsyncIterator[uuid.UUID]:
+    """A user with pots, goals, contributions and expenses, deleted afterwards."""
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        session.add(
+            User(id=user_id, name="Test", email=f"{user_id}@test.local", monthly_income=5000)
+        )
+        for index, category in enumerate(list(PotCategory)[:3]):
+            pot = Pot(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                name=f"Pot {index}",
+                category=category,
+                current_amount=1000,
+                target_amount=2000,
+            )
+            goal = Goal(
+                id=uuid.uuid4(),
+                pot_id=pot.id,
+                title=f"Goal {index}",
+                target_amount=1500,
+                deadline=now + timedelta(days=365),
+            )
+            session.add_all([pot, goal])
+            await session.flush()
+            for month in range(3):
+                session.add(
+                    GoalContribution(
+                        goal_id=goal.id,
+                        amount=100,
+                        created_at=now - timedelta(days=30 * month),
+                    )
+                )
+            for day in range(10):
+                session.add(
+                    Expense(
+                        pot_id=pot.id,
+                        description=f"Groceries {day}",
+                        amount=20 + day,
+                        category=list(ExpenseCategory)[day % len(ExpenseCategory)],
+                        date=now - timedelta(days=day * 3),
+                        recurring=day == 0,
+                    )
+                )
+        await session.commit()
+
+    yield user_id
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[RequestTimings]]:
+    """Context manager failing the test if a block issues too many queries.
+
+    Wrap one client call per budget, e.g.
+    `with query_budget(4): await client.get("/pots/", headers=headers)`.
+    """
+    return _query_budget
@@ -0,0 +1,51 @@
+"""Batch endpoint."""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.api.batch import dispatch
+from app.main import app
+from app.schemas.batch import BatchMethod, BatchRequestItem
+
+
+@pytest.mark.parametrize("path", ["/batch", "/batch/", "/%62atch", "/BATCH?x=1", "/%42atch/"])
+def test_nested_batch_path_rejected(path: str) -> None:
+    with pytest.raises(ValidationError, match="cannot be nested"):
+        BatchRequestItem(method="POST", path=path)
+
+
+async def test_sub_request_to_batch_refused(db_ready: None, seeded_user: uuid.UUID) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "http",
+        "headers": [(b"x-user-id", str(seeded_user).encode())],
+    }
+    # Skips the path check, as a path the validator missed would
+    item = BatchRequestItem.model_construct(
+        id="nested",
+        method=BatchMethod.POST,
+        path="/%62atch",
+        body={"requests": [{"path": "/pots/"}]},
+    )
+
+    response = await dispatch(app, scope, item)
+
+    assert response.status == 422
+    assert response.body == {"detail": "Batches cannot be nested"}
+
+
+async def test_batch_runs_sub_requests(client: AsyncClient, seeded_user: uuid.UUID) -> None:
+    response = await client.post(
+        "/batch",
+        json={"requests": [{"id": "pots", "path": "/pots/"}, {"id": "goals", "path": "/goals/"}]},
+        headers={"X-User-ID": str(seeded_user)},
+    )
+    assert response.status_code == 200, response.text
+    responses = response.json()["responses"]
+    assert [(r["id"], r["status"]) for r in responses] == [("pots", 200), ("goals", 200)]
+    assert len(responses[0]["body"]) == 3
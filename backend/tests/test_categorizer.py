@@ -0,0 +1,225 @@
+"""Expense categorizer: the classifier, its cached models and their updates."""
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.expense import ExpenseCategory as ExpenseCategoryModel
+from app.models.pot import Pot
+from app.schemas.expense import ExpenseCategory, ExpenseCreate
+from app.services import categorizer
+from app.services.categorizer import (
+    CATEGORY_LABELS,
+    MIN_CONFIDENCE,
+    ExpenseCategorizer,
+    NaiveBayes,
+    UserCategorizer,
+    forget_user,
+    learn_expense,
+    tokenize,
+)
+from app.services.expense_service import ExpenseService
+
+FOOD = ExpenseCategoryModel.FOOD
+TRANSPORT = ExpenseCategoryModel.TRANSPORT
+ENTERTAINMENT = ExpenseCategoryModel.ENTERTAINMENT
+
+
+def _trained(examples: list[tuple[str, ExpenseCategoryModel]], **kwargs) -> NaiveBayes:
+    model = NaiveBayes(CATEGORY_LABELS, **kwargs)
+    for description, category in examples:
+        model.add(tokenize(description), category)
+    return model
+
+
+def test_tokenize_drops_numbers_and_single_letters() -> None:
+    assert tokenize("Tesco x2 Groceries 12.50, café!") == ["tesco", "groceries", "café"]
+
+
+def test_untrained_model_predicts_nothing() -> None:
+    assert NaiveBayes().predict(["groceries"]) is None
+    assert NaiveBayes(CATEGORY_LABELS).predict(["groceries"]) is None
+
+
+def test_predicts_the_trained_label() -> None:
+    model = _trained(
+        [
+            ("Tesco groceries", FOOD),
+            ("Lidl groceries", FOOD),
+            ("Uber ride home", TRANSPORT),
+            ("Train ticket", TRANSPORT),
+        ]
+    )
+
+    assert model.predict(tokenize("groceries"))[0] == FOOD
+    label, confidence = model.predict(tokenize("uber to the station"))
+    assert label == TRANSPORT
+    assert 1 / len(CATEGORY_LABELS) < confidence <= 1.0
+
+
+def test_untraining_removes_an_example() -> None:
+    model = _trained([("Uber ride", TRANSPORT), ("Cinema ticket", ENTERTAINMENT)])
+    model.add(tokenize("Uber ride"), TRANSPORT, weight=-1)
+    model.add(tokenize("Uber ride"), ENTERTAINMENT)
+
+    assert model.predict(tokenize("uber"))[0] == ENTERTAINMENT
+    # Untraining never drives counts negative
+    model.add(tokenize("Uber ride"), TRANSPORT, weight=-5)
+    assert model.doc_counts.min() >= 0
+    assert model.token_counts["uber"].min() >= 0
+
+
+def test_global_prior_guides_a_new_user() -> None:
+    prior = _trained([("Netflix subscription", ENTERTAINMENT)] * 5 + [("Groceries", FOOD)] * 5)
+    user = NaiveBayes(CATEGORY_LABELS, prior=prior)
+
+    assert user.predict(tokenize("netflix"))[0] == ENTERTAINMENT
+
+    # The user's own labels win once they have enough of them
+    for _ in range(10):
+        user.add(tokenize("Netflix"), FOOD)
+    assert user.predict(tokenize("netflix"))[0] == FOOD
+
+
+def test_unseen_tokens_are_ignored() -> None:
+    model = _trained([("Groceries", FOOD), ("Groceries", FOOD), ("Bus fare", TRANSPORT)])
+
+    assert not model.knows("zorblax")
+    assert model.predict(["zorblax"]) == model.predict([])
+    assert model.predict(["zorblax", "groceries"]) == model.predict(["groceries"])
+    assert "zorblax" not in model.token_counts
+
+
+def test_pot_labels_are_added_as_they_are_seen() -> None:
+    model = NaiveBayes()
+    first, second = uuid.uuid4(), uuid.uuid4()
+    model.add(["rent"], first)
+    model.add(["cinema"], second)
+
+    assert model.labels == [first, second]
+    assert model.predict(["rent"])[0] == first
+    assert model.predict(["cinema"])[0] == second
+
+
+def _user_model() -> tuple[UserCategorizer, uuid.UUID]:
+    pot_id = uuid.uuid4()
+    model = UserCategorizer(categories=NaiveBayes(CATEGORY_LABELS), pots=NaiveBayes(), loaded_at=0)
+    for _ in range(5):
+        model.learn("Tesco groceries", FOOD, pot_id)
+        model.learn("Cinema tickets", ENTERTAINMENT, uuid.uuid4())
+    return model, pot_id
+
+
+def test_confident_suggestion_is_kept() -> None:
+    model, pot_id = _user_model()
+
+    suggestion = model.suggest("groceries", min_confidence=MIN_CONFIDENCE)
+
+    assert suggestion.category == ExpenseCategory.FOOD
+    assert suggestion.category_confidence >= MIN_CONFIDENCE
+    assert suggestion.pot_id == pot_id
+    assert suggestion.pot_confidence >= MIN_CONFIDENCE
+
+
+def test_unsure_suggestion_is_left_out_above_min_confidence() -> None:
+    model, _ = _user_model()
+
+    best_guess = model.suggest("zorblax")
+    assert best_guess.category is not None
+    assert best_guess.category_confidence < MIN_CONFIDENCE
+
+    suggestion = model.suggest("zorblax", min_confidence=MIN_CONFIDENCE)
+    assert suggestion.category is None
+    assert suggestion.pot_id is None
+    assert suggestion.category_confidence == best_guess.category_confidence
+    assert suggestion.pot_confidence == best_guess.pot_confidence
+
+
+@pytest.fixture
+def cached_model(monkeypatch: pytest.MonkeyPatch) -> tuple[uuid.UUID, UserCategorizer]:
+    """A user whose model is in the cache, removed afterwards."""
+    user_id = uuid.uuid4()
+    model = UserCategorizer(
+        categories=NaiveBayes(CATEGORY_LABELS),
+        pots=NaiveBayes(),
+        loaded_at=time.monotonic(),
+    )
+    monkeypatch.setitem(categorizer._models, user_id, model)
+    return user_id, model
+
+
+async def test_deferred_update_applies_on_commit(
+    cached_model: tuple[uuid.UUID, UserCategorizer],
+) -> None:
+    user_id, model = cached_model
+    async with AsyncSession() as session:
+        learn_expense(session, user_id, "Tesco groceries", FOOD, uuid.uuid4())
+        assert not model.categories.knows("tesco")
+
+        await session.commit()
+
+    assert model.categories.knows("tesco")
+
+
+async def test_deferred_update_is_dropped_on_rollback(
+    cached_model: tuple[uuid.UUID, UserCategorizer],
+) -> None:
+    user_id, model = cached_model
+    async with AsyncSession() as session:
+        learn_expense(session, user_id, "Tesco groceries", FOOD, uuid.uuid4())
+        forget_user(session, user_id)
+        await session.rollback()
+
+        # Nothing is left to apply on a later commit
+        await session.commit()
+
+    assert not model.categories.knows("tesco")
+    assert categorizer._models.get(user_id) is model
+
+
+async def test_forget_user_applies_on_commit(
+    cached_model: tuple[uuid.UUID, UserCategorizer],
+) -> None:
+    user_id, _ = cached_model
+    async with AsyncSession() as session:
+        forget_user(session, user_id)
+        assert user_id in categorizer._models
+
+        await session.commit()
+
+    assert user_id not in categorizer._models
+
+
+async def _create_expense(user_id: uuid.UUID, description: str, commit: bool) -> bool:
+    """Create an expense, commit or roll back, and report if the cached model learnt it."""
+    async with AsyncSessionLocal() as session:
+        pot_id = await session.scalar(select(Pot.id).where(Pot.user_id == user_id).limit(1))
+        model = await ExpenseCategorizer(session).get_model(user_id)
+        await ExpenseService(session).create(
+            user_id,
+            ExpenseCreate(
+                description=description,
+                amount=12,
+                category=ExpenseCategory.FOOD,
+                date=datetime.now(timezone.utc),
+                pot_id=pot_id,
+            ),
+        )
+        if commit:
+            await session.commit()
+        else:
+            await session.rollback()
+        return model.categories.knows(description)
+
+
+async def test_rolled_back_expense_is_not_learnt(seeded_user: uuid.UUID) -> None:
+    assert not await _create_expense(seeded_user, "zorblax", commit=False)
+
+
+async def test_committed_expense_is_learnt(seeded_user: uuid.UUID) -> None:
+    assert await _create_expense(seeded_user, "zorblax", commit=True)
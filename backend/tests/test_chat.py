@@ -0,0 +1,86 @@
+"""Chat message streaming and storage."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.ai import coach
+from app.ai.coach import AICoach, CoachEvent
+from app.models.chat import ChatMessage, MessageRole, MessageType
+from app.schemas.chat import ImpactAnalysis
+from app.services.chat_service import _message_response
+
+
+def _impact(action: str) -> ImpactAnalysis:
+    return ImpactAnalysis(action=action, pot_impacts=[], goal_impacts=[], recommendation="Wait")
+
+
+async def test_every_tool_result_is_stored(
+    client: AsyncClient,
+    seeded_user: uuid.UUID,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def generate_response(self, user_id, session_id, content):
+        yield CoachEvent(type=MessageType.TEXT, data="Both fit. ")
+        yield CoachEvent(type=MessageType.IMPACT_ANALYSIS, data=_impact("Buy a bike"))
+        yield CoachEvent(type=MessageType.IMPACT_ANALYSIS, data=_impact("Buy a laptop"))
+
+    async def remember(self, user_id, messages):
+        pass
+
+    async def generate_quick_actions(self, user_id):
+        return []
+
+    # The model is never called, so no API client is needed
+    monkeypatch.setattr(coach, "get_openai_client", lambda: None)
+    monkeypatch.setattr(AICoach, "generate_response", generate_response)
+    monkeypatch.setattr(AICoach, "remember", remember)
+    monkeypatch.setattr(AICoach, "generate_quick_actions", generate_quick_actions)
+    headers = {"X-User-ID": str(seeded_user)}
+
+    response = await client.post("/chat/sessions", json={}, headers=headers)
+    assert response.status_code == 201, response.text
+    session_id = response.json()["id"]
+
+    response = await client.post(
+        f"/chat/sessions/{session_id}/messages",
+        json={"content": "Can I buy a bike and a laptop?"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    streamed = [
+        json.loads(line.removeprefix("data:").strip())["impactAnalysis"]["action"]
+        for line in response.text.splitlines()
+        if line.startswith("data:") and "impactAnalysis" in line
+    ]
+    assert streamed == ["Buy a bike", "Buy a laptop"]
+
+    response = await client.get(f"/chat/sessions/{session_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    (assistant,) = [m for m in response.json()["messages"] if m["role"] == "assistant"]
+    assert assistant["messageType"] == "impact-analysis"
+    assert [a["action"] for a in assistant["impactAnalyses"]] == streamed
+    assert assistant["impactAnalysis"]["action"] == "Buy a bike"
+    assert assistant["tradeOffs"] is None
+
+
+def test_message_with_a_single_stored_result() -> None:
+    # Messages stored before results were kept in lists hold a single result
+    impact = _impact("Buy a bike").model_dump(mode="json", by_alias=True)
+    message = ChatMessage(
+        id=uuid.uuid4(),
+        session_id=uuid.uuid4(),
+        role=MessageRole.ASSISTANT,
+        content="",
+        message_type=MessageType.IMPACT_ANALYSIS,
+        extra_data={"impactAnalysis": impact},
+        created_at=datetime.now(timezone.utc),
+    )
+
+    response = _message_response(message)
+
+    assert response.impact_analysis == _impact("Buy a bike")
+    assert response.impact_analyses == [_impact("Buy a bike")]
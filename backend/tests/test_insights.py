@@ -0,0 +1,85 @@
+"""Precomputed insight refreshes."""
+
+import asyncio
+import uuid
+
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.expense import Expense
+from app.models.insight import Insight
+from app.models.job import Job, JobStatus
+from app.models.pot import Pot
+from app.services.insights import InsightService
+
+
+async def _refresh(user_id: uuid.UUID) -> int:
+    async with AsyncSessionLocal() as session:
+        count = await InsightService(session).refresh([user_id])
+        await session.commit()
+        return count
+
+
+async def _insight_titles(user_id: uuid.UUID) -> list[str]:
+    async with AsyncSessionLocal() as session:
+        result = await session.scalars(
+            select(Insight.title).where(Insight.user_id == user_id).order_by(Insight.position)
+        )
+        return list(result.all())
+
+
+async def test_concurrent_refreshes_of_a_user(seeded_user: uuid.UUID) -> None:
+    counts = await asyncio.gather(*(_refresh(seeded_user) for _ in range(4)))
+    assert len(set(counts)) == 1
+    assert len(await _insight_titles(seeded_user)) == counts[0]
+
+
+async def test_refresh_removes_insights_no_longer_computed(seeded_user: uuid.UUID) -> None:
+    await _refresh(seeded_user)
+    assert "Spending Pattern" in await _insight_titles(seeded_user)
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(Expense).where(
+                Expense.pot_id.in_(select(Pot.id).where(Pot.user_id == seeded_user))
+            )
+        )
+        await session.commit()
+    await _refresh(seeded_user)
+
+    assert "Spending Pattern" not in await _insight_titles(seeded_user)
+
+
+async def test_pot_writes_schedule_a_refresh(client: AsyncClient, seeded_user: uuid.UUID) -> None:
+    headers = {"X-User-ID": str(seeded_user)}
+    refresh_jobs = (Job.dedupe_key == f"insights.refresh:{seeded_user}",)
+
+    async def scheduled(method: str, path: str, **kwargs) -> bool:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(Job).where(*refresh_jobs))
+            await session.commit()
+        response = await client.request(method, path, headers=headers, **kwargs)
+        assert response.status_code < 300, response.text
+        async with AsyncSessionLocal() as session:
+            queued = await session.scalar(
+                select(func.count()).where(*refresh_jobs, Job.status == JobStatus.QUEUED)
+            )
+        return queued == 1
+
+    try:
+        assert await scheduled(
+            "POST", "/pots/", json={"name": "Car", "category": "savings", "percentage": 5}
+        )
+        pots = (await client.get("/pots/", headers=headers)).json()
+        first, second = pots[0]["id"], pots[-1]["id"]
+
+        assert await scheduled("PUT", f"/pots/{second}", json={"targetAmount": 900})
+        assert await scheduled(
+            "POST", f"/pots/{first}/transfer", json={"toPotId": second, "amount": 10}
+        )
+        assert await scheduled("DELETE", f"/pots/{second}")
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(Job).where(*refresh_jobs))
+            await session.commit()
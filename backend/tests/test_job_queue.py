@@ -0,0 +1,71 @@
+"""Background job queue."""
+
+import asyncio
+import uuid
+from typing import Any
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.jobs.queue import HANDLERS, JobQueue
+from app.jobs.worker import Worker, settings
+from app.models.job import Job
+
+
+@pytest.fixture
+async def job_kind(db_ready: None):
+    """A job kind unique to the test, whose jobs are deleted afterwards."""
+    kind = f"test.{uuid.uuid4()}"
+    yield kind
+    HANDLERS.pop(kind, None)
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Job).where(Job.kind == kind))
+        await session.commit()
+
+
+async def test_enqueue_drops_duplicates_of_queued_jobs(job_kind: str) -> None:
+    # Enough executions for Postgres to switch to a generic plan
+    async with AsyncSessionLocal() as session:
+        queue = JobQueue(session)
+        for index in range(12):
+            await queue.enqueue(job_kind, dedupe_key=f"{job_kind}:{index % 3}")
+        await session.commit()
+
+        count = await session.scalar(
+            select(func.count()).select_from(Job).where(Job.kind == job_kind)
+        )
+    assert count == 3
+
+
+async def test_heartbeat_keeps_long_running_job_locked(
+    job_kind: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "job_heartbeat_interval", 0.1)
+    monkeypatch.setattr(settings, "job_lock_timeout", 1)
+    requeued: list[int] = []
+
+    async def long_job(db: AsyncSession, payload: dict[str, Any]) -> None:
+        await asyncio.sleep(1.5)
+        async with AsyncSessionLocal() as session:
+            requeued.append(await JobQueue(session).requeue_abandoned())
+            await session.commit()
+
+    HANDLERS[job_kind] = long_job
+    async with AsyncSessionLocal() as session:
+        await JobQueue(session).enqueue(job_kind, priority=1_000_000)
+        await session.commit()
+        job = await JobQueue(session).claim("test-consumer")
+        await session.commit()
+    assert job is not None and job.kind == job_kind
+
+    await Worker(concurrency=1, poll_interval=0.1)._execute(job)
+
+    assert requeued == [0]
+    async with AsyncSessionLocal() as session:
+        remaining = await session.scalar(
+            select(func.count()).select_from(Job).where(Job.kind == job_kind)
+        )
+    assert remaining == 0
@@ -0,0 +1,83 @@
+"""Incremental parsing of streamed JSON."""
+
+import json
+
+import pytest
+
+from app.ai.json_stream import IncrementalJSONParser, PartialValue
+
+DOCUMENT = r"""{
+  "title": "Say \"hi\" to C:\\temp\\",
+  "amount": 12.5,
+  "ok": true,
+  "none": null,
+  "meta": {"tags": ["a", "b"], "inner": {"x": "}"}},
+  "steps": [
+    {"label": "caf\u00e9", "nested": [1, [2, 3]]},
+    "two, three]",
+    4,
+    [5, {"six": 6}]
+  ],
+  "empty": [],
+  "after": "end"
+}"""
+
+
+def _expected() -> list[PartialValue]:
+    document = json.loads(DOCUMENT)
+    expected = []
+    for field, value in document.items():
+        if isinstance(value, list):
+            expected += [PartialValue(field, index, item) for index, item in enumerate(value)]
+        else:
+            expected.append(PartialValue(field, None, value))
+    return expected
+
+
+def _feed(parser: IncrementalJSONParser, text: str, size: int) -> list[PartialValue]:
+    completed = []
+    for start in range(0, len(text), size):
+        completed += parser.feed(text[start : start + size])
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(DOCUMENT)])
+def test_chunk_size_does_not_change_values(size: int) -> None:
+    parser = IncrementalJSONParser()
+
+    assert _feed(parser, DOCUMENT, size) == _expected()
+    assert parser.text == DOCUMENT
+
+
+def test_unicode_escape_split_across_chunks() -> None:
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"label": "caf\\u00') == []
+    assert parser.feed('e9", "next": 1}') == [
+        PartialValue("label", None, "café"),
+        PartialValue("next", None, 1),
+    ]
+
+
+def test_values_are_reported_as_they_complete() -> None:
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"amount": 12') == []
+    assert parser.feed('.5, "items": [{"a": 1') == [PartialValue("amount", None, 12.5)]
+    assert parser.feed("}, 2") == [PartialValue("items", 0, {"a": 1})]
+    assert parser.feed("]") == [PartialValue("items", 1, 2)]
+    assert parser.feed("}") == []
+
+
+@pytest.mark.parametrize(
+    "value",
+    ['"a\\"b"', '"\\\\"', '"\\\\\\""', '"ends with \\\\\\\\"', '"{[,]}"'],
+)
+def test_escaped_strings(value: str) -> None:
+    text = f'{{"value": {value}, "items": [{value}]}}'
+    parser = IncrementalJSONParser()
+
+    assert _feed(parser, text, 1) == [
+        PartialValue("value", None, json.loads(value)),
+        PartialValue("items", 0, json.loads(value)),
+    ]
@@ -0,0 +1,40 @@
+"""Query count budgets for read endpoints.
+
+A budget is the number of SQL statements an endpoint issues for the seeded
+user. Budgets do not depend on how many rows the user has, so exceeding one
+usually means a new N+1 query pattern; lower them when an endpoint gets
+cheaper.
+"""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+ENDPOINT_BUDGETS = [
+    ("/users/me", 6),
+    ("/pots/", 4),
+    ("/goals/", 2),
+    ("/expenses/", 1),
+    ("/expenses/upcoming", 6),
+    ("/chat/sessions", 1),
+    ("/analytics/dashboard", 13),
+    ("/analytics/spending-trends", 1),
+    ("/analytics/pot-distribution", 4),
+    ("/analytics/goal-progress", 3),
+    ("/analytics/goal-probability", 10),
+    ("/analytics/insights", 1),
+]
+
+
+@pytest.mark.parametrize(("path", "budget"), ENDPOINT_BUDGETS)
+async def test_endpoint_query_budget(
+    client: AsyncClient,
+    seeded_user: uuid.UUID,
+    query_budget,
+    path: str,
+    budget: int,
+) -> None:
+    with query_budget(budget):
+        response = await client.get(path, headers={"X-User-ID": str(seeded_user)})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,81 @@
+"""Read-your-writes routing between the primary and the replica."""
+
+import time
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app.api import deps
+from app.db.replica import ReadYourWritesGuard
+from app.db.session import ReadSessionLocal, read_your_writes
+
+
+def test_cookie_pins_its_user_within_the_window() -> None:
+    guard = ReadYourWritesGuard(window=5, secret="secret")
+    user_id = uuid.uuid4()
+    value = guard.cookie_value(user_id)
+
+    assert guard.cookie_pins(user_id, value)
+    assert not guard.cookie_pins(uuid.uuid4(), value)
+    assert not guard.cookie_pins(user_id, None)
+    assert not ReadYourWritesGuard(window=5, secret="other").cookie_pins(user_id, value)
+
+
+@pytest.mark.parametrize("offset", [-10.0, 10.0])
+def test_cookie_outside_the_window_does_not_pin(offset: float) -> None:
+    guard = ReadYourWritesGuard(window=5, secret="secret")
+    user_id = uuid.uuid4()
+    payload = f"{user_id}.{time.time() + offset:.3f}"
+
+    assert not guard.cookie_pins(user_id, f"{payload}.{guard._sign(payload)}")
+
+
+def test_tampered_cookie_does_not_pin() -> None:
+    guard = ReadYourWritesGuard(window=5, secret="secret")
+    user_id = uuid.uuid4()
+    payload, _, signature = guard.cookie_value(user_id).rpartition(".")
+    written_at = float(payload.rpartition(".")[2]) + 60
+
+    assert not guard.cookie_pins(user_id, f"{user_id}.{written_at:.3f}.{signature}")
+
+
+async def test_write_cookie_pins_reads_on_another_worker(
+    client: AsyncClient,
+    seeded_user: uuid.UUID,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    replica_reads = 0
+
+    def replica_session():
+        nonlocal replica_reads
+        replica_reads += 1
+        return ReadSessionLocal()
+
+    monkeypatch.setattr(deps, "ReadSessionLocal", replica_session)
+    headers = {"X-User-ID": str(seeded_user)}
+
+    response = await client.post(
+        "/pots/",
+        json={"name": "Holiday", "category": "savings", "percentage": 10},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    assert read_your_writes.cookie_name in response.cookies
+
+    # A worker that did not handle the write only has the cookie to go on
+    monkeypatch.setattr(read_your_writes, "_last_write", {})
+    response = await client.get("/pots/", headers=headers)
+    assert response.status_code == 200, response.text
+    assert replica_reads == 0
+
+    client.cookies.clear()
+    response = await client.get("/pots/", headers=headers)
+    assert response.status_code == 200, response.text
+    assert replica_reads == 1
+
+
+async def test_reads_do_not_set_cookie(client: AsyncClient, seeded_user: uuid.UUID) -> None:
+    response = await client.get("/pots/", headers={"X-User-ID": str(seeded_user)})
+    assert response.status_code == 200, response.text
+    assert read_your_writes.cookie_name not in response.cookies
@@ -0,0 +1,29 @@
+"""Recurring expense series inference."""
+
+from datetime import date
+
+import pytest
+
+from app.services.recurring import MONTHLY, infer_anchor_day
+
+
+@pytest.mark.parametrize(
+    ("dates", "anchor_day"),
+    [
+        ([date(2026, 1, 15), date(2026, 2, 15), date(2026, 3, 15)], 15),
+        # Clamped to the end of February, still anchored on the 31st
+        ([date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)], 31),
+        ([date(2025, 12, 31), date(2026, 1, 31), date(2026, 2, 28)], 31),
+        ([date(2026, 1, 30), date(2026, 2, 28)], 30),
+        ([date(2026, 2, 28)], 28),
+    ],
+)
+def test_infer_anchor_day(dates: list[date], anchor_day: int) -> None:
+    assert infer_anchor_day(dates) == anchor_day
+
+
+def test_monthly_projection_recovers_after_short_month() -> None:
+    dates = [date(2025, 12, 31), date(2026, 1, 31), date(2026, 2, 28)]
+    anchor_day = infer_anchor_day(dates)
+    projected = [MONTHLY.step(dates[-1], anchor_day, count) for count in (1, 2)]
+    assert projected == [date(2026, 3, 31), date(2026, 4, 30)]
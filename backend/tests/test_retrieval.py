@@ -0,0 +1,208 @@
+"""Chat memory retrieval: embedding, vector search and recall."""
+
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import delete
+
+from app.ai.retrieval.embedders import HashingEmbedder
+from app.ai.retrieval.index import IndexEntry, VectorIndex, VectorIndexStore
+from app.ai.retrieval.memory import ChatMemory, estimate_tokens
+from app.db.session import AsyncSessionLocal
+from app.models.chat import (
+    ChatMessage,
+    ChatMessageEmbedding,
+    ChatSession,
+    MessageRole,
+    MessageType,
+)
+
+
+def _entry(row_id: int, session_id: str = "s1", tokens: int = 1) -> IndexEntry:
+    return IndexEntry(row_id=row_id, message_id=f"m{row_id}", session_id=session_id, tokens=tokens)
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+async def test_hashing_embedder_is_deterministic() -> None:
+    texts = ["Saving for a trip to Japan", "Groceries cost more this month", ""]
+
+    first = await HashingEmbedder(dimension=64).embed(texts)
+    second = await HashingEmbedder(dimension=64).embed(texts)
+
+    assert first.shape == (3, 64)
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first[:2], axis=1), 1.0, rtol=1e-6)
+    assert not first[2].any()
+
+
+async def test_hashing_embedder_scores_related_text_higher() -> None:
+    query, related, unrelated = await HashingEmbedder().embed(
+        [
+            "japan trip budget",
+            "How much should I save for my Japan trip?",
+            "My electricity bill went up",
+        ]
+    )
+
+    assert query @ related > query @ unrelated
+
+
+def test_search_ranks_by_cosine_similarity() -> None:
+    index = VectorIndex(dimension=2)
+    index.extend(
+        np.stack([_unit(1, 0), _unit(0, 1), _unit(1, 1), _unit(1, 0.2)]),
+        [_entry(1), _entry(2), _entry(3), _entry(4)],
+    )
+
+    hits = index.search(_unit(1, 0), k=3)
+
+    assert [hit.entry.row_id for hit in hits] == [1, 4, 3]
+    assert hits[0].score == pytest.approx(1.0)
+    assert [hit.entry.row_id for hit in index.search(_unit(1, 0), k=10)] == [1, 4, 3, 2]
+    assert index.search(_unit(1, 0), k=0) == []
+
+
+def test_search_applies_min_score_and_session_exclusion() -> None:
+    index = VectorIndex(dimension=2)
+    index.extend(
+        np.stack([_unit(1, 0), _unit(1, 1), _unit(0, 1)]),
+        [_entry(1, "current"), _entry(2, "past"), _entry(3, "past")],
+    )
+
+    hits = index.search(_unit(1, 0), k=3, min_score=0.5)
+    assert [hit.entry.row_id for hit in hits] == [1, 2]
+
+    hits = index.search(_unit(1, 0), k=3, exclude_session_id="current", min_score=0.5)
+    assert [hit.entry.row_id for hit in hits] == [2]
+
+
+def test_extend_grows_and_keeps_entries() -> None:
+    index = VectorIndex(dimension=2)
+    for row_id in range(1, 6):
+        index.extend(_unit(1, row_id)[None, :], [_entry(row_id)])
+
+    assert len(index) == 5
+    assert index.last_row_id == 5
+    assert index.search(_unit(1, 3), k=1)[0].entry.row_id == 3
+
+    with pytest.raises(ValueError):
+        index.extend(np.zeros((1, 3), dtype=np.float32), [_entry(6)])
+
+    index.clear()
+    assert len(index) == 0
+    assert index.last_row_id == 0
+
+
+def test_store_evicts_least_recently_used() -> None:
+    store = VectorIndexStore(dimension=2, max_open=2)
+    first = store.get("a")
+    second = store.get("b")
+    assert store.get("a") is first
+
+    store.get("c")
+
+    assert store.get("a") is first
+    assert store.get("b") is not second
+
+
+async def _add_messages(user_id: uuid.UUID, contents: list[str]) -> list[ChatMessage]:
+    async with AsyncSessionLocal() as session:
+        chat = ChatSession(id=uuid.uuid4(), user_id=user_id, title="Memory")
+        messages = [
+            ChatMessage(
+                id=uuid.uuid4(),
+                session_id=chat.id,
+                role=MessageRole.USER,
+                content=content,
+                message_type=MessageType.TEXT,
+            )
+            for content in contents
+        ]
+        session.add(chat)
+        await session.flush()
+        session.add_all(messages)
+        await session.commit()
+    return messages
+
+
+def _spy_fetches(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Record how many rows each index fetch returns."""
+    fetched: list[int] = []
+    fetch_rows = ChatMemory._fetch_rows
+
+    async def spy(self, *conditions):
+        rows = await fetch_rows(self, *conditions)
+        fetched.append(len(rows))
+        return rows
+
+    monkeypatch.setattr(ChatMemory, "_fetch_rows", spy)
+    return fetched
+
+
+async def test_recall_keeps_best_hits_within_token_budget(seeded_user: uuid.UUID) -> None:
+    long_message = "japan trip budget " + "details " * 200
+    messages = await _add_messages(
+        seeded_user,
+        ["japan trip budget", long_message, "budget for the japan trip flights"],
+    )
+    async with AsyncSessionLocal() as session:
+        memory = ChatMemory(session, HashingEmbedder(dimension=64))
+        await memory.remember(seeded_user, messages)
+
+        recalled = await memory.recall(seeded_user, "japan trip budget", token_budget=100)
+        assert estimate_tokens(long_message) > 100
+        assert {m.id for m in recalled} == {messages[0].id, messages[2].id}
+
+        recalled = await memory.recall(seeded_user, "japan trip budget", top_k=1)
+        assert [m.id for m in recalled] == [messages[0].id]
+
+        excluded = await memory.recall(
+            seeded_user, "japan trip budget", exclude_session_id=messages[0].session_id
+        )
+        assert excluded == []
+
+
+async def test_index_loads_new_rows_and_reloads_after_deletes(
+    seeded_user: uuid.UUID,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fetched = _spy_fetches(monkeypatch)
+    first = await _add_messages(seeded_user, ["rent is due", "saving for a bike"])
+    async with AsyncSessionLocal() as session:
+        memory = ChatMemory(session, HashingEmbedder(dimension=32))
+        await memory.remember(seeded_user, first)
+
+        index = await memory._load_index(seeded_user)
+        assert len(index) == 2
+        assert fetched == [2]
+
+        # Up to date: no rows are fetched
+        await memory._load_index(seeded_user)
+        assert fetched == [2]
+
+        # Only the new row is fetched
+        second = await _add_messages(seeded_user, ["the bike costs 400"])
+        await memory.remember(seeded_user, second)
+        index = await memory._load_index(seeded_user)
+        assert len(index) == 3
+        assert fetched == [2, 1]
+
+        # A deleted row makes the counts disagree, so the index is reloaded
+        async with AsyncSessionLocal() as writer:
+            await writer.execute(
+                delete(ChatMessageEmbedding).where(ChatMessageEmbedding.message_id == first[0].id)
+            )
+            await writer.commit()
+        index = await memory._load_index(seeded_user)
+        assert len(index) == 2
+        assert fetched == [2, 1, 0, 2]
+        assert {entry.message_id for entry in index._entries} == {
+            str(first[1].id),
+            str(second[0].id),
+        }
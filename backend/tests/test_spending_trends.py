@@ -0,0 +1,50 @@
+"""Spending trend totals."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+
+from app.db.session import AsyncSessionLocal
+from app.models.expense import Expense
+from app.models.pot import Pot
+
+
+async def test_spending_trends_totals(client: AsyncClient, seeded_user: uuid.UUID) -> None:
+    response = await client.get(
+        "/analytics/spending-trends",
+        params={"days": 14},
+        headers={"X-User-ID": str(seeded_user)},
+    )
+    assert response.status_code == 200, response.text
+    trend = response.json()
+    # Three pots with expenses of 20 + day every third day
+    assert trend["totalThisPeriod"] == 3 * (20 + 21 + 22 + 23 + 24)
+    assert trend["totalLastPeriod"] == 3 * (25 + 26 + 27 + 28 + 29)
+    assert sum(trend["amounts"]) == trend["totalThisPeriod"]
+
+
+async def test_spending_trends_last_period_without_current_spending(
+    client: AsyncClient,
+    seeded_user: uuid.UUID,
+) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(Expense).where(
+                Expense.pot_id.in_(select(Pot.id).where(Pot.user_id == seeded_user)),
+                Expense.date >= datetime.now(timezone.utc) - timedelta(days=14),
+            )
+        )
+        await session.commit()
+
+    response = await client.get(
+        "/analytics/spending-trends",
+        params={"days": 14},
+        headers={"X-User-ID": str(seeded_user)},
+    )
+    assert response.status_code == 200, response.text
+    trend = response.json()
+    assert trend["totalThisPeriod"] == 0
+    assert trend["totalLastPeriod"] == 3 * (25 + 26 + 27 + 28 + 29)
+    assert set(trend["amounts"]) == {0}